@@ -0,0 +1,121 @@
+# acid_db/team_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from acid_db.models import Team
+
+
+class TeamCache:
+    """
+    Bounded name -> Team cache shared by the sports poller and bet placement.
+
+    Unknown names are loaded with one `name__in` query per batch and, when asked
+    to, the ones still missing are created with one insert (write-through).
+    Teams created inside a transaction are only cached once it commits, so a
+    rollback never leaves rows in the cache that do not exist.
+    Misses are not cached: a team created by another process is picked up on
+    the next lookup. Teams renamed or deleted here are evicted by signal; changes
+    made by other processes are picked up once an entry is older than `ttl` seconds.
+    """
+    def __init__(self, max_size: int, ttl: float = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._teams = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._teams)
+
+    def _store(self, teams) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for team in teams:
+                self._teams[team.name] = (team, now)
+                self._teams.move_to_end(team.name)
+            while len(self._teams) > self.max_size:
+                self._teams.popitem(last=False)
+
+    def _cached(self, names) -> dict:
+        found = {}
+        expired_before = time.monotonic() - self.ttl if self.ttl else None
+        with self._lock:
+            for name in names:
+                entry = self._teams.get(name)
+                if entry is None:
+                    continue
+                team, stored_at = entry
+                if expired_before is not None and stored_at < expired_before:
+                    del self._teams[name]  # Reloaded below, in case it changed elsewhere
+                    continue
+                self._teams.move_to_end(name)
+                found[name] = team
+            self.hits += len(found)
+            self.misses += len(names) - len(found)
+        return found
+
+    def get_many(self, names, create: bool = False) -> tuple:
+        """
+        Resolves many team names at once.
+        Returns (name -> Team, number of teams created).
+        """
+        names = {name for name in names if name}
+        teams = self._cached(names)
+        unknown = names - teams.keys()
+        if not unknown:
+            return teams, 0
+
+        loaded = {}
+        for team in Team.objects.filter(name__in=unknown):
+            loaded.setdefault(team.name, team)
+        self._store(loaded.values())
+        teams.update(loaded)
+
+        missing = [Team(name=name) for name in unknown if name not in loaded]
+        if create and missing:
+            Team.objects.bulk_create(missing)
+            transaction.on_commit(lambda: self._store(missing))
+            teams.update((team.name, team) for team in missing)
+            return teams, len(missing)
+        return teams, 0
+
+    def get(self, name: str):
+        """Team with the given name, or None if it does not exist."""
+        return self.get_many([name])[0].get(name)
+
+    def preload(self) -> int:
+        """Loads every team (up to max_size) in one query. Returns the number cached."""
+        teams = list(Team.objects.all()[:self.max_size])
+        self._store(teams)
+        return len(teams)
+
+    def evict(self, team) -> None:
+        """Drops every cached entry pointing to the given team (renamed or deleted)."""
+        with self._lock:
+            for name in [name for name, (cached, _) in self._teams.items() if cached.pk == team.pk]:
+                del self._teams[name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._teams.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._teams), "maxSize": self.max_size, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses}
+
+
+team_cache = TeamCache(getattr(settings, "TEAM_CACHE_SIZE", 20000), getattr(settings, "TEAM_CACHE_TTL", 300))
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def _evict_changed_team(sender, instance, **kwargs):
+    # bulk_create does not send signals, so teams created by get_many stay cached
+    team_cache.evict(instance)
@@ -1,3 +1,33 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from acid_db.models import Team
+from acid_db.team_cache import TeamCache
+
+
+class TeamCacheTests(TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("acid_db.team_cache.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = TeamCache(max_size=10, ttl=60)
+
+    def test_changes_made_elsewhere_are_picked_up_after_the_ttl(self):
+        team = Team.objects.create(name="Lions")
+        self.assertEqual(self.cache.get("Lions"), team)
+        Team.objects.filter(pk=team.pk).update(name="Tigers")  # No signal, as in another process
+
+        self.now += 30
+        self.assertEqual(self.cache.get("Lions"), team)
+        self.now += 31
+        self.assertIsNone(self.cache.get("Lions"))
+        self.assertEqual(self.cache.get("Tigers"), team)
+
+    def test_created_teams_are_cached(self):
+        teams, created = self.cache.get_many(["Lions", "Bears"], create=True)
+        self.assertEqual(created, 2)
+        self.assertEqual(self.cache.stats()["size"], 0)  # Only cached once the transaction commits
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cache.get("Lions").pk, teams["Lions"].pk)
@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Avg
 from realtime.models import Metric, EventRT, RecommendedBet
+from realtime.active_events import get_active_events
 from uuid import UUID
 from django.db.models import Sum, Count
 
@@ -84,12 +85,13 @@ def _fetch_team_data(betted_teams):
     print("[DEBUG] Fetching team data (upcoming events & performance)...")
     team_data = {}
     two_weeks_ago = datetime.datetime.utcnow() - datetime.timedelta(weeks=2)
+    # Upcoming/live events come from the shared in-process cache instead of one query per team
+    active_events = get_active_events()
     for tid, name in betted_teams.items():
         print(f"[DEBUG] Team {tid}: {name}")
-        upcoming = list(
-            EventRT.objects.filter(
-                (Q(homeTeam=name) | Q(awayTeam=name)) & Q(status__in=['upcoming', 'live'])
-            ).order_by('startTime')
+        upcoming = sorted(
+            (e for e in active_events if e.homeTeam == name or e.awayTeam == name),
+            key=lambda e: (e.startTime is None, e.startTime or datetime.datetime.min)
         )
         print(f"[DEBUG]  Upcoming events count: {len(upcoming)}")
         recent = EventRT.objects.filter(
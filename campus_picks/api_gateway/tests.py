@@ -1,3 +1,58 @@
-from django.test import TestCase
-
-# Create your tests here.
+from unittest import mock
+
+from rest_framework.test import APIClient
+
+from location_processor.user_state import user_states
+from location_processor.views import recent_incidents
+from realtime.models import Incident
+from realtime.tests import MongomockTestCase
+
+EVENTS = [("e1", 40.0, -74.0, "live"), ("e2", 41.0, -74.0, "upcoming")]
+
+
+class LocationBatchViewTests(MongomockTestCase):
+    def setUp(self):
+        super().setUp()
+        user_states.clear()
+        recent_incidents.clear()
+        self.addCleanup(user_states.clear)
+        self.addCleanup(recent_incidents.clear)
+        for target, value in (
+            ("location_processor.views.all_active_events", lambda: EVENTS),
+            ("location_processor.views.incident_buffer.max_size", 0),  # Bulk write, not the buffer
+        ):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, pings):
+        return APIClient().post("/api/location/batch", {"pings": pings}, format="json")
+
+    def test_pings_of_many_users_record_their_incidents(self):
+        response = self.post([
+            {"userId": "u1", "lat": 40.0, "lng": -74.0005, "timestamp": "2025-05-01T20:00:00"},
+            {"userId": "u2", "lat": 41.005, "lng": -74.0, "timestamp": "2025-05-01T20:00:00"},
+            {"userId": "u1", "lat": 40.0, "lng": -74.0005, "timestamp": "2025-05-01T20:00:10"},  # Debounced
+            {"userId": "u3", "lat": 10.0, "lng": 10.0, "timestamp": "2025-05-01T20:00:00"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"processed": 3, "skipped": 1, "transitions": 2, "incidents": 3})
+        self.assertEqual(
+            sorted((i.incidentType, i.userId, i.eventId) for i in Incident.objects),
+            [("attendance", "u1", "e1"), ("proximity", "u1", "e1"), ("proximity", "u2", "e2")],
+        )
+
+    def test_replayed_batch_writes_nothing_new(self):
+        ping = {"userId": "u1", "lat": 40.0, "lng": -74.0005, "timestamp": "2025-05-01T20:00:00"}
+        self.post([ping])
+        user_states.clear()
+        recent_incidents.clear()
+
+        self.assertEqual(self.post([ping]).json()["incidents"], 0)
+        self.assertEqual(Incident.objects.count(), 2)
+
+    def test_invalid_ping_is_rejected(self):
+        response = self.post([{"userId": "u1", "lat": "north", "lng": -74.0, "timestamp": "2025-05-01T20:00:00"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("index 0", response.json()["error"])
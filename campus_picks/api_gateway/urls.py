@@ -2,7 +2,10 @@
 from django.urls import path
 from .views import (
     location_update_view,
+    location_batch_view,
+    geofence_view,
     get_events,
+    active_event_cache_stats,
     get_recommended_events,
     create_bet,
     list_bets,
@@ -23,7 +26,10 @@ from .views import login_probe
 
 urlpatterns = [
     path('location', location_update_view, name='location_update'),
+    path('location/batch', location_batch_view, name='location_batch'),
+    path('location/geofences', geofence_view, name='location_geofences'),
     path('events', get_events, name="get_events"),
+    path('events/cache-stats', active_event_cache_stats, name="active_event_cache_stats"),
     path('events/recommended/', get_recommended_events, name="get_recommended_events"),
     path('bets', create_bet, name='create_bet'),        # POST /bets
     path('bets/history', list_bets, name='list_bets'),            # GET /bets/history?userId=...
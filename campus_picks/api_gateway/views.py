@@ -1,9 +1,11 @@
 # api/views.py
+import datetime
 from decimal import Decimal
 import uuid
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from location_processor.views import process_location_update
+from location_processor.views import process_location_update, process_location_batch, get_geofences
+from realtime.active_events import active_events
 from rest_framework.views import APIView
 from rest_framework import status
 from bet_management.views import (
@@ -203,6 +205,69 @@ def location_update_view(request):
     return Response(status=200)
 
 
+@api_view(['GET'])
+def geofence_view(request):
+    """
+    GET /location/geofences?userId=...
+    Events the user is currently near or attending, with the dwell time so far.
+    Response example:
+    {
+        "geofences": [
+            {"eventId": "65680a7325b155e497e433e50ce5155e", "state": "attending", "dwellSeconds": 1260.0}
+        ]
+    }
+    """
+    user_id = request.query_params.get('userId')
+    if not user_id:
+        return Response({"error": "userId query parameter is required"}, status=400)
+    return Response({"geofences": get_geofences(user_id)}, status=200)
+
+
+@api_view(['POST'])
+def location_batch_view(request):
+    """
+    Endpoint for processing buffered location updates from one or many users.
+    Expects a JSON payload like:
+    {
+        "pings": [
+            {"userId": "string", "lat": number, "lng": number, "timestamp": "ISO8601 string"},
+            ...
+        ]
+    }
+    Pings go through the same debouncing and geofence state as POST /location.
+    Response example:
+    {
+        "processed": 118,
+        "skipped": 2,
+        "transitions": 5,
+        "incidents": 3
+    }
+    """
+    pings = request.data.get('pings')
+    if not isinstance(pings, list):
+        return Response({"error": "pings must be a list of location updates."}, status=400)
+
+    cleaned = []
+    for i, ping in enumerate(pings):
+        try:
+            user_id = ping.get('userId')
+            lat = float(ping['lat'])
+            lng = float(ping['lng'])
+            timestamp = ping['timestamp']
+            datetime.datetime.fromisoformat(timestamp)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            user_id = None
+        if not user_id:
+            return Response(
+                {"error": f"Invalid ping at index {i}: userId, lat, lng and timestamp are required."},
+                status=400
+            )
+        cleaned.append({'userId': user_id, 'lat': lat, 'lng': lng, 'timestamp': timestamp})
+
+    result = process_location_batch(cleaned)
+    return Response(result, status=200)
+
+
 
 
 @api_view(['POST'])
@@ -294,7 +359,7 @@ from rest_framework import status
 def get_events(request):
     """
     GET /events
-    Query Parameters (opcional): sport, startDate, endDate
+    Query Parameters (opcional): sport, status (ej. "upcoming,live"), startDate, endDate
     Ejemplo de respuesta:
     {
       "events": [
@@ -317,6 +382,8 @@ def get_events(request):
     filterParams = {}
     if 'sport' in request.query_params:
         filterParams['sport'] = request.query_params['sport']
+    if 'status' in request.query_params:
+        filterParams['status'] = [value.strip().lower() for value in request.query_params['status'].split(',') if value.strip()]
     if 'startDate' in request.query_params:
         filterParams['startDate'] = request.query_params['startDate']
     if 'endDate' in request.query_params:
@@ -329,6 +396,24 @@ def get_events(request):
       )
     return Response({"events": events}, status=status.HTTP_200_OK)
 
+@api_view(['GET'])
+def active_event_cache_stats(request):
+    """
+    GET /events/cache-stats
+    Hit/miss counters of the in-process active event cache.
+    Ejemplo de respuesta:
+    {
+      "size": 42,
+      "version": 7,
+      "ttl": 30,
+      "hits": 1830,
+      "misses": 7,
+      "invalidations": 5,
+      "hitRate": 0.9962
+    }
+    """
+    return Response(active_events.stats(), status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 def get_recommended_events(request):
     """
@@ -375,14 +460,24 @@ def trigger_sports_polling(request):
     Triggers the poll_events function from the sports_data_integration module.
     Optional JSON payload:
     {
-      "provider": "api-sports"
+      "provider": "api-sports",
+      "wait": false   // If a poll is already running, wait for it and return its summary
+    }
+    If a poll of the provider is already running no new poll is started, and the
+    response is 202 with the id of the run in flight:
+    {
+      "message": "Polling already in progress", "runId": "9c1e...", "startedAt": "..."
     }
     """
     # Obtain the provider from the request body if present
     provider_id = request.data.get('provider', 'api-sports')
     try:
-        poll_events(provider_id)
-        return Response({"message": f"Polling triggered for provider: {provider_id}"},
+        summary = poll_events(provider_id, join=bool(request.data.get('wait', False)))
+        if summary.get("skipped"):
+            return Response({"message": "Polling already in progress", "runId": summary["runId"],
+                             "startedAt": summary["startedAt"]},
+                            status=status.HTTP_202_ACCEPTED)
+        return Response({"message": f"Polling triggered for provider: {provider_id}", "summary": summary},
                         status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)},
@@ -8,6 +8,7 @@ from bson import ObjectId
 from acid_db.models import Event, Team, Bet, User
 from realtime.models import EventRT, RecommendedBet
 from acid_db.models import User, Event, Team, Bet
+from acid_db.team_cache import team_cache
 from django.core.exceptions import ObjectDoesNotExist
 
 
@@ -19,22 +20,33 @@ from acid_db.views import (
     query_records
 )
 from realtime.views import read_data, write_data, update_data
+from realtime.active_events import ACTIVE_STATUSES, INTERNAL_EVENT_FIELDS, get_active_events
 
 logger = logging.getLogger(__name__)
 
 def listEvents(filterParams: dict) -> list:
     """
-    Returns upcoming events, optionally filtered by parameters such as sport, startDate, endDate.
-    Reads detailed event data from the Real-Time DB (Mongo).
+    Returns upcoming events, optionally filtered by parameters such as sport, status, startDate, endDate.
+    Reads detailed event data from the Real-Time DB (Mongo). When only upcoming/live
+    statuses are requested, the events come from the in-process active event cache.
     """
-    # Here we simply retrieve all events; you can add filtering logic if needed.
-    events = read_data("events")
+    statuses = filterParams.get("status")
+    if statuses and set(statuses) <= set(ACTIVE_STATUSES):
+        candidates = [event.to_dict() for event in get_active_events() if event.status in statuses]
+    else:
+        candidates = []
+        for event in read_data("events"):
+            # Convert document to dict if necessary (depends on your Mongo driver usage)
+            event_data = event.to_mongo().to_dict()
+            event_data["eventId"] = str(event_data.pop("_id", None))
+            for field in INTERNAL_EVENT_FIELDS:
+                event_data.pop(field, None)
+            candidates.append(event_data)
     filtered = []
-    for event in events:
-        # Convert document to dict if necessary (depends on your Mongo driver usage)
-        event_data = event.to_mongo().to_dict()
-        event_data["eventId"] = str(event_data.pop("_id", None))
+    for event_data in candidates:
         # Apply simple filtering
+        if statuses and event_data.get("status") not in statuses:
+            continue
         if "sport" in filterParams and event_data.get("sport") != filterParams["sport"]:
             continue
         if "startDate" in filterParams and event_data.get("startTime") < filterParams["startDate"]:
@@ -93,7 +105,7 @@ def placeBet(userId: str, betInfo: dict) -> dict:
     except ObjectDoesNotExist:
         raise ValueError(f"Event '{betInfo['eventId']}' not found")
 
-    team = Team.objects.filter(name=team_name).first()
+    team = team_cache.get(team_name)
     if not team:
         raise ValueError(f"Team '{team_name}' not found")
 
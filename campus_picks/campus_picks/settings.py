@@ -10,8 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
-import mongoengine
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,11 +42,13 @@ INSTALLED_APPS = [
     'api_gateway',
     'sports_data_integration',
     "realtime",
+    "location_processor",
     "django_crontab",
     "acid_db",
     "user_management",
     "analytics_engine",
-    "django_apscheduler"
+    "django_apscheduler",
+    "channels",
 ]
 
 MIDDLEWARE = [
@@ -78,6 +80,21 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'campus_picks.wsgi.application'
+ASGI_APPLICATION = 'campus_picks.asgi.application'
+
+# Channel layer for WebSocket consumers. The in-memory layer is enough for a
+# single process / local testing; use channels_redis when running several workers:
+# CHANNEL_LAYERS = {
+#     'default': {
+#         'BACKEND': 'channels_redis.core.RedisChannelLayer',
+#         'CONFIG': {'hosts': [('127.0.0.1', 6379)]},
+#     }
+# }
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
 
 
 # Database
@@ -135,13 +152,70 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-mongoengine.connect(
-    db='your_db_name',
-    host='localhost',
-    port=27017,
-)
+# Default MongoDB connection, opened by realtime.apps.RealtimeConfig.ready()
+# (which also registers the command listener used by sports_data_integration.instrumentation)
+MONGODB_CONNECTION = {
+    'db': 'your_db_name',
+    'host': 'localhost',
+    'port': 27017,
+}
+
+# In-process cache of upcoming/live events shared by location processing and the events API
+ACTIVE_EVENT_CACHE_TTL = 30    # Seconds before the cache is reloaded from Mongo
+
+# Location processing: grid index of upcoming/live events used for proximity checks
+LOCATION_INDEX_CELL_KM = 1.0   # Size of each grid cell in km
+LOCATION_GEO_QUERY = False     # Query Mongo's 2dsphere index instead (run `backfill_event_geo` first)
+LOCATION_DEBOUNCE_METERS = 25      # Pings that moved less than this...
+LOCATION_DEBOUNCE_SECONDS = 30     # ...within this many seconds are skipped
+LOCATION_STATE_MAX_USERS = 50000   # Users whose last processed ping is kept in memory
+INCIDENT_DEDUP_CACHE_SIZE = 10000  # Recently stored incidents kept in memory (0 disables)
+INCIDENT_BUFFER_SIZE = 500         # Incidents queued before a bulk insert (0 writes each one directly)
+INCIDENT_BUFFER_MAX_DELAY = 2.0    # Seconds an incident may wait in the buffer
+
+# Sports data integration
+SPORTS_API_KEY = os.environ.get("SPORTS_API_KEY", "")  # Default key of the adapters below
+SPORTS_ADAPTERS = [            # Polled providers; each entry may also set api_key, host, scheme and port
+    {"class": "sports_data_integration.adapters.BasketballAPIAdapter"},
+    {"class": "sports_data_integration.adapters.FootballAPIAdapter"},
+]
+SPORTS_FAKE_PROVIDER_URL = None  # e.g. "http://127.0.0.1:8765" to poll `manage.py fake_provider` instead
+SPORTS_FAKE_PROVIDER_DIR = BASE_DIR / "fake_provider_data"  # Payload files served by the fake provider
+SPORTS_API_TIMEOUT = 10        # Seconds to wait for each provider during a poll
+SPORTS_API_POOL_SIZE = 4       # Keep-alive connections kept per provider host
+SPORTS_API_RETRIES = 3         # Retries on connection errors and 429/5xx answers
+SPORTS_API_RETRY_BACKOFF = 0.5 # Exponential backoff factor between retries, in seconds
+SPORTS_RATE_LIMIT_ENABLED = True
+SPORTS_RATE_LIMIT_DIR = BASE_DIR / "sports_rate_limits"  # Token bucket files shared by every process
+SPORTS_RATE_LIMIT_PER_MINUTE = 30  # Requests per minute and provider host, shared by every process
+SPORTS_RATE_LIMIT_BURST = 10       # Requests that can be sent back to back after an idle period
+SPORTS_RATE_LIMITS = {}            # Per host overrides, e.g. {"v3.football.api-sports.io": {"per_minute": 300, "burst": 30}}
+SPORTS_RATE_LIMIT_MAX_WAIT = 5     # Seconds a request waits for a token (live polls are then sent anyway)
+SPORTS_QUOTA_LOW_RESERVE = 0.25    # Share of the bucket and of the daily quota backfill never uses
+SPORTS_QUOTA_LIVE_RESERVE = 0.05   # Share of the daily quota kept for live polling only
+SPORTS_API_CACHE_ENABLED = True
+SPORTS_API_CACHE_DIR = BASE_DIR / "sports_api_cache"  # Compressed provider answers, one file per request
+SPORTS_API_CACHE_TTL_LIVE = 30      # Seconds a cached answer for yesterday/today stays fresh (live polls always revalidate)
+SPORTS_API_CACHE_TTL_UPCOMING = 900 # Seconds for future dates; older dates never expire
+SPORTS_INGEST_BATCH_SIZE = 500 # Events written per bulk batch while a payload is streamed
+SPORTS_INGEST_QUEUE_BATCHES = 4 # Parsed batches waiting for the writer before parsing pauses
+SPORTS_BACKFILL_WORKERS = 4    # Concurrent provider requests during a backfill
+SPORTS_WINDOW_DAYS_BACK = 14   # Past days refreshed by the forward-window job (team form window)
+SPORTS_WINDOW_DAYS_AHEAD = 7   # Upcoming days fetched by the forward-window job
+SPORTS_POLL_LEASE_SECONDS = 120  # A poll that stops renewing its single-flight lease for this long is taken over
+SPORTS_POLL_RUN_HISTORY = 500    # Poll/backfill runs kept with their per-stage timings
+SPORTS_POLL_JOIN_TIMEOUT = 30    # Seconds a trigger with "wait": true waits for the poll in flight
+SPORTS_POLL_TICK_SECONDS = 10  # How often run_scheduler checks which provider/date is due
+SPORTS_POLL_INTERVAL_LIVE = 20        # Seconds between polls while events are live
+SPORTS_POLL_INTERVAL_STARTING = 60    # ... when an event starts within SPORTS_POLL_NEAR_START
+SPORTS_POLL_INTERVAL_IDLE = 900       # ... when only later events (or none) are known
+SPORTS_POLL_INTERVAL_FINISHED = 3600  # ... when every event of the date is over
+SPORTS_POLL_NEAR_START = 900          # Seconds before a start time when polling tightens
+SPORTS_WEBHOOK_SECRET = None   # Shared secret expected in X-Webhook-Secret (None accepts any caller)
+TEAM_CACHE_SIZE = 20000        # Team rows kept in the name -> Team cache
+TEAM_CACHE_TTL = 300           # Seconds before a cached team is reloaded (renames/deletes by other processes)
 
 
 CRONJOBS = [
-    ('*/1 * * * *', 'sports_data_integration.views.poll_events_task'), # Ejecuta cada minuto
+    ('*/1 * * * *', 'sports_data_integration.adaptive.adaptive_poll_task'), # Revisa cada minuto; solo consulta lo que toca
 ]
\ No newline at end of file
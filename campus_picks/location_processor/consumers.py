@@ -0,0 +1,63 @@
+# location_processor/consumers.py
+import datetime
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.generic.websocket import JsonWebsocketConsumer
+
+from location_processor.views import process_location_update
+
+logger = logging.getLogger(__name__)
+
+
+def user_group(user_id: str) -> str:
+    """Channel layer group of a user's location sockets."""
+    return f"location.{user_id}"
+
+
+class LocationConsumer(JsonWebsocketConsumer):
+    """
+    WebSocket stream of location frames for one user: ws/location/<userId>/
+
+    Each frame sent by the client:
+        {"lat": number, "lng": number, "timestamp": "ISO8601 string", "seq": 17}
+
+    Each frame is answered on the same socket with the geofence transitions it caused:
+        {"type": "ack", "seq": 17, "transitions": [{"eventId": "...", "from": "outside", "to": "near",
+                                                    "distanceKm": 0.42, "dwellSeconds": 0.0,
+                                                    "incidents": ["proximity"]}]}
+    or
+        {"type": "error", "seq": 17, "error": "..."}
+    """
+    def connect(self):
+        self.user_id = self.scope["url_route"]["kwargs"]["user_id"]
+        if self.channel_layer is not None:
+            async_to_sync(self.channel_layer.group_add)(user_group(self.user_id), self.channel_name)
+        self.accept()
+
+    def disconnect(self, code):
+        if self.channel_layer is not None:
+            async_to_sync(self.channel_layer.group_discard)(user_group(self.user_id), self.channel_name)
+
+    def receive_json(self, content, **kwargs):
+        seq = content.get("seq") if isinstance(content, dict) else None
+        try:
+            lat = float(content["lat"])
+            lng = float(content["lng"])
+            timestamp = content["timestamp"]
+            datetime.datetime.fromisoformat(timestamp)
+        except (KeyError, TypeError, ValueError):
+            self.send_json({"type": "error", "seq": seq, "error": "lat, lng and timestamp are required."})
+            return
+
+        try:
+            transitions = process_location_update(self.user_id, {"lat": lat, "lng": lng}, timestamp)
+        except Exception as e:
+            logger.error("Error processing location frame for %s: %s", self.user_id, e)
+            self.send_json({"type": "error", "seq": seq, "error": "Could not process location."})
+            return
+        self.send_json({"type": "ack", "seq": seq, "transitions": transitions})
+
+    def location_notification(self, event):
+        """Lets other parts of the backend push messages to a user's socket via the channel layer."""
+        self.send_json(event["payload"])
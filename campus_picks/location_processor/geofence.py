@@ -0,0 +1,76 @@
+# location_processor/geofence.py
+import datetime
+
+# Geofence states of a (user, event) pair, kept as small ints
+OUTSIDE = 0
+NEAR = 1       # Within the proximity radius (1 km)
+ATTENDING = 2  # Within the attendance radius (0.1 km) of a live event
+
+STATE_NAMES = {OUTSIDE: "outside", NEAR: "near", ATTENDING: "attending"}
+
+# Incident recorded when a pair enters a state
+ENTRY_INCIDENTS = {NEAR: "proximity", ATTENDING: "attendance"}
+
+
+def to_epoch(timestamp: datetime.datetime) -> float:
+    """Seconds since the epoch; naive timestamps are taken as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return timestamp.timestamp()
+
+
+def classify(distance_km: float, status: str, near_km: float, attend_km: float) -> int:
+    """Geofence state for a distance to an event with the given status."""
+    if distance_km <= attend_km and status == "live":
+        return ATTENDING
+    if distance_km <= near_km:
+        return NEAR
+    return OUTSIDE
+
+
+def advance(fences: dict, event_id: str, new_state: int, at: float, position: tuple = None):
+    """
+    Moves one (user, event) pair to `new_state` at time `at` (epoch seconds).
+
+    `fences` maps acidEventId -> (state, entered_at, inside_since, position) for
+    the pairs that are not OUTSIDE, so a user far from everything costs nothing.
+    `inside_since` is when the user first got near the event, used for dwell time.
+    `position` is the event's (lat, lng), kept so the distance can still be
+    reported once the event is no longer around (see fence_position).
+
+    Returns None when the state did not change, otherwise a dict:
+        {"eventId", "from", "to", "dwellSeconds", "incidents"}
+    where dwellSeconds is the time spent in the state being left and
+    incidents lists the incident types recorded by moving inwards
+    (outside -> attending records both proximity and attendance).
+    """
+    current, entered_at, inside_since, known_position = fences.get(event_id, (OUTSIDE, at, at, None))
+    if new_state == current:
+        return None
+
+    if new_state == OUTSIDE:
+        fences.pop(event_id, None)
+    else:
+        fences[event_id] = (new_state, at, inside_since if current != OUTSIDE else at, position or known_position)
+
+    return {
+        "eventId": event_id,
+        "from": STATE_NAMES[current],
+        "to": STATE_NAMES[new_state],
+        "dwellSeconds": round(at - entered_at, 1) if current != OUTSIDE else 0.0,
+        "incidents": [ENTRY_INCIDENTS[state] for state in range(current + 1, new_state + 1)],
+    }
+
+
+def dwell_seconds(fences: dict, event_id: str, now: float) -> float:
+    """Time the user has been near or attending the event, 0 when outside."""
+    entry = fences.get(event_id)
+    if entry is None:
+        return 0.0
+    return max(now - entry[2], 0.0)
+
+
+def fence_position(fences: dict, event_id: str):
+    """(lat, lng) of the event when the pair entered its current state, or None."""
+    entry = fences.get(event_id)
+    return entry[3] if entry is not None else None
@@ -0,0 +1,199 @@
+# location_processor/management/commands/bench_location.py
+import contextlib
+import datetime
+import json
+import math
+import random
+import time
+
+import mongoengine
+from django.core.management.base import BaseCommand, CommandError
+
+from location_processor.user_state import user_states
+from location_processor.views import process_location_update, recent_incidents
+from realtime.active_events import active_events
+from realtime.incident_buffer import flush_incidents
+from realtime.models import EventRT, Incident
+from realtime.monitoring import MongoCommandCounter
+from sports_data_integration.normalize import get_random_location
+
+BENCH_DB = "campus_picks_bench"
+
+# Collection methods counted as one DB operation when running on mongomock
+MONGOMOCK_OPERATIONS = (
+    "find", "find_one", "insert_one", "insert_many", "update_one", "update_many",
+    "replace_one", "bulk_write", "delete_one", "delete_many", "aggregate", "count_documents",
+)
+
+KM_PER_DEGREE = 111.32
+
+
+@contextlib.contextmanager
+def count_mongomock_operations(counter: MongoCommandCounter):
+    """mongomock does not emit pymongo command events, so wrap its collection methods instead."""
+    from mongomock.collection import Collection
+
+    originals = {}
+    for name in MONGOMOCK_OPERATIONS:
+        original = getattr(Collection, name)
+        originals[name] = original
+
+        def wrapper(self, *args, __name=name, __original=original, **kwargs):
+            counter.add(__name)
+            return __original(self, *args, **kwargs)
+
+        setattr(Collection, name, wrapper)
+    try:
+        yield counter
+    finally:
+        for name, original in originals.items():
+            setattr(Collection, name, original)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(math.ceil(pct / 100.0 * len(sorted_values))) - 1)
+    return sorted_values[max(k, 0)]
+
+
+def offset(lat: float, lng: float, meters: float, bearing: float) -> tuple:
+    """Moves a point `meters` in the direction `bearing` (radians)."""
+    dlat = meters * math.cos(bearing) / 1000 / KM_PER_DEGREE
+    dlng = meters * math.sin(bearing) / 1000 / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+    return lat + dlat, lng + dlng
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay synthetic location traces through process_location_update and report "
+        "pings/sec, latency percentiles and DB operations per ping. Runs against an "
+        "in-memory mongomock database unless --mongo-uri points to a test MongoDB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="Number of simulated users.")
+        parser.add_argument("--events", type=int, default=50, help="Number of events to create.")
+        parser.add_argument("--pings", type=int, default=20, help="Pings replayed per user.")
+        parser.add_argument("--live-ratio", type=float, default=0.5, help="Share of events that are live.")
+        parser.add_argument("--step", type=float, default=40.0, help="Mean walking distance between pings, in meters.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, so runs are comparable.")
+        parser.add_argument("--mongo-uri", default=None,
+                            help=f"Test MongoDB URI. The '{BENCH_DB}' database is created and dropped.")
+        parser.add_argument("--json", action="store_true", help="Print the report as a single JSON line.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        random.seed(options["seed"])  # get_random_location uses the module-level generator
+        counter = MongoCommandCounter()
+
+        mongoengine.disconnect()
+        if options["mongo_uri"]:
+            mongoengine.connect(db=BENCH_DB, host=options["mongo_uri"], event_listeners=[counter])
+            counting = contextlib.nullcontext()
+        else:
+            try:
+                import mongomock
+            except ImportError:
+                raise CommandError("mongomock is not installed; pass --mongo-uri to use a test MongoDB.")
+            mongoengine.connect(db=BENCH_DB, mongo_client_class=mongomock.MongoClient)
+            counting = count_mongomock_operations(counter)
+
+        try:
+            Incident.ensure_indexes()
+            events = self._create_events(rng, options["events"], options["live_ratio"])
+            traces = self._build_traces(rng, events, options["users"], options["pings"], options["step"])
+            report = self._replay(traces, counter, counting)
+        finally:
+            mongoengine.get_db().client.drop_database(BENCH_DB)
+            mongoengine.disconnect()
+
+        report.update({
+            "users": options["users"],
+            "events": options["events"],
+            "pingsPerUser": options["pings"],
+        })
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+            return
+        self.stdout.write(
+            f"Replayed {report['pings']} pings ({report['users']} users, {report['events']} events) "
+            f"in {report['seconds']:.2f}s"
+        )
+        self.stdout.write(f"  throughput : {report['pingsPerSec']:.1f} pings/sec")
+        self.stdout.write(
+            f"  latency ms : p50={report['p50Ms']:.3f}  p95={report['p95Ms']:.3f}  p99={report['p99Ms']:.3f}"
+        )
+        self.stdout.write(f"  db ops     : {report['dbOpsPerPing']:.3f} per ping {report['dbOps']}")
+        self.stdout.write(f"  incidents  : {report['incidents']}")
+
+    def _create_events(self, rng, count: int, live_ratio: float) -> list:
+        now = datetime.datetime.utcnow()
+        events = []
+        for i in range(count):
+            location = get_random_location()
+            # Spread events a little around each city so they do not all overlap
+            lat, lng = offset(location["lat"], location["lng"], rng.uniform(0, 3000), rng.uniform(0, 2 * math.pi))
+            events.append(EventRT(
+                acidEventId=f"bench{i:06d}",
+                name=f"Bench event {i}",
+                sport="football",
+                location={"lat": lat, "lng": lng},
+                startTime=now,
+                status="live" if rng.random() < live_ratio else "upcoming",
+            ))
+        EventRT.objects.insert(events)
+        return events
+
+    def _build_traces(self, rng, events: list, users: int, pings: int, step: float) -> list:
+        """Each user starts near a random event and walks around it; pings are interleaved across users."""
+        positions = []
+        for u in range(users):
+            event = rng.choice(events)
+            lat, lng = offset(event.location["lat"], event.location["lng"], rng.uniform(0, 1500), rng.uniform(0, 2 * math.pi))
+            positions.append([f"bench-user-{u}", lat, lng, rng.uniform(0, 2 * math.pi)])
+
+        traces = []
+        start = datetime.datetime.utcnow()
+        for p in range(pings):
+            timestamp = (start + datetime.timedelta(seconds=5 * p)).isoformat()
+            for position in positions:
+                user_id, lat, lng, heading = position
+                traces.append((user_id, lat, lng, timestamp))
+                heading += rng.gauss(0, 0.6)
+                lat, lng = offset(lat, lng, rng.expovariate(1 / step), heading)
+                position[1:] = [lat, lng, heading]
+        return traces
+
+    def _replay(self, traces: list, counter: MongoCommandCounter, counting) -> dict:
+        # Start from cold in-process state so runs are comparable
+        active_events.invalidate()
+        user_states.clear()
+        recent_incidents.clear()
+
+        latencies = []
+        with counting:
+            counter.reset()
+            started = time.perf_counter()
+            for user_id, lat, lng, timestamp in traces:
+                t0 = time.perf_counter()
+                process_location_update(user_id, {"lat": lat, "lng": lng}, timestamp)
+                latencies.append(time.perf_counter() - t0)
+            flush_incidents()
+            elapsed = time.perf_counter() - started
+            db_ops = dict(counter.counts)
+            total_ops = counter.total
+
+        latencies.sort()
+        pings = len(traces)
+        return {
+            "pings": pings,
+            "seconds": elapsed,
+            "pingsPerSec": pings / elapsed if elapsed else 0.0,
+            "p50Ms": percentile(latencies, 50) * 1000,
+            "p95Ms": percentile(latencies, 95) * 1000,
+            "p99Ms": percentile(latencies, 99) * 1000,
+            "dbOps": db_ops,
+            "dbOpsPerPing": total_ops / pings if pings else 0.0,
+            "incidents": Incident.objects.count(),
+        }
@@ -0,0 +1,8 @@
+# location_processor/routing.py
+from django.urls import re_path
+
+from .consumers import LocationConsumer
+
+websocket_urlpatterns = [
+    re_path(r"^ws/location/(?P<user_id>[^/]+)/$", LocationConsumer.as_asgi()),
+]
@@ -0,0 +1,146 @@
+# location_processor/spatial_index.py
+import math
+import threading
+
+from django.conf import settings
+
+from realtime.active_events import ACTIVE_STATUSES, active_events
+from realtime.models import EventRT
+
+KM_PER_DEGREE = 111.32  # Length of one degree of latitude in km
+
+
+class EventGridIndex:
+    """
+    Uniform lat/lng grid of the active (upcoming/live) events.
+    Each cell is roughly `cell_km` wide, so a ping only has to look at the
+    handful of cells that overlap its search radius instead of every event.
+    """
+    def __init__(self, cell_km: float = 1.0):
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        # Columns split 360 degrees evenly, so the last one is as wide as the others
+        # and wrapping around the antimeridian lands on the real neighbouring column
+        self.n_cols = max(int(round(360.0 / self.cell_deg)), 1)
+        self.col_deg = 360.0 / self.n_cols
+        self.cells = {}    # (row, col) -> {acidEventId: (lat, lng, status)}
+        self.entries = {}  # acidEventId -> (row, col)
+        self.version = None  # Version of the active event cache the grid was built from
+
+    def _cell(self, lat: float, lng: float) -> tuple:
+        row = int(math.floor((lat + 90.0) / self.cell_deg))
+        col = int(math.floor((lng + 180.0) / self.col_deg)) % self.n_cols
+        return row, col
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.entries.clear()
+
+    def upsert(self, event_id: str, lat: float, lng: float, status: str) -> None:
+        """Adds or moves an event in the grid."""
+        self.remove(event_id)
+        cell = self._cell(lat, lng)
+        self.cells.setdefault(cell, {})[event_id] = (lat, lng, status)
+        self.entries[event_id] = cell
+
+    def remove(self, event_id: str) -> None:
+        cell = self.entries.pop(event_id, None)
+        if cell is None:
+            return
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.pop(event_id, None)
+            if not bucket:
+                del self.cells[cell]
+
+    def candidates(self, lat: float, lng: float, radius_km: float) -> list:
+        """
+        Returns (acidEventId, lat, lng, status) for every event stored in the
+        cells that overlap the given radius. Callers still need to check the
+        exact distance; this only prunes events that are obviously too far.
+        """
+        radius_deg = radius_km / KM_PER_DEGREE
+        row_span = int(math.ceil(radius_deg / self.cell_deg))
+        # A degree of longitude shrinks with latitude, so widen the column span
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        col_span = min(int(math.ceil(radius_deg / cos_lat / self.col_deg)), self.n_cols // 2)
+
+        row, col = self._cell(lat, lng)
+        found = []
+        for r in range(row - row_span, row + row_span + 1):
+            for c in range(col - col_span, col + col_span + 1):
+                bucket = self.cells.get((r, c % self.n_cols))
+                if bucket:
+                    found.extend(
+                        (event_id, ev_lat, ev_lng, status)
+                        for event_id, (ev_lat, ev_lng, status) in bucket.items()
+                    )
+        return found
+
+
+_index = EventGridIndex(getattr(settings, "LOCATION_INDEX_CELL_KM", 1.0))
+_index_lock = threading.Lock()
+
+
+def get_active_event_index() -> EventGridIndex:
+    """
+    Returns the shared index, rebuilding it whenever the active event cache
+    has been reloaded (TTL expiry or invalidation by a writer such as poll_events).
+    """
+    version, events = active_events.snapshot()
+    if _index.version == version:
+        return _index
+    with _index_lock:
+        if _index.version != version:
+            _index.clear()
+            for event in events:
+                location = event.location or {}
+                lat, lng = location.get("lat"), location.get("lng")
+                if lat is None or lng is None:
+                    continue
+                _index.upsert(event.acidEventId, lat, lng, event.status)
+            _index.version = version
+    return _index
+
+
+def all_active_events() -> list:
+    """Returns (acidEventId, lat, lng, status) for every indexed event."""
+    index = get_active_event_index()
+    with _index_lock:
+        return [
+            (event_id, lat, lng, status)
+            for bucket in index.cells.values()
+            for event_id, (lat, lng, status) in bucket.items()
+        ]
+
+
+def find_nearby_events(lat: float, lng: float, radius_km: float) -> list:
+    """Thread-safe lookup of the candidate events around a position."""
+    index = get_active_event_index()
+    with _index_lock:
+        return index.candidates(lat, lng, radius_km)
+
+
+def query_nearby_events(lat: float, lng: float, radius_km: float) -> list:
+    """
+    2dsphere mode (LOCATION_GEO_QUERY): asks Mongo for the active events within
+    radius_km of the position, filtering by status in the same query.
+    Returns the same (acidEventId, lat, lng, status) tuples as find_nearby_events.
+    """
+    query = {
+        "geo": {
+            "$nearSphere": {
+                "$geometry": {"type": "Point", "coordinates": [lng, lat]},
+                "$maxDistance": radius_km * 1000,
+            }
+        },
+        "status": {"$in": list(ACTIVE_STATUSES)},
+    }
+    projection = {"acidEventId": 1, "geo": 1, "status": 1}
+    found = []
+    for doc in EventRT._get_collection().find(query, projection):
+        ev_lng, ev_lat = doc["geo"]["coordinates"]
+        found.append((doc["acidEventId"], ev_lat, ev_lng, doc.get("status")))
+    return found
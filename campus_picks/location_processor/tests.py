@@ -1,3 +1,74 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from location_processor.geofence import ATTENDING, NEAR, OUTSIDE, advance, classify, dwell_seconds
+from location_processor.spatial_index import EventGridIndex
+from location_processor.views import haversine
+
+
+class ClassifyTests(SimpleTestCase):
+    def test_attending_needs_a_live_event(self):
+        self.assertEqual(classify(0.05, "live", 1.0, 0.1), ATTENDING)
+        self.assertEqual(classify(0.05, "upcoming", 1.0, 0.1), NEAR)
+        self.assertEqual(classify(0.8, "live", 1.0, 0.1), NEAR)
+        self.assertEqual(classify(1.5, "live", 1.0, 0.1), OUTSIDE)
+
+
+class AdvanceTests(SimpleTestCase):
+    def test_same_state_is_not_a_transition(self):
+        fences = {}
+        self.assertIsNone(advance(fences, "e1", OUTSIDE, 100.0))
+        advance(fences, "e1", NEAR, 100.0)
+        self.assertIsNone(advance(fences, "e1", NEAR, 160.0))
+        self.assertEqual(fences["e1"][1], 100.0)
+
+    def test_entering_records_one_incident_per_state_crossed(self):
+        fences = {}
+        transition = advance(fences, "e1", ATTENDING, 100.0, (40.0, -74.0))
+        self.assertEqual(transition, {
+            "eventId": "e1", "from": "outside", "to": "attending",
+            "dwellSeconds": 0.0, "incidents": ["proximity", "attendance"],
+        })
+        self.assertEqual(fences["e1"], (ATTENDING, 100.0, 100.0, (40.0, -74.0)))
+
+    def test_dwell_time_spans_every_inner_state(self):
+        fences = {}
+        advance(fences, "e1", NEAR, 100.0, (40.0, -74.0))
+        to_attending = advance(fences, "e1", ATTENDING, 160.0)
+        self.assertEqual(to_attending["incidents"], ["attendance"])
+        self.assertEqual(to_attending["dwellSeconds"], 60.0)
+        self.assertEqual(dwell_seconds(fences, "e1", 400.0), 300.0)
+
+        back_to_near = advance(fences, "e1", NEAR, 1000.0)
+        self.assertEqual(back_to_near["incidents"], [])
+        self.assertEqual(back_to_near["dwellSeconds"], 840.0)
+        self.assertEqual(fences["e1"][3], (40.0, -74.0))
+
+        leaving = advance(fences, "e1", OUTSIDE, 1100.0)
+        self.assertEqual((leaving["from"], leaving["to"], leaving["dwellSeconds"]), ("near", "outside", 100.0))
+        self.assertNotIn("e1", fences)
+        self.assertEqual(dwell_seconds(fences, "e1", 1200.0), 0.0)
+
+
+class EventGridIndexTests(SimpleTestCase):
+    def test_wraps_around_the_antimeridian(self):
+        index = EventGridIndex(1.0)
+        index.upsert("east", 0.0, 179.997, "live")
+        found = {candidate[0] for candidate in index.candidates(0.0, -179.9995, 1.0)}
+        self.assertIn("east", found)  # 0.39 km away, across the antimeridian
+
+    def test_candidates_match_brute_force_around_the_antimeridian(self):
+        index = EventGridIndex(1.0)
+        lngs = [round(179.98 + i * 0.001, 3) for i in range(41)]
+        lngs = [lng - 360 if lng >= 180 else lng for lng in lngs]
+        events = []
+        for lat in (0.0, 20.0, 45.0):
+            for lng in lngs:
+                event_id = f"{lat}:{lng}"
+                index.upsert(event_id, lat, lng, "live")
+                events.append((event_id, lat, lng))
+
+        for lat in (0.0, 20.0, 45.0):
+            for lng in lngs:
+                found = {candidate[0] for candidate in index.candidates(lat, lng + 0.0004, 1.0)}
+                expected = {e for e, ev_lat, ev_lng in events if haversine(lat, lng + 0.0004, ev_lat, ev_lng) <= 1.0}
+                self.assertLessEqual(expected, found)
@@ -0,0 +1,74 @@
+# location_processor/user_state.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class UserLocationState:
+    """Last processed ping of a user and their geofence state per nearby event."""
+    __slots__ = ("lat", "lng", "processed_at", "last_ping_at", "fences")
+
+    def __init__(self, lat: float, lng: float, processed_at: float):
+        self.lat = lat
+        self.lng = lng
+        self.processed_at = processed_at  # Server monotonic time, used for debouncing
+        self.last_ping_at = None          # Epoch seconds of the ping's own timestamp
+        self.fences = {}  # acidEventId -> (state, entered_at, inside_since, position), see geofence.advance
+
+
+class UserStateStore:
+    """
+    Bounded LRU of UserLocationState keyed by user id.
+    The least recently seen users are evicted once `max_users` is reached,
+    so memory stays flat no matter how many users are connected.
+    """
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def get(self, user_id: str):
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is not None:
+                self._states.move_to_end(user_id)
+            return state
+
+    def put(self, user_id: str, lat: float, lng: float) -> UserLocationState:
+        """Records a processed ping, keeping the user's geofence states."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                state = UserLocationState(lat, lng, now)
+                self._states[user_id] = state
+            else:
+                state.lat, state.lng, state.processed_at = lat, lng, now
+                self._states.move_to_end(user_id)
+            while len(self._states) > self.max_users:
+                self._states.popitem(last=False)
+            return state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+user_states = UserStateStore(getattr(settings, "LOCATION_STATE_MAX_USERS", 50000))
+
+
+def should_skip_ping(state, distance_m: float) -> bool:
+    """
+    True when the user barely moved since the last processed ping and that ping
+    is recent enough, so the update can be dropped without touching the DB.
+    """
+    if state is None:
+        return False
+    min_distance = getattr(settings, "LOCATION_DEBOUNCE_METERS", 25)
+    interval = getattr(settings, "LOCATION_DEBOUNCE_SECONDS", 30)
+    return distance_m < min_distance and time.monotonic() - state.processed_at < interval
@@ -1,6 +1,15 @@
 import datetime
 import math
-from realtime.views import read_data, write_data  # Functions to interact with MongoDB
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from django.conf import settings
+from realtime.views import read_data, write_data, create_incident_if_absent, create_incidents_if_absent  # Functions to interact with MongoDB
+from realtime.incident_buffer import incident_buffer
+from location_processor.spatial_index import find_nearby_events, all_active_events, query_nearby_events
+from location_processor.user_state import user_states, should_skip_ping
+from location_processor.geofence import OUTSIDE, STATE_NAMES, advance, classify, dwell_seconds, fence_position, to_epoch
 #from integration.push_service import send_notification
 
 def haversine(lat1, lon1, lat2, lon2):
@@ -14,6 +23,19 @@ def haversine(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
+def haversine_matrix(lats, lngs, event_lats, event_lngs) -> np.ndarray:
+    """
+    Vectorized Haversine: distances in km between every point (lats[i], lngs[i])
+    and every event (event_lats[j], event_lngs[j]), as a len(lats) x len(event_lats) matrix.
+    """
+    R = 6371  # Earth radius in km
+    lat1 = np.radians(np.asarray(lats, dtype=float))[:, None]
+    lon1 = np.radians(np.asarray(lngs, dtype=float))[:, None]
+    lat2 = np.radians(np.asarray(event_lats, dtype=float))[None, :]
+    lon2 = np.radians(np.asarray(event_lngs, dtype=float))[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
 import datetime
 import json
 import logging
@@ -26,56 +48,91 @@ from dateutil.parser import parse as parse_date
 
 logger = logging.getLogger(__name__)
 
-def record_proximity_incident(user_id: str, event_id: str) -> None:
+PROXIMITY_RADIUS_KM = 1.0
+ATTENDANCE_RADIUS_KM = 0.1
+
+class RecentIncidentCache:
     """
-    Records a proximity incident for a user and event,
-    only if no existing incident of type "proximity" exists for that combination.
+    Small LRU of (incidentType, userId, eventId) triples already stored.
+    Lets repeated pings from the same user skip the database entirely.
+    A max_size of 0 disables the cache.
     """
-    # Read all incidents from the "incidents" collection
-    incidents = read_data("incidents")
-    print(incidents)
-    if incidents:
-        for inc in incidents:
-            # Assuming inc is a dict; adjust if using a MongoEngine document
-            if inc.incidentType == "proximity" and inc.userId == user_id and inc.eventId == event_id:
-                # Incident already exists, so exit
-                return
-    # If no duplicate found, create the incident
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: tuple) -> bool:
+        if not self.max_size:
+            return False
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return True
+            return False
+
+    def add(self, key: tuple) -> None:
+        if not self.max_size:
+            return
+        with self._lock:
+            self._seen[key] = None
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_size:
+                self._seen.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
+
+
+recent_incidents = RecentIncidentCache(getattr(settings, "INCIDENT_DEDUP_CACHE_SIZE", 10000))
+
+def _record_incident(incident_type: str, user_id: str, event_id: str) -> None:
+    key = (incident_type, user_id, event_id)
+    if key in recent_incidents:
+        return
     incident_data = {
-        "incidentType": "proximity",
+        "incidentType": incident_type,
         "userId": user_id,
         "eventId": event_id,
         "timestamp": datetime.datetime.utcnow().isoformat()
     }
-    write_data("incidents", incident_data)
+    if incident_buffer.max_size:
+        # Write-behind: queued and bulk inserted off the request path
+        incident_buffer.add(incident_data)
+    else:
+        # Insert-if-absent keyed on (type, user, event); an existing incident is left untouched
+        create_incident_if_absent(incident_data)
+    recent_incidents.add(key)
+
+def record_proximity_incident(user_id: str, event_id: str) -> None:
+    """
+    Records a proximity incident for a user and event,
+    only if no existing incident of type "proximity" exists for that combination.
+    """
+    _record_incident("proximity", user_id, event_id)
 
 def record_attendance_incident(user_id: str, event_id: str) -> None:
     """
     Records an attendance incident for a user and event,
     only if no existing incident of type "attendance" exists for that combination.
     """
-    incidents = read_data("incidents")
-    if incidents:
-        for inc in incidents:
-            if inc.incidentType == "attendance" and inc.userId == user_id and inc.eventId == event_id:
-                return
-    incident_data = {
-        "incidentType": "attendance",
-        "userId": user_id,
-        "eventId": event_id,
-        "timestamp": datetime.datetime.utcnow().isoformat()
-    }
-    write_data("incidents", incident_data)
+    _record_incident("attendance", user_id, event_id)
 
-def process_location_update(user_id: str, location_data: dict, timestamp_str: str) -> None:
+def process_location_update(user_id: str, location_data: dict, timestamp_str: str) -> list:
     """
     Processes a location update:
     - Converts the provided timestamp.
-    - Reads events from the real-time database (Mongo).
-    - Filters events with status "upcoming" or "live".
-    - Calculates the distance between the user's location and each event.
-    - If within 1 km, records a proximity incident.
-    - If the event is live and within 0.1 km, records an attendance incident.
+    - Drops the ping if the user barely moved since their last processed ping.
+    - Looks up the upcoming/live events around the user in the active event index.
+    - Moves each (user, event) geofence between outside, near (<= 1 km) and
+      attending (<= 0.1 km while live).
+    - Entering near records a proximity incident; entering attending records an
+      attendance incident. Staying in the same state writes nothing.
+
+    Returns the geofence transitions caused by this ping, e.g.
+        [{"eventId": "...", "from": "outside", "to": "near", "distanceKm": 0.42,
+          "dwellSeconds": 0.0, "incidents": ["proximity"]}]
     """
     # Convert the ISO8601 timestamp string to a datetime object
     user_timestamp = datetime.datetime.fromisoformat(timestamp_str)
@@ -83,38 +140,165 @@ def process_location_update(user_id: str, location_data: dict, timestamp_str: st
     # Get user's coordinates
     user_lat = location_data.get('lat')
     user_lng = location_data.get('lng')
+
+    state = _accept_ping(user_id, user_lat, user_lng, to_epoch(user_timestamp))
+    if state is None:
+        return []
     
-    # Retrieve events from the real-time DB (Mongo)
-    events = read_data('events')
-    
-    for event in events:
-        # Process only events with status "upcoming" or "live"
-        event_status = getattr(event, "status", "").lower() if hasattr(event, "status") else ""
-        if event_status not in ("upcoming", "live"):
+    # Only events around the user, already filtered to "upcoming"/"live":
+    # either from Mongo's 2dsphere index or from the in-process grid
+    if getattr(settings, "LOCATION_GEO_QUERY", False):
+        candidates = query_nearby_events(user_lat, user_lng, PROXIMITY_RADIUS_KM)
+    else:
+        candidates = find_nearby_events(user_lat, user_lng, PROXIMITY_RADIUS_KM)
+
+    nearby = [
+        (event_id, event_lat, event_lng, event_status, haversine(user_lat, user_lng, event_lat, event_lng))
+        for event_id, event_lat, event_lng, event_status in candidates
+    ]
+    transitions = _advance_geofences(state, user_lat, user_lng, nearby)
+    for transition in transitions:
+        for incident_type in transition["incidents"]:
+            _record_incident(incident_type, user_id, transition["eventId"])
+
+        # Optionally, send a notification with the calculated distance
+        # send_notification(user_id, {
+        #     "title": "Proximity Alert",
+        #     "body": f"You are {transition['distanceKm']:.2f} km away from an event.",
+        #     "eventId": transition["eventId"]
+        # })
+
+    return transitions
+
+def _accept_ping(user_id: str, user_lat: float, user_lng: float, at: float):
+    """
+    Debounces a ping: returns None when the user barely moved since their last
+    processed ping (stationary users resend the same position; they are skipped
+    without any DB access), otherwise their updated UserLocationState.
+    """
+    state = user_states.get(user_id)
+    if state is not None:
+        moved_m = haversine(state.lat, state.lng, user_lat, user_lng) * 1000
+        if should_skip_ping(state, moved_m):
+            return None
+    state = user_states.put(user_id, user_lat, user_lng)
+    state.last_ping_at = at
+    return state
+
+def _advance_geofences(state, user_lat: float, user_lng: float, nearby) -> list:
+    """
+    Moves the user's geofences to match one ping. `nearby` holds
+    (acidEventId, lat, lng, status, distance_km) for the events around the user;
+    fenced events missing from it (the user moved away, or the event ended) go
+    back to outside. Returns the transitions, each with its distanceKm.
+    """
+    at = state.last_ping_at
+    transitions = []
+    seen = set()
+    for event_id, event_lat, event_lng, event_status, distance in nearby:
+        seen.add(event_id)
+        new_state = classify(distance, event_status, PROXIMITY_RADIUS_KM, ATTENDANCE_RADIUS_KM)
+        transition = advance(state.fences, event_id, new_state, at, (event_lat, event_lng))
+        if transition is not None:
+            transition["distanceKm"] = round(distance, 3)
+            transitions.append(transition)
+
+    # Events the user was near but that are no longer around (moved away, or event ended)
+    for event_id in [e for e in state.fences if e not in seen]:
+        position = fence_position(state.fences, event_id)
+        transition = advance(state.fences, event_id, OUTSIDE, at)
+        transition["distanceKm"] = round(haversine(user_lat, user_lng, *position), 3)
+        transitions.append(transition)
+    return transitions
+
+def get_geofences(user_id: str) -> list:
+    """
+    Current geofence state of a user for every event they are near or attending,
+    with the time spent inside up to their last processed ping:
+        [{"eventId": "...", "state": "attending", "dwellSeconds": 1260.0}]
+    """
+    state = user_states.get(user_id)
+    if state is None:
+        return []
+    now = state.last_ping_at or time.time()
+    return [
+        {
+            "eventId": event_id,
+            "state": STATE_NAMES[fence[0]],
+            "dwellSeconds": round(dwell_seconds(state.fences, event_id, now), 1),
+        }
+        for event_id, fence in list(state.fences.items())
+    ]
+
+def process_location_batch(pings: list) -> dict:
+    """
+    Processes many location updates at once, with the same debouncing and
+    geofence transitions as process_location_update.
+
+    Input:
+        [
+            {"userId": "string", "lat": number, "lng": number, "timestamp": "ISO8601 string"},
+            ...
+        ]
+
+    - Computes the ping x active-event distance matrix in a single NumPy pass.
+    - Feeds each ping's row (in timestamp order) through the user's geofences.
+    - Records the incidents of every transition: queued in the incident buffer,
+      or written in a single bulk write when it is disabled.
+
+    Returns {"processed": <pings not debounced>, "skipped": <debounced pings>,
+             "transitions": <geofence transitions>, "incidents": <new incidents>}.
+    """
+    times = [to_epoch(datetime.datetime.fromisoformat(ping["timestamp"])) for ping in pings]
+    events = all_active_events()
+    event_index = {event[0]: j for j, event in enumerate(events)}
+    distances = haversine_matrix(
+        [ping["lat"] for ping in pings],
+        [ping["lng"] for ping in pings],
+        [event[1] for event in events],
+        [event[2] for event in events],
+    )
+    near = distances <= PROXIMITY_RADIUS_KM
+
+    processed = transitions = 0
+    keys = []
+    for i in sorted(range(len(pings)), key=times.__getitem__):
+        ping = pings[i]
+        state = _accept_ping(ping["userId"], ping["lat"], ping["lng"], times[i])
+        if state is None:
             continue
-        
-        # Ensure event startTime is a datetime object
-        if isinstance(event.startTime, str):
-            event_start = datetime.datetime.fromisoformat(event.startTime)
-        else:
-            event_start = event.startTime
-        
-        # Calculate the distance between user and event location
-        event_location = event.location  # Expecting a dict with 'lat' and 'lng'
-        event_lat = event_location.get('lat')
-        event_lng = event_location.get('lng')
-        distance = haversine(user_lat, user_lng, event_lat, event_lng)
-        
-        if distance <= 1:  # Proximity threshold: 1 km
-            record_proximity_incident(user_id, event.acidEventId)
-            
-            # Record attendance only if the event is live and within 0.1 km
-            if event_status == "live" and distance <= 0.1:
-                record_attendance_incident(user_id, event.acidEventId)
-            
-            # Optionally, send a notification with the calculated distance
-            # send_notification(user_id, {
-            #     "title": "Proximity Alert",
-            #     "body": f"You are {distance:.2f} km away from an event.",
-            #     "eventId": event.acidEventId
-            # })
+        processed += 1
+        # Fenced events stay in the row even beyond the radius, so leaving them
+        # gets its distance from the matrix like any other transition
+        columns = set(np.flatnonzero(near[i]).tolist())
+        columns.update(event_index[e] for e in state.fences if e in event_index)
+        nearby = [(*events[j], float(distances[i, j])) for j in sorted(columns)]
+        for transition in _advance_geofences(state, ping["lat"], ping["lng"], nearby):
+            transitions += 1
+            keys.extend((incident_type, ping["userId"], transition["eventId"]) for incident_type in transition["incidents"])
+
+    return {
+        "processed": processed,
+        "skipped": len(pings) - processed,
+        "transitions": transitions,
+        "incidents": _record_incidents(keys),
+    }
+
+def _record_incidents(keys: list) -> int:
+    """
+    Records many (incidentType, userId, eventId) incidents, skipping the ones
+    already stored. Returns the number queued (buffer) or created (bulk write).
+    """
+    new_keys = [key for key in dict.fromkeys(keys) if key not in recent_incidents]
+    if incident_buffer.max_size:
+        for key in new_keys:
+            _record_incident(*key)
+        return len(new_keys)
+    now = datetime.datetime.utcnow().isoformat()
+    created = create_incidents_if_absent([
+        {"incidentType": incident_type, "userId": user_id, "eventId": event_id, "timestamp": now}
+        for incident_type, user_id, event_id in new_keys
+    ])
+    for key in new_keys:
+        recent_incidents.add(key)
+    return created
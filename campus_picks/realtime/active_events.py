@@ -0,0 +1,119 @@
+# realtime/active_events.py
+import threading
+import time
+
+from django.conf import settings
+
+from realtime.models import EventRT
+
+# Statuses that make an event "active" (the only ones pings and recommendations care about)
+ACTIVE_STATUSES = ("upcoming", "live")
+
+# EventRT fields copied into the cache, in storage order
+EVENT_FIELDS = (
+    "acidEventId", "name", "sport", "location", "startTime", "endTime", "status",
+    "providerId", "homeTeam", "awayTeam", "home_score", "away_score",
+    "home_logo", "away_logo", "oddsA", "oddsB",
+)
+
+# Bookkeeping fields of EventRT documents that are not part of the event API
+INTERNAL_EVENT_FIELDS = ("geo", "webhookAt")
+
+
+class ActiveEvent:
+    """Compact, read-only copy of an active EventRT document."""
+    __slots__ = ("id",) + EVENT_FIELDS
+
+    def __init__(self, raw: dict):
+        self.id = raw.get("_id")
+        for field in EVENT_FIELDS:
+            setattr(self, field, raw.get(field))
+        self.status = (self.status or "").lower()
+
+    def to_dict(self) -> dict:
+        """Same shape listEvents returns for a Mongo document."""
+        data = {"eventId": str(self.id)}
+        for field in EVENT_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+
+class ActiveEventCache:
+    """
+    In-process cache of the upcoming/live events.
+    The snapshot is reloaded from Mongo when it is older than `ttl` seconds or
+    after invalidate() is called by a writer. `version` changes on every reload
+    so derived structures (e.g. the proximity grid) know when to rebuild.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot = (0, ())  # (version, events), swapped as a single reference
+        self.loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._stale = True
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot[0]
+
+    @property
+    def events(self) -> tuple:
+        return self._snapshot[1]
+
+    def _expired(self) -> bool:
+        return self._stale or time.monotonic() - self.loaded_at > self.ttl
+
+    def snapshot(self) -> tuple:
+        """Returns (version, events), reloading the events from Mongo if needed."""
+        if not self._expired():
+            self.hits += 1
+            return self._snapshot
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            if not self._expired():
+                self.hits += 1
+                return self._snapshot
+            self.misses += 1
+            self._stale = False
+            raw_events = EventRT.objects(status__in=ACTIVE_STATUSES).as_pymongo()
+            events = tuple(ActiveEvent(raw) for raw in raw_events)
+            self._snapshot = (self.version + 1, events)
+            self.loaded_at = time.monotonic()
+            return self._snapshot
+
+    def get(self) -> tuple:
+        """Returns the current tuple of ActiveEvent, reloading it if needed."""
+        return self.snapshot()[1]
+
+    def invalidate(self) -> None:
+        """Forces the next get() to reload from Mongo."""
+        self._stale = True
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.events),
+            "version": self.version,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+active_events = ActiveEventCache(getattr(settings, "ACTIVE_EVENT_CACHE_TTL", 30))
+
+
+def get_active_events() -> tuple:
+    return active_events.get()
+
+
+def invalidate_active_events() -> None:
+    active_events.invalidate()
@@ -1,6 +1,14 @@
+import mongoengine
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class RealtimeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'realtime'
+
+    def ready(self):
+        from realtime.monitoring import thread_command_counter
+
+        # Mongo commands per poll stage (sports_data_integration.instrumentation)
+        mongoengine.connect(**settings.MONGODB_CONNECTION, event_listeners=[thread_command_counter])
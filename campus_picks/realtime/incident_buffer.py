@@ -0,0 +1,116 @@
+# realtime/incident_buffer.py
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+
+from realtime.models import Incident
+from realtime.views import create_incidents_if_absent
+
+logger = logging.getLogger(__name__)
+
+
+class IncidentWriteBuffer:
+    """
+    Write-behind queue for incidents.
+
+    Incidents are validated and queued in memory, then written by a background
+    thread with a single unordered bulk write of insert-if-absent upserts (see
+    create_incidents_if_absent) when `max_size` are pending or `max_delay`
+    seconds have passed, and once more when the process exits. Duplicates are
+    skipped by the upserts themselves, so this does not depend on the unique
+    (incidentType, userId, eventId) index having been built.
+    """
+    def __init__(self, max_size: int, max_delay: float):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_pending = max_size * 10  # Cap while Mongo is unreachable
+        self._pending = []
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self._closed = False
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, data: dict) -> None:
+        """Queues one incident (same dict write_data("incidents", ...) accepts)."""
+        doc = Incident(**data)
+        doc.validate()
+        fields = doc.to_mongo().to_dict()
+        key = (fields["incidentType"], fields["userId"], fields["eventId"])
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            self._pending.append(fields)
+            full = len(self._pending) >= self.max_size
+        self._ensure_worker()
+        if full:
+            self._wakeup.set()  # Flush from the worker, not the request thread
+
+    def flush(self) -> int:
+        """
+        Writes everything queued so far. Returns the number of new incidents stored.
+        Safe to call from tests or shutdown hooks at any time.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._keys = set()
+            if not batch:
+                return 0
+            try:
+                return create_incidents_if_absent(batch)
+            except Exception as e:
+                # The upserts are idempotent, so re-sending the whole batch is safe
+                logger.error("Incident flush failed, %d document(s) re-queued: %s", len(batch), e)
+                self._requeue(batch)
+                return 0
+
+    def _requeue(self, docs: list) -> None:
+        with self._lock:
+            self._pending = docs + self._pending
+            if len(self._pending) > self.max_pending:
+                dropped = len(self._pending) - self.max_pending
+                logger.error("Incident buffer full, dropping %d oldest incident(s)", dropped)
+                self._pending = self._pending[dropped:]
+            self._keys = {(f["incidentType"], f["userId"], f["eventId"]) for f in self._pending}
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None or self._closed:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="incident-buffer", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        # Time-based flush so a quiet period never leaves incidents waiting for long
+        while not self._closed:
+            self._wakeup.wait(self.max_delay)
+            self._wakeup.clear()
+            if self._pending:
+                self.flush()
+
+    def close(self) -> None:
+        """Stops the background flusher and writes whatever is still queued."""
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+
+
+incident_buffer = IncidentWriteBuffer(
+    getattr(settings, "INCIDENT_BUFFER_SIZE", 500),
+    getattr(settings, "INCIDENT_BUFFER_MAX_DELAY", 2.0),
+)
+atexit.register(incident_buffer.close)
+
+
+def flush_incidents() -> int:
+    """Forces the pending incidents out to Mongo (used by tests and shutdown)."""
+    return incident_buffer.flush()
@@ -0,0 +1,41 @@
+# realtime/management/commands/backfill_event_geo.py
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+
+from realtime.models import EventRT
+from realtime.views import geo_point
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy every event location into the GeoJSON `geo` field and create its 2dsphere index. "
+        "Required before enabling LOCATION_GEO_QUERY."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Updates sent per bulk write.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        coll = EventRT._get_collection()
+        cursor = coll.find({"location.lat": {"$ne": None}, "location.lng": {"$ne": None}}, {"location": 1})
+
+        updated = 0
+        batch = []
+        for doc in cursor:
+            point = geo_point(doc.get("location"))
+            if point is None:
+                continue
+            batch.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"geo": {"type": "Point", "coordinates": point}}}
+            ))
+            if len(batch) >= batch_size:
+                updated += coll.bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += coll.bulk_write(batch, ordered=False).modified_count
+        self.stdout.write(f"Backfilled the geo field of {updated} event(s).")
+
+        EventRT.ensure_indexes()
+        self.stdout.write("2dsphere index on events.geo is in place.")
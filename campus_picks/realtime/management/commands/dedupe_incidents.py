@@ -0,0 +1,31 @@
+# realtime/management/commands/dedupe_incidents.py
+from django.core.management.base import BaseCommand
+
+from realtime.models import Incident
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove duplicate (incidentType, userId, eventId) incidents, keeping the oldest, "
+        "and create the unique index that keeps incident writes idempotent."
+    )
+
+    def handle(self, *args, **options):
+        coll = Incident._get_collection()
+        pipeline = [
+            {"$sort": {"_id": 1}},
+            {"$group": {
+                "_id": {"incidentType": "$incidentType", "userId": "$userId", "eventId": "$eventId"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1},
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        removed = 0
+        for group in coll.aggregate(pipeline, allowDiskUse=True):
+            extra_ids = group["ids"][1:]
+            removed += coll.delete_many({"_id": {"$in": extra_ids}}).deleted_count
+        self.stdout.write(f"Removed {removed} duplicate incident(s).")
+
+        Incident.ensure_indexes()
+        self.stdout.write("Unique index on (incidentType, userId, eventId) is in place.")
@@ -1,6 +1,6 @@
 # realtime/models.py
 import datetime
-from mongoengine import Document, StringField, DateTimeField, DictField, FloatField, IntField
+from mongoengine import Document, StringField, DateTimeField, DictField, FloatField, IntField, PointField
 
 class EventRT(Document):
     
@@ -8,6 +8,7 @@ class EventRT(Document):
     name = StringField(required=True)
     sport = StringField()  # Ej: 'soccer', 'basketball'
     location = DictField()  # Ej: {"lat": 40.7128, "lng": -74.0060}
+    geo = PointField()      # GeoJSON copy of location (2dsphere index), filled when LOCATION_GEO_QUERY is on
     startTime = DateTimeField()  # Fecha y hora de inicio del evento
     endTime = DateTimeField()    # Fecha y hora de finalización del evento
     status = StringField()       # Ej: 'upcoming', 'live', 'ended'
@@ -22,6 +23,7 @@ class EventRT(Document):
     away_logo = StringField() 
     oddsA = FloatField()   # home‑team odd
     oddsB = FloatField()   # away‑team odd
+    webhookAt = DictField()  # webhook type -> timestamp of the last one applied (see apply_event_update)
 
     meta = {
         'collection': 'events'
@@ -48,7 +50,13 @@ class Incident(Document):
     location = DictField()
 
     meta = {
-        'collection': 'incidents'
+        'collection': 'incidents',
+        # One incident per (type, user, event). The index is built by the
+        # `dedupe_incidents` command, which first removes legacy duplicates.
+        'indexes': [
+            {'fields': ['incidentType', 'userId', 'eventId'], 'unique': True},
+        ],
+        'auto_create_index': False,
     }
 
 class Metric(Document):
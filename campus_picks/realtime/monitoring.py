@@ -0,0 +1,62 @@
+# realtime/monitoring.py
+import threading
+from collections import Counter
+
+from pymongo import monitoring
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+    pymongo command listener that counts the commands sent to MongoDB.
+    Pass it to `mongoengine.connect(..., event_listeners=[counter])`.
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def add(self, command_name: str) -> None:
+        with self._lock:
+            self.counts[command_name] += 1
+
+    def started(self, event):
+        self.add(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class ThreadCommandCounter(monitoring.CommandListener):
+    """
+    pymongo command listener that counts commands per thread. pymongo publishes
+    command events in the thread that sends the command, so count() tells a
+    caller how many commands its own thread has sent, whatever other threads do.
+    Registered on the default connection by RealtimeConfig.ready().
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def count(self) -> int:
+        return getattr(self._local, "count", 0)
+
+    def started(self, event):
+        self._local.count = self.count() + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+thread_command_counter = ThreadCommandCounter()
@@ -1,3 +1,107 @@
-from django.test import TestCase
+import datetime
+import unittest
+from unittest import mock
 
-# Create your tests here.
+import mongoengine
+from django.test import SimpleTestCase
+
+from realtime.models import EventRT, Incident
+from realtime.views import apply_event_update, bulk_upsert_events, create_incident_if_absent, create_incidents_if_absent
+
+try:
+    import mongomock
+    import mongomock.collection
+except ImportError:
+    mongomock = None
+
+
+def _without_sort(method):
+    # pymongo >= 4.11 passes `sort` to bulk updates, which mongomock does not accept yet
+    def wrapper(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+@unittest.skipIf(mongomock is None, "mongomock is not installed")
+class MongomockTestCase(SimpleTestCase):
+    """Runs each test against an empty in-memory mongomock database."""
+    def setUp(self):
+        mongoengine.disconnect()
+        mongoengine.connect(db="campus_picks_test", mongo_client_class=mongomock.MongoClient)
+        self.addCleanup(mongoengine.disconnect)
+        builder = mongomock.collection.BulkOperationBuilder
+        for name in ("add_update", "add_replace", "add_delete"):
+            patcher = mock.patch.object(builder, name, _without_sort(getattr(builder, name)))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class ApplyEventUpdateTests(MongomockTestCase):
+    def setUp(self):
+        super().setUp()
+        EventRT._get_collection().insert_one({"acidEventId": "e1", "name": "A vs B", "status": "live"})
+
+    def at(self, minute: int) -> datetime.datetime:
+        return datetime.datetime(2025, 5, 1, 20, minute)
+
+    def event(self) -> dict:
+        return EventRT._get_collection().find_one({"acidEventId": "e1"})
+
+    def test_newer_update_is_applied(self):
+        self.assertEqual(apply_event_update("e1", {"home_score": 1}, "score", self.at(10)), "applied")
+        self.assertEqual(apply_event_update("e1", {"home_score": 2}, "score", self.at(20)), "applied")
+        self.assertEqual(self.event()["home_score"], 2)
+        self.assertEqual(self.event()["name"], "A vs B")
+
+    def test_replayed_and_out_of_order_updates_are_stale(self):
+        apply_event_update("e1", {"home_score": 2}, "score", self.at(20))
+        self.assertEqual(apply_event_update("e1", {"home_score": 2}, "score", self.at(20)), "stale")
+        self.assertEqual(apply_event_update("e1", {"home_score": 1}, "score", self.at(10)), "stale")
+        self.assertEqual(self.event()["home_score"], 2)
+
+    def test_sources_are_ordered_independently(self):
+        apply_event_update("e1", {"home_score": 2}, "score", self.at(20))
+        self.assertEqual(apply_event_update("e1", {"status": "finished"}, "status", self.at(10)), "applied")
+        self.assertEqual(self.event()["status"], "finished")
+
+    def test_unknown_event_is_missing(self):
+        self.assertEqual(apply_event_update("nope", {"home_score": 1}, "score", self.at(10)), "missing")
+
+    def test_poll_snapshot_older_than_a_webhook_keeps_its_score(self):
+        apply_event_update("e1", {"home_score": 2, "status": "live"}, "scoreUpdate", self.at(20))
+        snapshot = [{"acidEventId": "e1", "name": "A vs C", "home_score": 1, "status": "upcoming"}]
+        guard = {"guarded_fields": ("home_score", "status"), "guard_sources": ("scoreUpdate", "eventEnd")}
+
+        stored = bulk_upsert_events(snapshot, as_of=self.at(15), **guard)
+        self.assertEqual(stored["e1"]["home_score"], 2)
+        self.assertEqual((self.event()["name"], self.event()["status"]), ("A vs C", "live"))
+
+        stored = bulk_upsert_events(snapshot, as_of=self.at(25), **guard)
+        self.assertEqual(stored["e1"]["home_score"], 1)
+        self.assertEqual(self.event()["status"], "upcoming")
+
+    def test_guarded_fields_are_written_on_new_events(self):
+        stored = bulk_upsert_events(
+            [{"acidEventId": "e2", "name": "C vs D", "home_score": 0, "status": "live"}],
+            guarded_fields=("home_score", "status"), guard_sources=("scoreUpdate",), as_of=self.at(15),
+        )
+        self.assertEqual(stored["e2"]["home_score"], 0)
+        self.assertEqual(EventRT._get_collection().find_one({"acidEventId": "e2"})["status"], "live")
+
+
+class CreateIncidentIfAbsentTests(MongomockTestCase):
+    def incident(self, user_id: str = "u1", incident_type: str = "proximity") -> dict:
+        return {"incidentType": incident_type, "userId": user_id, "eventId": "e1"}
+
+    def test_same_incident_is_written_once(self):
+        self.assertTrue(create_incident_if_absent(self.incident()))
+        self.assertFalse(create_incident_if_absent(self.incident()))
+        self.assertTrue(create_incident_if_absent(self.incident(incident_type="attendance")))
+        self.assertEqual(Incident.objects.count(), 2)
+
+    def test_bulk_counts_only_new_incidents(self):
+        create_incident_if_absent(self.incident())
+        items = [self.incident(), self.incident("u2"), self.incident("u2"), self.incident("u3")]
+        self.assertEqual(create_incidents_if_absent(items), 2)
+        self.assertEqual(create_incidents_if_absent(items), 0)
+        self.assertEqual(Incident.objects.count(), 3)
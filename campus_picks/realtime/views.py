@@ -1,10 +1,28 @@
 # realtime/api.py
+from django.conf import settings
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 from realtime.models import EventRT, RecommendedBet, Incident, Metric
+from realtime.active_events import invalidate_active_events
 
 def parse_path(path: str):
     """Converts the given path into a list of segments."""
     return path.strip('/').split('/')
 
+def geo_point(location):
+    """Returns the GeoJSON [lng, lat] coordinates of a {"lat", "lng"} dict, or None."""
+    if not location or location.get('lat') is None or location.get('lng') is None:
+        return None
+    return [location['lng'], location['lat']]
+
+def _with_geo(data: dict) -> dict:
+    """In 2dsphere mode, mirrors the event location into the indexed `geo` field."""
+    if getattr(settings, "LOCATION_GEO_QUERY", False) and 'location' in data:
+        point = geo_point(data['location'])
+        if point is not None:
+            data = dict(data, geo=point)
+    return data
+
 def read_data(path: str):
     """
     Reads data from a specified path.
@@ -45,6 +63,7 @@ def write_data(path: str, data: dict):
     collection = segments[0] if segments else None
 
     if collection == 'events':
+        data = _with_geo(data)
         if len(segments) == 2:
             doc = EventRT.objects(acidEventId=segments[1]).first()
             if doc:
@@ -56,10 +75,12 @@ def write_data(path: str, data: dict):
                 data['acidEventId'] = segments[1]
                 doc = EventRT(**data)
                 doc.save()
+            invalidate_active_events()
             return doc
         else:
             doc = EventRT(**data)
             doc.save()
+            invalidate_active_events()
             return doc
     elif collection == 'recommendedBets':
         if len(segments) == 3:
@@ -90,6 +111,114 @@ def write_data(path: str, data: dict):
     else:
         raise ValueError("Unknown collection in write_data.")
 
+def bulk_upsert_events(events: list, insert_only_fields: tuple = (), guarded_fields: tuple = (),
+                       guard_sources: tuple = (), as_of=None) -> dict:
+    """
+    Creates or updates many events keyed on acidEventId with a single unordered
+    bulk write, then reads them back in one query.
+    Fields listed in insert_only_fields are only written when the event is created.
+    Fields listed in guarded_fields are only overwritten on existing events when
+    no update from guard_sources (see apply_event_update) is newer than `as_of`,
+    so an older snapshot never replaces a newer webhook score.
+    Returns a dict acidEventId -> stored document ("_id" and the guarded fields).
+    """
+    by_id = {}
+    for data in events:
+        data = _with_geo(data)
+        doc = EventRT(**data)
+        doc.validate()
+        # Only the given fields: defaults such as an empty webhookAt must not overwrite stored values
+        fields = {name: value for name, value in doc.to_mongo().to_dict().items() if name in data}
+        by_id[fields["acidEventId"]] = fields  # Last one wins if a provider repeats an event
+    if not by_id:
+        return {}
+    coll = EventRT._get_collection()
+    newer = [{f"webhookAt.{source}": {"$gt": as_of}} for source in guard_sources] if as_of else []
+    requests = []
+    for key, fields in by_id.items():
+        on_insert = {name: fields.pop(name) for name in insert_only_fields if name in fields}
+        guarded = {name: fields.pop(name) for name in guarded_fields if name in fields}
+        if guarded and not newer:
+            fields.update(guarded)
+            guarded = {}
+        update = {"$set": fields}
+        if on_insert or guarded:
+            update["$setOnInsert"] = dict(on_insert, **guarded)
+        requests.append(UpdateOne({"acidEventId": key}, update, upsert=True))
+        if guarded:
+            requests.append(UpdateOne({"acidEventId": key, "$nor": newer}, {"$set": guarded}))
+    coll.bulk_write(requests, ordered=False)
+    invalidate_active_events()
+    projection = dict.fromkeys(("acidEventId",) + tuple(guarded_fields), 1)
+    cursor = coll.find({"acidEventId": {"$in": list(by_id)}}, projection)
+    return {doc["acidEventId"]: doc for doc in cursor}
+
+def apply_event_update(acid_event_id: str, fields: dict, source: str, timestamp) -> str:
+    """
+    Partial update ($set of `fields` only) of one event, applied only if `timestamp`
+    is newer than the last update from the same `source` (e.g. a webhook type),
+    so replayed or out-of-order updates are ignored.
+    Returns "applied", "stale" (an equal or newer update was already applied) or "missing".
+    """
+    coll = EventRT._get_collection()
+    marker = f"webhookAt.{source}"
+    result = coll.update_one(
+        {"acidEventId": acid_event_id, "$or": [{marker: {"$exists": False}}, {marker: {"$lt": timestamp}}]},
+        {"$set": dict(fields, **{marker: timestamp})},
+    )
+    if result.matched_count:
+        return "applied"
+    return "stale" if coll.count_documents({"acidEventId": acid_event_id}, limit=1) else "missing"
+
+def create_incident_if_absent(data: dict) -> bool:
+    """
+    Inserts an incident only if none exists for its (incidentType, userId, eventId).
+    Runs as a single upsert, so the cost does not depend on the collection size.
+    Returns True if a new incident was written.
+    """
+    doc = Incident(**data)
+    doc.validate()
+    fields = doc.to_mongo().to_dict()
+    key = {
+        "incidentType": fields["incidentType"],
+        "userId": fields["userId"],
+        "eventId": fields["eventId"],
+    }
+    try:
+        result = Incident._get_collection().update_one(key, {"$setOnInsert": fields}, upsert=True)
+    except DuplicateKeyError:
+        # Another request inserted the same incident concurrently
+        return False
+    return result.upserted_id is not None
+
+def create_incidents_if_absent(items: list) -> int:
+    """
+    Bulk version of create_incident_if_absent: every incident is sent in one
+    unordered bulk write of insert-if-absent upserts.
+    Returns the number of incidents that were actually created.
+    """
+    requests = []
+    for data in items:
+        doc = Incident(**data)
+        doc.validate()
+        fields = doc.to_mongo().to_dict()
+        key = {
+            "incidentType": fields["incidentType"],
+            "userId": fields["userId"],
+            "eventId": fields["eventId"],
+        }
+        requests.append(UpdateOne(key, {"$setOnInsert": fields}, upsert=True))
+    if not requests:
+        return 0
+    try:
+        result = Incident._get_collection().bulk_write(requests, ordered=False)
+    except BulkWriteError as e:
+        # Duplicate keys only mean a concurrent writer got there first
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+        return e.details.get("nUpserted", 0)
+    return result.upserted_count
+
 def update_data(path: str, partial_data: dict):
     """
     Performs a partial update/merge on the document at the specified path.
@@ -103,7 +232,8 @@ def update_data(path: str, partial_data: dict):
     if collection == 'events' and len(segments) == 2:
         doc = EventRT.objects(acidEventId=segments[1]).first()
         if doc:
-            doc.update(**partial_data)
+            doc.update(**_with_geo(partial_data))
+            invalidate_active_events()
             return
     elif collection == 'recommendedBets' and len(segments) == 3:
         doc = RecommendedBet.objects(userId=segments[1], recommendationId=segments[2]).first()
@@ -133,6 +263,7 @@ def delete_data(path: str):
 
     if collection == 'events' and len(segments) == 2:
         EventRT.objects(acidEventId=segments[1]).delete()
+        invalidate_active_events()
     elif collection == 'recommendedBets' and len(segments) == 3:
         RecommendedBet.objects(userId=segments[1], recommendationId=segments[2]).delete()
     elif collection == 'incidents':
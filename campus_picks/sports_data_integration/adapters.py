@@ -0,0 +1,280 @@
+# sports_data_integration/adapters.py
+import functools
+import logging
+
+import ijson
+from dateutil.parser import parse as parse_date
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from sports_data_integration.instrumentation import stage
+from sports_data_integration.normalize import normalize_event
+from sports_data_integration.rate_limit import NORMAL
+from sports_data_integration.response_cache import response_cache
+from sports_data_integration.streaming import iter_response_items
+
+logger = logging.getLogger(__name__)
+
+# Adapter classes by name, filled as subclasses of BaseSportsAPIAdapter are defined
+ADAPTER_REGISTRY = {}
+
+DEFAULT_ADAPTERS = [
+    {"class": "sports_data_integration.adapters.BasketballAPIAdapter"},
+    {"class": "sports_data_integration.adapters.FootballAPIAdapter"},
+]
+
+
+class BaseSportsAPIAdapter:
+    """
+    Base adapter class for sports APIs.
+
+    Subclasses describe where the fixtures of a date live (`host`, `path`) and
+    implement extract(), which picks the raw fields out of one item of the
+    provider's `response` array. Fetching (through the response cache and the
+    shared connection pool), streaming JSON parsing and normalization into our
+    event dictionaries are shared by every adapter.
+    """
+    sport = None
+    host = None
+    path = None  # Endpoint taking a ?date=YYYY-MM-DD parameter
+    status_mapping = {}
+    default_name = "Unnamed Event"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ADAPTER_REGISTRY[cls.__name__] = cls
+
+    def __init__(self, provider_id: str, api_key: str, host: str = None, scheme: str = "https", port: int = None):
+        self.provider_id = provider_id
+        self.api_key = api_key
+        self.host = host or self.host
+        self.scheme = scheme
+        self.port = port
+
+    def headers(self) -> dict:
+        return {
+            'x-rapidapi-host': self.host,
+            'x-rapidapi-key': self.api_key
+        }
+
+    def open(self, date_str: str, priority: str = NORMAL):
+        """
+        Streamed body of the fixtures of a date (cached on disk, then through the shared
+        keep-alive pool). `priority` is the rate limit priority of the request (see rate_limit).
+        """
+        return response_cache.open(
+            self.host, f"{self.path}?date={date_str}", headers=self.headers(), date_str=date_str,
+            scheme=self.scheme, port=self.port, priority=priority,
+        )
+
+    def extract(self, item: dict):
+        """
+        Fields of one provider item, as expected by normalize.normalize_event,
+        or None to skip the item.
+        """
+        raise NotImplementedError("Subclasses must implement extract()")
+
+    def normalize(self, item: dict):
+        fields = self.extract(item)
+        if fields is None:
+            return None
+        return normalize_event(fields, self.sport, self.provider_id, self.status_mapping, self.default_name)
+
+    def iter_events(self, date_str: str, priority: str = NORMAL):
+        """
+        Generator of the standardized event dictionaries of a given date.
+        The provider's `response` array is parsed item by item while the body is
+        downloaded (or read from the cache), so memory does not grow with the
+        size of the payload.
+        """
+        meta = {}
+        with stage("fetch"):
+            body = self.open(date_str, priority)
+        with body:
+            try:
+                for item in iter_response_items(body, meta):
+                    event_data = self.normalize(item)
+                    if event_data is not None:
+                        yield event_data
+            except ijson.JSONError as e:
+                logger.error("Error decoding JSON in %s: %s", type(self).__name__, e)
+                body.reject()
+                return
+            if meta.get("errors"):
+                logger.error("%s answered with errors: %s", type(self).__name__, meta["errors"])
+                body.reject()
+
+    def get_events(self, date_str: str) -> list:
+        """
+        Retrieves and transforms the events of a given date.
+
+        Input:
+            date_str: Date in ISO format (e.g., "2025-03-20")
+
+        Returns:
+            A list of standardized event dictionaries (see iter_events to stream them).
+        """
+        return list(self.iter_events(date_str))
+
+
+class BasketballAPIAdapter(BaseSportsAPIAdapter):
+    """
+    Adapter for the external Basketball API.
+    Encapsulates connection details and transforms the API response
+    into a standardized list of event dictionaries.
+    """
+    sport = "basketball"
+    host = "v1.basketball.api-sports.io"
+    path = "/games"
+    # Mapping from API status codes to simplified statuses
+    status_mapping = {
+        "NS": "upcoming",   # Not Started → upcoming
+        "Q1": "live",       # Quarter 1 (In Play) → live
+        "Q2": "live",       # Quarter 2 (In Play) → live
+        "Q3": "live",       # Quarter 3 (In Play) → live
+        "Q4": "live",       # Quarter 4 (In Play) → live
+        "OT": "live",       # Over Time (In Play) → live
+        "BT": "live",       # Break Time (In Play) → live
+        "HT": "live",       # Halftime (In Play) → live
+        "FT": "finished",   # Game Finished → finished
+        "AOT": "finished",  # After Over Time → finished
+        "POST": "upcoming", # Game Postponed → upcoming
+        "CANC": "finished", # Game Cancelled → finished
+        "SUSP": "finished", # Game Suspended → finished
+        "AWD": "finished",  # Game Awarded → finished
+        "ABD": "finished"   # Game Abandoned → finished
+    }
+
+    def extract(self, item: dict):
+        # Retrieve date and time
+        date_event = item.get("date")  # e.g., "2025-03-19T00:00:00+00:00"
+        time_event = item.get("time")  # e.g., "23:30"
+
+        # Parse startTime; if unavailable, the current UTC time is used
+        start_time = None
+        if date_event and time_event:
+            if len(time_event.split(":")) == 2:
+                time_event += ":00"
+            try:
+                start_time = parse_date(f"{date_event[:10]}T{time_event}+00:00")
+            except Exception as e:
+                logger.error("Error parsing startTime: %s", e)
+                return None
+
+        teams = item.get("teams", {})
+        scores = item.get("scores", {})
+        return {
+            "external_id": item.get("id"),
+            "start_time": start_time,
+            "status_code": item.get("status", {}).get("short", "NS"),
+            "home_team": teams.get("home", {}).get("name"),
+            "away_team": teams.get("away", {}).get("name"),
+            "home_logo": teams.get("home", {}).get("logo"),
+            "away_logo": teams.get("away", {}).get("logo"),
+            "home_score": (scores.get("home") or {}).get("total"),
+            "away_score": (scores.get("away") or {}).get("total"),
+        }
+
+
+class FootballAPIAdapter(BaseSportsAPIAdapter):
+    """
+    Adapter for the external Football API.
+    It retrieves fixtures for a given date and transforms the API response
+    into a standardized list of event dictionaries.
+    """
+    sport = "football"
+    host = "v3.football.api-sports.io"
+    path = "/fixtures"
+    default_name = "Unnamed Fixture"
+    # Mapping from API fixture status codes to simplified statuses
+    status_mapping = {
+        "TBD": "upcoming",      # Time To Be Defined → upcoming
+        "NS": "upcoming",       # Not Started → upcoming
+        "1H": "live",           # First Half, Kick Off → live
+        "HT": "live",           # Halftime → live
+        "2H": "live",           # Second Half → live
+        "ET": "live",           # Extra Time → live
+        "P": "live",            # Penalty In Progress → live
+        "SUSP": "live",         # Match Suspended → live
+        "INT": "live",          # Match Interrupted → live
+        "FT": "finished",       # Match Finished → finished
+        "AET": "finished",      # Finished after extra time → finished
+        "PEN": "finished",      # Finished after penalty shootout → finished
+        "PST": "upcoming",      # Postponed → upcoming
+        "CANC": "finished",     # Cancelled → finished
+        "ABD": "finished",      # Abandoned → finished
+        "AWD": "finished",      # Technical Loss → finished
+        "WO": "finished",       # WalkOver → finished
+        "LIVE": "live"          # In Progress → live
+    }
+
+    def extract(self, item: dict):
+        fixture = item.get("fixture", {})
+        teams = item.get("teams", {})
+        goals = item.get("goals", {})
+
+        # Parse the start time from fixture.date; if not available, the current UTC time is used
+        start_time = None
+        date_fixture = fixture.get("date")  # e.g., "2025-03-20T00:00:00+00:00"
+        if date_fixture:
+            try:
+                start_time = parse_date(date_fixture)
+            except Exception as e:
+                logger.error("Error parsing fixture date: %s", e)
+
+        return {
+            "external_id": fixture.get("id"),
+            "start_time": start_time,
+            "status_code": fixture.get("status", {}).get("short", "NS"),
+            "home_team": teams.get("home", {}).get("name"),
+            "away_team": teams.get("away", {}).get("name"),
+            "home_logo": teams.get("home", {}).get("logo"),
+            "away_logo": teams.get("away", {}).get("logo"),
+            "home_score": goals.get("home"),
+            "away_score": goals.get("away"),
+        }
+
+
+def adapter_configs() -> list:
+    """
+    SPORTS_ADAPTERS entries, each {"class": <dotted path or registered name>, "api_key": ...,
+    "host": ..., "scheme": ..., "port": ...}. With SPORTS_FAKE_PROVIDER_URL set, every
+    adapter is pointed at the local fake provider instead (see fake_provider).
+    """
+    configs = [dict(config) for config in getattr(settings, "SPORTS_ADAPTERS", DEFAULT_ADAPTERS)]
+    fake_url = getattr(settings, "SPORTS_FAKE_PROVIDER_URL", None)
+    if fake_url:
+        scheme, _, address = fake_url.partition("://")
+        host, _, port = address.rstrip("/").partition(":")
+        for config in configs:
+            config.update(scheme=scheme, host=host, port=int(port) if port else None)
+    return configs
+
+
+def get_adapter_class(name: str):
+    """Registered adapter class by class name, or imported from a dotted path."""
+    if name in ADAPTER_REGISTRY:
+        return ADAPTER_REGISTRY[name]
+    cls = import_string(name)
+    if not issubclass(cls, BaseSportsAPIAdapter):
+        raise TypeError(f"{name} is not a BaseSportsAPIAdapter subclass")
+    return cls
+
+
+def build_adapters(provider_id: str) -> list:
+    """Adapter instances for every sports API configured in SPORTS_ADAPTERS."""
+    adapters = []
+    for config in adapter_configs():
+        cls = get_adapter_class(config.pop("class"))
+        api_key = config.pop("api_key", None) or getattr(settings, "SPORTS_API_KEY", "")
+        adapters.append(cls(provider_id, api_key, **config))
+    return adapters
+
+
+def stream_jobs(adapters: list, date_str: str, label: str = "{adapter}", priority: str = NORMAL) -> list:
+    """(label, generator factory) pairs for streaming.stream_batches, one per adapter."""
+    return [
+        (label.format(adapter=type(adapter).__name__, date=date_str),
+         functools.partial(adapter.iter_events, date_str, priority))
+        for adapter in adapters
+    ]
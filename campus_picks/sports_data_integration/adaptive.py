@@ -0,0 +1,215 @@
+# sports_data_integration/adaptive.py
+import datetime
+import functools
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from realtime.models import EventRT
+from sports_data_integration.adapters import build_adapters, stream_jobs
+from sports_data_integration.ingest import ingest_events
+from sports_data_integration.models import PollSchedule
+from sports_data_integration.rate_limit import LIVE, NORMAL
+from sports_data_integration.single_flight import poll_lease_name, run_single_flight
+from sports_data_integration.streaming import ingest_stream
+
+logger = logging.getLogger(__name__)
+
+# Upcoming events whose start time passed this long ago without going live are
+# treated as postponed instead of "about to start"
+OVERDUE_LIMIT = datetime.timedelta(hours=3)
+
+
+def _setting(name: str, default: int) -> int:
+    return getattr(settings, name, default)
+
+
+def decide_interval(events: list, now: datetime.datetime) -> tuple:
+    """
+    Seconds until the next poll of a set of events, and the reason.
+
+    Input:
+        events: (status, startTime) pairs; startTime is naive UTC, as read from MongoDB
+        now: naive UTC
+
+    - "live": some event is being played (SPORTS_POLL_INTERVAL_LIVE)
+    - "starting": some event starts within SPORTS_POLL_NEAR_START or should have
+      started already (SPORTS_POLL_INTERVAL_STARTING)
+    - "upcoming": only later events; slow, but never past the moment the next one
+      enters the near-start window (SPORTS_POLL_INTERVAL_IDLE at most)
+    - "finished": every event is over (SPORTS_POLL_INTERVAL_FINISHED)
+    - "empty": nothing known for this date yet (SPORTS_POLL_INTERVAL_IDLE)
+    """
+    live_interval = _setting("SPORTS_POLL_INTERVAL_LIVE", 20)
+    starting_interval = _setting("SPORTS_POLL_INTERVAL_STARTING", 60)
+    idle_interval = _setting("SPORTS_POLL_INTERVAL_IDLE", 900)
+    near_start = datetime.timedelta(seconds=_setting("SPORTS_POLL_NEAR_START", 900))
+
+    if not events:
+        return idle_interval, "empty"
+    if any(status == "live" for status, _ in events):
+        return live_interval, "live"
+
+    starts = [start for status, start in events if status == "upcoming" and start is not None]
+    if any(now - OVERDUE_LIMIT <= start <= now + near_start for start in starts):
+        return starting_interval, "starting"
+    later = [start for start in starts if start > now]
+    if later:
+        until_window = (min(later) - near_start - now).total_seconds()
+        return int(min(max(until_window, starting_interval), idle_interval)), "upcoming"
+    if len(starts) == len(events):
+        # Only postponed fixtures left
+        return idle_interval, "upcoming"
+    return _setting("SPORTS_POLL_INTERVAL_FINISHED", 3600), "finished"
+
+
+def load_event_states(dates: list) -> dict:
+    """
+    (sport, date) -> [(status, startTime)] for the events starting on the given
+    UTC dates, read in a single query.
+    """
+    start = datetime.datetime.combine(min(dates), datetime.time.min)
+    end = datetime.datetime.combine(max(dates) + datetime.timedelta(days=1), datetime.time.min)
+    cursor = EventRT._get_collection().find(
+        {"startTime": {"$gte": start, "$lt": end}},
+        {"sport": 1, "status": 1, "startTime": 1, "_id": 0},
+    )
+    states = defaultdict(list)
+    for doc in cursor:
+        start_time = doc.get("startTime")
+        if start_time is None:
+            continue
+        states[(doc.get("sport"), start_time.date())].append((doc.get("status"), start_time))
+    return states
+
+
+def poll_dates(today: datetime.date = None) -> list:
+    """Dates the adaptive poller follows: today and yesterday (late games cross midnight UTC)."""
+    today = today or datetime.date.today()
+    return [today - datetime.timedelta(days=1), today]
+
+
+def poll_due(provider_id: str, force: bool = False) -> dict:
+    """
+    Polls the (adapter, date) pairs whose next poll is due, then recomputes and
+    stores the interval of every pair from the EventRT statuses (PollSchedule).
+    Pairs with no decision yet are always due; force=True polls everything.
+    Pairs with live or starting events are fetched with LIVE rate limit priority,
+    so they keep being polled when quota runs low; deferred pairs stay due.
+    Shares the single-flight lease of poll_events: a tick that finds a poll in
+    flight does nothing and returns {"runId": ..., "skipped": True, ...}.
+
+    Returns a summary:
+        {"runId": "3f2a...", "polled": ["FootballAPIAdapter 2025-05-01"], "fetched": 120, "changed": 4,
+         "unchanged": 116, "teamsCreated": 0, "failures": {}, "deferred": {}}
+    """
+    return run_single_flight(poll_lease_name(provider_id), lambda lease: _poll_due(provider_id, force, lease))
+
+
+def _poll_due(provider_id: str, force: bool, lease) -> dict:
+    adapters = build_adapters(provider_id)
+    dates = poll_dates()
+    now = timezone.now()
+    schedules = {
+        (row.adapter, row.date): row
+        for row in PollSchedule.objects.filter(date__in=dates, adapter__in=[type(a).__name__ for a in adapters])
+    }
+
+    summary = {"polled": [], "fetched": 0, "changed": 0, "unchanged": 0, "teamsCreated": 0,
+               "failures": {}, "deferred": {}}
+    polled = set()
+    for day in dates:
+        due = [
+            adapter for adapter in adapters
+            if force or (type(adapter).__name__, day) not in schedules
+            or schedules[(type(adapter).__name__, day)].next_poll_at <= now
+        ]
+        if not due:
+            continue
+        jobs = []
+        for adapter in due:
+            row = schedules.get((type(adapter).__name__, day))
+            priority = LIVE if row is None or row.reason in ("live", "starting") else NORMAL
+            jobs += stream_jobs([adapter], day.isoformat(), label="{date} {adapter}", priority=priority)
+        ingest = functools.partial(ingest_events, fetched_at=datetime.datetime.utcnow())
+        result = ingest_stream(jobs, lease.renewing(ingest))
+        for key in ("fetched", "changed", "unchanged", "teamsCreated"):
+            summary[key] += result[key]
+        summary["failures"].update(result["failures"])
+        summary["deferred"].update(result["deferred"])
+        for adapter in due:
+            label = f"{day.isoformat()} {type(adapter).__name__}"
+            if label in result["deferred"]:
+                continue
+            polled.add((type(adapter).__name__, day))
+            summary["polled"].append(f"{type(adapter).__name__} {day.isoformat()}")
+
+    _record_decisions(adapters, dates, schedules, polled, now)
+    return summary
+
+
+def _record_decisions(adapters: list, dates: list, schedules: dict, polled: set, now: datetime.datetime) -> None:
+    states = load_event_states(dates)
+    utc_now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    for adapter in adapters:
+        name = type(adapter).__name__
+        for day in dates:
+            events = states.get((adapter.sport, day), [])
+            interval, reason = decide_interval(events, utc_now)
+            row = schedules.get((name, day)) or PollSchedule(adapter=name, date=day, next_poll_at=now)
+            counts = defaultdict(int)
+            for status, _ in events:
+                counts[status] += 1
+            if (name, day) in polled:
+                row.last_polled_at = now
+                row.polls += 1
+                row.next_poll_at = now + datetime.timedelta(seconds=interval)
+            elif row.interval and interval < row.interval:
+                # Tighten a pending poll right away when events went live or are about to start
+                base = row.last_polled_at or now
+                row.next_poll_at = min(row.next_poll_at, base + datetime.timedelta(seconds=interval))
+            if reason != row.reason:
+                logger.info("Polling %s for %s every %ss (%s)", name, day, interval, reason)
+            row.interval, row.reason = interval, reason
+            row.live, row.upcoming, row.finished = counts["live"], counts["upcoming"], counts["finished"]
+            row.save()
+
+
+def schedule_metrics() -> dict:
+    """
+    Current decisions of the adaptive poller and the request rate they imply.
+    Response example:
+    {
+      "pollsPerHour": 228.0,
+      "decisions": [
+        {"adapter": "FootballAPIAdapter", "date": "2025-05-01", "interval": 20, "reason": "live",
+         "live": 3, "upcoming": 12, "finished": 40, "nextPollAt": "...", "lastPolledAt": "...", "polls": 311}
+      ]
+    }
+    """
+    today = datetime.date.today()
+    rows = PollSchedule.objects.filter(date__in=poll_dates(today)).order_by("date", "adapter")
+    decisions = [
+        {
+            "adapter": row.adapter,
+            "date": row.date.isoformat(),
+            "interval": row.interval,
+            "reason": row.reason,
+            "live": row.live,
+            "upcoming": row.upcoming,
+            "finished": row.finished,
+            "nextPollAt": row.next_poll_at.isoformat(),
+            "lastPolledAt": row.last_polled_at.isoformat() if row.last_polled_at else None,
+            "polls": row.polls,
+        }
+        for row in rows
+    ]
+    polls_per_hour = sum(3600 / d["interval"] for d in decisions if d["interval"])
+    return {"pollsPerHour": round(polls_per_hour, 1), "decisions": decisions}
+
+
+def adaptive_poll_task():
+    """Scheduler/cron entry point: polls whatever is due for the default provider."""
+    poll_due("api-sports")
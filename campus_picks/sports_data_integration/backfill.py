@@ -0,0 +1,122 @@
+# sports_data_integration/backfill.py
+import datetime
+import functools
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+
+from sports_data_integration.adapters import build_adapters
+from sports_data_integration.adaptive import poll_dates
+from sports_data_integration.ingest import ingest_events
+from sports_data_integration.models import BackfillCheckpoint
+from sports_data_integration.rate_limit import LOW
+from sports_data_integration.single_flight import backfill_lease_name, run_single_flight
+from sports_data_integration.response_cache import FINISHED, status_class
+from sports_data_integration.streaming import stream_batches
+
+logger = logging.getLogger(__name__)
+
+
+def date_range(start: datetime.date, end: datetime.date) -> list:
+    """Every date from start to end, both included."""
+    days = (end - start).days
+    return [start + datetime.timedelta(days=i) for i in range(days + 1)]
+
+
+def window_dates(days_back: int, days_ahead: int, today: datetime.date = None) -> list:
+    """Dates from `days_back` days ago to `days_ahead` days from today."""
+    today = today or datetime.date.today()
+    return date_range(today - datetime.timedelta(days=days_back), today + datetime.timedelta(days=days_ahead))
+
+
+def backfill(provider_id: str, dates: list, workers: int = None, resume: bool = True, force: bool = False) -> dict:
+    """
+    Fetches and ingests every (date, adapter) pair of a date range.
+
+    Fetches run in a pool of `workers` threads (SPORTS_BACKFILL_WORKERS by
+    default) shared by all dates and providers, so a long range never opens
+    more than that many concurrent requests. Answers are streamed and ingested
+    in bounded batches from the calling thread (see streaming.stream_batches).
+    With resume=True, pairs checkpointed by a previous run are not fetched again
+    (counted under "checkpointed"). Only finished dates are checkpointed (see
+    BackfillCheckpoint) and dates with no events are not, in case the provider
+    answered with an error.
+    Requests are sent with LOW rate limit priority: when provider quota runs low
+    the remaining pairs are deferred (not checkpointed) and picked up next run.
+    Only one backfill of a provider runs at a time (see single_flight); a second
+    one returns {"runId": <backfill in flight>, "skipped": True, ...} right away.
+    Dates the adaptive poller follows (adaptive.poll_dates) are left to it and
+    listed under "leftToPoller", so the same fixtures are never written by a
+    backfill and a poll at once.
+
+    Returns a summary:
+        {"runId": "3f2a...", "dates": 17, "fetched": 820, "changed": 75, "unchanged": 745, "teamsCreated": 3,
+         "checkpointed": 20, "leftToPoller": ["2025-05-20", "2025-05-21"],
+         "failures": {"2025-05-01 FootballAPIAdapter": "timed out"},
+         "deferred": {"2025-05-02 FootballAPIAdapter": "v3.football.api-sports.io: 180 of 7500 daily requests left"}}
+    """
+    return run_single_flight(
+        backfill_lease_name(provider_id),
+        lambda lease: _backfill(provider_id, dates, workers, resume, force, lease),
+    )
+
+
+def _backfill(provider_id: str, dates: list, workers: int, resume: bool, force: bool, lease) -> dict:
+    workers = workers or getattr(settings, "SPORTS_BACKFILL_WORKERS", 4)
+    adapters = build_adapters(provider_id)
+    polled = set(poll_dates())
+    left_to_poller = [day for day in dates if day in polled]
+    dates = [day for day in dates if day not in polled]
+
+    done = set()
+    if resume:
+        done = set(
+            BackfillCheckpoint.objects
+            .filter(date__in=dates, adapter__in=[type(a).__name__ for a in adapters])
+            .values_list("date", "adapter")
+        )
+
+    pending = [(day, adapter) for day in dates for adapter in adapters if (day, type(adapter).__name__) not in done]
+    summary = {"dates": len(dates), "fetched": 0, "changed": 0, "unchanged": 0, "teamsCreated": 0,
+               "checkpointed": len(dates) * len(adapters) - len(pending),
+               "leftToPoller": [day.isoformat() for day in left_to_poller], "failures": {}, "deferred": {}}
+
+    jobs = [((day, type(adapter).__name__), functools.partial(adapter.iter_events, day.isoformat(), LOW))
+            for day, adapter in pending]
+    counts = defaultdict(int)
+    started = datetime.datetime.utcnow()
+    for kind, (day, name), payload in stream_batches(jobs, workers=max(workers, 1)):
+        lease.renew()
+        if kind == "batch":
+            result = ingest_events(payload, force=force, fetched_at=started)
+            counts[(day, name)] += len(payload)
+            summary["fetched"] += len(payload)
+            for key in ("changed", "unchanged", "teamsCreated"):
+                summary[key] += result[key]
+        elif kind == "failed":
+            summary["failures"][f"{day.isoformat()} {name}"] = payload
+            logger.error("Backfill of %s from %s failed: %s", day, name, payload)
+        elif kind == "deferred":
+            summary["deferred"][f"{day.isoformat()} {name}"] = payload
+        elif counts[(day, name)] and status_class(day.isoformat()) == FINISHED:
+            BackfillCheckpoint.objects.update_or_create(
+                date=day, adapter=name, defaults={"events": counts[(day, name)]}
+            )
+
+    logger.info("Backfilled %d date(s): %d fetched, %d changed, %d checkpointed, %d failure(s), %d deferred",
+                summary["dates"], summary["fetched"], summary["changed"], summary["checkpointed"],
+                len(summary["failures"]), len(summary["deferred"]))
+    return summary
+
+
+def forward_window_task():
+    """
+    Scheduler job: refreshes the recent past (for the team form window) and the
+    next days of fixtures (SPORTS_WINDOW_DAYS_BACK / SPORTS_WINDOW_DAYS_AHEAD).
+    """
+    dates = window_dates(
+        getattr(settings, "SPORTS_WINDOW_DAYS_BACK", 14),
+        getattr(settings, "SPORTS_WINDOW_DAYS_AHEAD", 7),
+    )
+    backfill("api-sports", dates)
@@ -0,0 +1,176 @@
+# sports_data_integration/fake_provider.py
+import datetime
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Endpoint -> (sport, id prefix); the prefix keeps basketball and football ids apart
+KINDS = {"games": ("basketball", 2), "fixtures": ("football", 1)}
+
+BASKETBALL_LIVE = ("Q1", "Q2", "HT", "Q3", "Q4")
+FOOTBALL_LIVE = ("1H", "HT", "2H")
+
+
+def _status(rng, day: datetime.date, start: datetime.datetime, now: datetime.datetime, live_codes: tuple) -> str:
+    if day < now.date():
+        return "FT"
+    if start > now:
+        return "NS"
+    if now - start < datetime.timedelta(hours=2):
+        return rng.choice(live_codes)
+    return "FT"
+
+
+def generate_payload(kind: str, date_str: str, count: int, now: datetime.datetime = None) -> dict:
+    """
+    Synthetic api-sports answer with `count` fixtures for a date.
+    The same (kind, date, count) always gives the same fixtures; statuses follow the
+    clock (finished before now, live for two hours after kick-off, not started after).
+    """
+    sport, prefix = KINDS[kind]
+    day = datetime.date.fromisoformat(date_str)
+    now = now or datetime.datetime.utcnow()
+    rng = random.Random(f"{kind}:{date_str}")
+    teams = max(count, 20)  # Each team plays about twice a day, so the team table grows like production
+    response = []
+    for i in range(count):
+        fixture_id = prefix * 10 ** 13 + int(day.strftime("%Y%m%d")) * 10 ** 5 + i
+        start = datetime.datetime.combine(day, datetime.time(rng.randrange(10, 24), rng.choice((0, 15, 30, 45))))
+        home, away = rng.sample(range(teams), 2)
+        home_team = {"id": home, "name": f"Fake {sport.title()} {home:05d}", "logo": f"https://fake.local/{sport}/{home}.png"}
+        away_team = {"id": away, "name": f"Fake {sport.title()} {away:05d}", "logo": f"https://fake.local/{sport}/{away}.png"}
+        home_score, away_score = rng.randrange(0, 120 if sport == "basketball" else 5), rng.randrange(0, 120 if sport == "basketball" else 5)
+        if kind == "games":
+            short = _status(rng, day, start, now, BASKETBALL_LIVE)
+            response.append({
+                "id": fixture_id,
+                "date": f"{date_str}T00:00:00+00:00",
+                "time": start.strftime("%H:%M"),
+                "status": {"short": short},
+                "teams": {"home": home_team, "away": away_team},
+                "scores": {"home": {"total": home_score if short != "NS" else None},
+                           "away": {"total": away_score if short != "NS" else None}},
+            })
+        else:
+            short = _status(rng, day, start, now, FOOTBALL_LIVE)
+            response.append({
+                "fixture": {"id": fixture_id, "date": start.isoformat() + "+00:00", "status": {"short": short}},
+                "teams": {"home": home_team, "away": away_team},
+                "goals": {"home": home_score if short != "NS" else None,
+                          "away": away_score if short != "NS" else None},
+            })
+    return {"get": kind, "parameters": {"date": date_str}, "errors": [], "results": count, "response": response}
+
+
+class FixtureStore:
+    """
+    Synthetic payloads kept as JSON files, one per (endpoint, date).
+    Missing files are generated on first request, so a large volume only costs
+    its generation once; past dates never change, today's file is regenerated
+    every `refresh` seconds so statuses move along.
+    """
+    def __init__(self, directory: str, count: int, refresh: float = 60.0):
+        self.directory = str(directory)
+        self.count = count
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, kind: str, date_str: str) -> str:
+        return os.path.join(self.directory, f"{kind}-{date_str}-{self.count}.json")
+
+    def load(self, kind: str, date_str: str) -> tuple:
+        """(body bytes, ETag, Last-Modified) of a payload, generating its file if needed."""
+        path = self.path(kind, date_str)
+        with self._lock:
+            stale = date_str >= datetime.date.today().isoformat() and (
+                not os.path.exists(path) or datetime.datetime.now().timestamp() - os.path.getmtime(path) > self.refresh
+            )
+            if stale or not os.path.exists(path):
+                with open(path + ".tmp", "w") as f:
+                    json.dump(generate_payload(kind, date_str, self.count), f)
+                os.replace(path + ".tmp", path)
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        return body, etag, formatdate(os.path.getmtime(path), usegmt=True)
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET /games?date= and /fixtures?date= like api-sports, with ETag revalidation.
+    Every request (304s included) uses one unit of a daily `quota`, reported in the
+    x-ratelimit-requests-* headers; once it is used up answers carry an "errors" field.
+    """
+    store = None
+    quota = 1000000
+    served = None  # itertools.count shared by the handler threads
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real provider
+
+    def log_message(self, format, *args):
+        logger.debug("fake provider: " + format, *args)
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        kind = parts.path.strip("/")
+        date_str = dict(parse_qsl(parts.query)).get("date")
+        try:
+            datetime.date.fromisoformat(date_str or "")
+        except ValueError:
+            date_str = None
+        if kind not in KINDS or not date_str:
+            self._send(404, json.dumps({"errors": {"endpoint": "Unknown endpoint or missing date"}}).encode())
+            return
+        remaining = max(self.quota - next(self.served) - 1, 0)
+        quota_headers = {
+            "x-ratelimit-requests-limit": str(self.quota),
+            "x-ratelimit-requests-remaining": str(remaining),
+        }
+        if remaining == 0:
+            errors = {"requests": "You have reached the request limit for the day"}
+            self._send(200, json.dumps({"errors": errors, "results": 0, "response": []}).encode(), quota_headers)
+            return
+        body, etag, last_modified = self.store.load(kind, date_str)
+        headers = {"ETag": etag, "Last-Modified": last_modified, **quota_headers}
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers=headers)
+            return
+        self._send(200, body, headers)
+
+
+def make_server(directory: str, count: int, host: str = "127.0.0.1", port: int = 8765,
+                quota: int = 1000000) -> ThreadingHTTPServer:
+    """HTTP server for the fake provider; call serve_forever() on it (or use start_in_thread)."""
+    handler = type("BoundFakeProviderHandler", (FakeProviderHandler,), {
+        "store": FixtureStore(directory, count),
+        "quota": quota,
+        "served": itertools.count(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(server: ThreadingHTTPServer) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, name="fake-provider", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,97 @@
+# sports_data_integration/http_pool.py
+import logging
+import threading
+
+import urllib3
+from django.conf import settings
+from urllib3.util.retry import Retry
+
+from sports_data_integration.instrumentation import stage
+from sports_data_integration.rate_limit import NORMAL, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHTTPPool:
+    """
+    Keep-alive connection pools shared by every sports API adapter.
+
+    One urllib3 pool is kept per (scheme, host, port) so each poll reuses the
+    TCP+TLS connections opened by the previous one instead of handshaking again.
+    Idempotent GETs are retried with exponential backoff on connection errors
+    and on 429/5xx answers. Every request first takes a token from the shared
+    per-host rate limiter (see rate_limit.ProviderRateLimiter).
+    """
+    def __init__(self, pool_size: int, retries: int, backoff: float, timeout: float):
+        self.timeout = timeout
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        self.manager = urllib3.PoolManager(num_pools=16, maxsize=pool_size, block=False, retries=self.retry)
+        self._requests = {}  # host -> requests sent
+        self._retries = {}   # host -> retries performed
+        self._lock = threading.Lock()
+
+    def _key(self, scheme: str, host: str, port) -> str:
+        return f"{scheme}://{host}" + (f":{port}" if port else "")
+
+    def get(self, host: str, path: str, headers: dict = None, scheme: str = "https", port: int = None,
+            preload_content: bool = True, priority: str = NORMAL) -> urllib3.BaseHTTPResponse:
+        """
+        Sends a GET through the pool of the given host.
+        With preload_content=False the caller must read the body and call
+        release_conn() so the connection goes back to the pool.
+        Raises rate_limit.QuotaDeferred when `priority` is too low for the quota left.
+        """
+        with stage("quota"):
+            rate_limiter.acquire(host, priority)
+        pool = self.manager.connection_from_host(host, port=port, scheme=scheme)
+        response = pool.urlopen(
+            "GET", path,
+            headers=headers,
+            timeout=urllib3.Timeout(connect=self.timeout, read=self.timeout),
+            retries=self.retry,
+            preload_content=preload_content,
+            release_conn=preload_content,
+        )
+        key = self._key(scheme, host, port)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            history = response.retries.history if response.retries else ()
+            self._retries[key] = self._retries.get(key, 0) + len(history)
+        rate_limiter.observe(host, response.headers)
+        return response
+
+    def stats(self) -> dict:
+        """Per host: requests sent, connections opened, connections reused and retries."""
+        stats = {}
+        for pool_key in list(self.manager.pools.keys()):
+            pool = self.manager.pools.get(pool_key)
+            if pool is None:
+                continue
+            key = self._key(pool_key.key_scheme, pool_key.key_host, pool_key.key_port
+                            if pool_key.key_port not in (80, 443) else None)
+            requests = self._requests.get(key, 0)
+            stats[key] = {
+                "requests": requests,
+                "connectionsOpened": pool.num_connections,
+                "connectionsReused": max(requests - pool.num_connections, 0),
+                "retries": self._retries.get(key, 0),
+            }
+        return stats
+
+    def clear(self) -> None:
+        """Closes every pooled connection."""
+        self.manager.clear()
+
+
+http_pool = ProviderHTTPPool(
+    pool_size=getattr(settings, "SPORTS_API_POOL_SIZE", 4),
+    retries=getattr(settings, "SPORTS_API_RETRIES", 3),
+    backoff=getattr(settings, "SPORTS_API_RETRY_BACKOFF", 0.5),
+    timeout=getattr(settings, "SPORTS_API_TIMEOUT", 10),
+)
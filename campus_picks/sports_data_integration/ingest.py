@@ -0,0 +1,157 @@
+# sports_data_integration/ingest.py
+import datetime
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+
+from acid_db.models import Event
+from acid_db.team_cache import team_cache
+from realtime.views import bulk_upsert_events
+from sports_data_integration.instrumentation import stage
+from sports_data_integration.models import EventFingerprint
+from sports_data_integration.normalize import START_TIME_DEFAULTED
+
+logger = logging.getLogger(__name__)
+
+# Generated fields (seeded from acidEventId) written only when an event is first created,
+# so later odds updates (e.g. from webhooks) are not overwritten by the poller
+INSERT_ONLY_FIELDS = ("oddsA", "oddsB", "location", "geo")
+
+# Fields webhooks also write: the poller leaves them alone when a webhook of one of
+# these types is newer than the poll (see realtime.views.bulk_upsert_events)
+WEBHOOK_FIELDS = ("home_score", "away_score", "status", "endTime")
+WEBHOOK_SOURCES = ("scoreUpdate", "eventEnd")
+
+
+def fingerprint_event(event_data: dict) -> str:
+    """
+    Stable hash of an event dictionary. A start time the provider did not send
+    (defaulted to the poll time by normalize_event) and the end time derived from
+    it are left out, otherwise such events would look changed on every poll.
+    """
+    if event_data.get(START_TIME_DEFAULTED):
+        event_data = {
+            key: value for key, value in event_data.items()
+            if key not in ("startTime", "endTime", START_TIME_DEFAULTED)
+        }
+    payload = json.dumps(event_data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def select_changed(events_data: list) -> tuple:
+    """
+    Compares each event with the fingerprint stored by the previous poll (one query).
+    Returns (changed events, {acidEventId: new fingerprint} for those events).
+    """
+    fingerprints = {event_data["acidEventId"]: fingerprint_event(event_data) for event_data in events_data}
+    stored = dict(
+        EventFingerprint.objects
+        .filter(acid_event_id__in=list(fingerprints))
+        .values_list("acid_event_id", "fingerprint")
+    )
+    changed_ids = {key for key, value in fingerprints.items() if stored.get(key) != value}
+    changed = [event_data for event_data in events_data if event_data["acidEventId"] in changed_ids]
+    return changed, {key: fingerprints[key] for key in changed_ids}
+
+
+def ingest_events(events_data: list, force: bool = False, fetched_at: datetime.datetime = None) -> dict:
+    """
+    Writes a batch of standardized event dictionaries (as returned by the adapters)
+    to both databases with a fixed number of round trips:
+    - Change detection: events whose fingerprint matches the previous poll are
+      skipped (unless force=True).
+    - MongoDB: one bulk upsert keyed on acidEventId, plus one read of the ids.
+      Scores and status are not overwritten where a webhook newer than
+      `fetched_at` (naive UTC, when the poll started fetching; now by default)
+      already set them, and the SQL rows get the scores that Mongo kept.
+    - SQL (in one transaction): one upsert of Event rows, at most one lookup and one
+      insert of Team rows, one insert per home/away through table and one upsert of the
+      new fingerprints. Teams come from the shared team cache, which only
+      queries (and inserts) the names it has not seen yet.
+    Each step is measured as a stage of the current run (see instrumentation).
+
+    Returns a summary:
+        {"changed": <events written>, "unchanged": <events skipped>, "teamsCreated": <new teams>}
+    """
+    total = len(events_data)
+    with stage("changes", rows=total):
+        if force:
+            fingerprints = {event_data["acidEventId"]: fingerprint_event(event_data) for event_data in events_data}
+        else:
+            events_data, fingerprints = select_changed(events_data)
+    if not events_data:
+        return {"changed": 0, "unchanged": total, "teamsCreated": 0}
+    events_data = [
+        {key: value for key, value in event_data.items() if key != START_TIME_DEFAULTED}
+        for event_data in events_data
+    ]
+
+    # --- Real-Time DB (MongoDB) ---
+    with stage("mongo", rows=len(events_data)):
+        stored = bulk_upsert_events(
+            events_data,
+            insert_only_fields=INSERT_ONLY_FIELDS,
+            guarded_fields=WEBHOOK_FIELDS,
+            guard_sources=WEBHOOK_SOURCES,
+            as_of=fetched_at or datetime.datetime.utcnow(),
+        )
+
+    # --- ACID DB (SQL) ---
+    acid_events = {}
+    for event_data in events_data:
+        acid_event_id = event_data["acidEventId"]
+        doc = stored.get(acid_event_id, {})
+        rt_id = doc.get("_id")
+        acid_events[acid_event_id] = Event(
+            event_id=acid_event_id,
+            rt_event_id=str(rt_id) if rt_id is not None else None,
+            home_score=doc.get("home_score", event_data.get("home_score")),
+            away_score=doc.get("away_score", event_data.get("away_score")),
+        )
+
+    team_names = {
+        name
+        for event_data in events_data
+        for name in (event_data.get("homeTeam"), event_data.get("awayTeam"))
+        if name
+    }
+
+    with stage("sql", rows=len(acid_events) + len(fingerprints)), transaction.atomic():
+        Event.objects.bulk_create(
+            list(acid_events.values()),
+            update_conflicts=True,
+            unique_fields=["event_id"],
+            update_fields=["rt_event_id", "home_score", "away_score"],
+        )
+        with stage("teams") as linking:
+            teams, teams_created = team_cache.get_many(team_names, create=True)
+
+            # Link teams to events; existing links are left untouched
+            HomeLink = Event.home_team.through
+            AwayLink = Event.away_team.through
+            home_links, away_links = [], []
+            for event_data in events_data:
+                event_pk = acid_events[event_data["acidEventId"]].pk
+                home = teams.get(event_data.get("homeTeam"))
+                away = teams.get(event_data.get("awayTeam"))
+                if home:
+                    home_links.append(HomeLink(event_id=event_pk, team_id=home.pk))
+                if away:
+                    away_links.append(AwayLink(event_id=event_pk, team_id=away.pk))
+            HomeLink.objects.bulk_create(home_links, ignore_conflicts=True)
+            AwayLink.objects.bulk_create(away_links, ignore_conflicts=True)
+            linking.update(rows=len(home_links) + len(away_links), teamsCreated=teams_created)
+
+        # Remember what was written so the next poll can skip it if nothing changes
+        EventFingerprint.objects.bulk_create(
+            [EventFingerprint(acid_event_id=key, fingerprint=value) for key, value in fingerprints.items()],
+            update_conflicts=True,
+            unique_fields=["acid_event_id"],
+            update_fields=["fingerprint", "updated_at"],
+        )
+
+    logger.info("Ingested %d changed event(s), skipped %d unchanged, created %d team(s)",
+                len(acid_events), total - len(acid_events), teams_created)
+    return {"changed": len(acid_events), "unchanged": total - len(acid_events), "teamsCreated": teams_created}
@@ -0,0 +1,222 @@
+# sports_data_integration/instrumentation.py
+import contextlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from realtime.monitoring import thread_command_counter
+from sports_data_integration.models import PollRunRecord
+
+logger = logging.getLogger(__name__)
+
+# Stages of the polling pipeline, in the order data goes through them
+STAGES = (
+    "quota",    # Waiting for a rate limit token (rate_limit)
+    "fetch",    # Opening and reading provider bodies, from the network or the response cache
+    "parse",    # Streaming JSON parsing and normalization into event dictionaries
+    "changes",  # Fingerprint lookup that skips unchanged events
+    "mongo",    # Bulk upsert of EventRT documents
+    "sql",      # Event rows and fingerprints, including the transaction commit
+    "teams",    # Team lookup/creation and home/away links
+)
+
+_local = threading.local()
+
+
+class PipelineRun:
+    """
+    Per-stage counters of one poll or backfill run. Every thread bound to the
+    run (see bind) adds to it: the caller's thread for the database stages and
+    the streaming producer threads for quota, fetch and parse.
+    """
+    def __init__(self, name: str, run_id: str):
+        self.name = name
+        self.run_id = run_id
+        self.started_at = timezone.now()
+        self.summary = None
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, **counters) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(
+                stage, {"seconds": 0.0, "calls": 0, "rows": 0, "sqlQueries": 0, "mongoCommands": 0}
+            )
+            for key, value in counters.items():
+                entry[key] = entry.get(key, 0) + value
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                stage: {**entry, "seconds": round(entry["seconds"], 4)}
+                for stage, entry in sorted(self.stages.items(), key=lambda item: _stage_order(item[0]))
+            }
+
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+def _count_sql(execute, sql, params, many, context):
+    _local.sql = getattr(_local, "sql", 0) + 1
+    return execute(sql, params, many, context)
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+@contextlib.contextmanager
+def bind(run: PipelineRun):
+    """Attributes the stages this thread runs to `run` (does nothing for None)."""
+    if run is None or current_run() is run:
+        yield
+        return
+    previous = (current_run(), getattr(_local, "stack", None), getattr(_local, "mark", None))
+    _local.run, _local.stack = run, []
+    _local.mark = (time.perf_counter(), getattr(_local, "sql", 0), thread_command_counter.count())
+    try:
+        with connection.execute_wrapper(_count_sql):
+            yield
+    finally:
+        _local.run, _local.stack, _local.mark = previous
+
+
+def _flush() -> None:
+    # Everything since the last stage boundary belongs to the innermost open stage,
+    # so nested stages (quota inside fetch inside parse) are never counted twice
+    now, sql, mongo = time.perf_counter(), getattr(_local, "sql", 0), thread_command_counter.count()
+    started, sql_before, mongo_before = _local.mark
+    if _local.stack:
+        _local.run.add(_local.stack[-1], seconds=now - started,
+                       sqlQueries=sql - sql_before, mongoCommands=mongo - mongo_before)
+    _local.mark = (now, sql, mongo)
+
+
+@contextlib.contextmanager
+def stage(name: str, rows: int = 0):
+    """
+    Measures a block as stage `name` of the run bound to this thread: time, SQL
+    queries and Mongo commands. Yields a dict of counters the block can fill in
+    ("rows" and any stage-specific counter). Does nothing outside a run.
+    """
+    run = current_run()
+    counters = {"rows": rows}
+    if run is None:
+        yield counters
+        return
+    _flush()
+    _local.stack.append(name)
+    try:
+        yield counters
+    finally:
+        _flush()
+        _local.stack.pop()
+        run.add(name, calls=1, **counters)
+
+
+@contextlib.contextmanager
+def track(name: str, run_id: str):
+    """
+    Measures a whole run from the calling thread and stores it as a
+    PollRunRecord when it ends. Set run.summary to keep the run's summary.
+    """
+    run = PipelineRun(name, run_id)
+    outcome = "failed"
+    with bind(run):
+        try:
+            yield run
+            outcome = "ok"
+        finally:
+            record(run, outcome)
+
+
+def record(run: PipelineRun, outcome: str) -> None:
+    """Stores a finished run and drops the oldest ones beyond SPORTS_POLL_RUN_HISTORY."""
+    seconds = run.elapsed()
+    stages = run.report()
+    logger.info("%s run %s: %.2fs (%s) %s", run.name, run.run_id, seconds, outcome,
+                ", ".join(f"{stage} {entry['seconds']:.2f}s" for stage, entry in stages.items()))
+    try:
+        PollRunRecord.objects.create(
+            run_id=run.run_id, name=run.name, started_at=run.started_at, seconds=round(seconds, 4),
+            outcome=outcome, summary=run.summary, stages=stages,
+        )
+        keep = getattr(settings, "SPORTS_POLL_RUN_HISTORY", 500)
+        cutoff = list(PollRunRecord.objects.order_by("-id").values_list("id", flat=True)[keep:keep + 1])
+        if cutoff:
+            PollRunRecord.objects.filter(id__lte=cutoff[0]).delete()
+    except Exception as e:
+        logger.warning("Could not record %s run %s: %s", run.name, run.run_id, e)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(math.ceil(pct / 100.0 * len(sorted_values))) - 1)
+    return sorted_values[max(k, 0)]
+
+
+def _percentiles(values: list, percentiles: tuple) -> dict:
+    values = sorted(values)
+    return {f"p{pct}": round(percentile(values, pct), 4) for pct in percentiles}
+
+
+def recent_runs(name: str = None, limit: int = 100) -> list:
+    runs = PollRunRecord.objects.order_by("-id")
+    if name:
+        runs = runs.filter(name=name)
+    return list(runs[:limit])
+
+
+def summarize(runs: list, percentiles: tuple = (50, 90, 99)) -> dict:
+    """
+    Percentiles across runs of the total duration and of each stage's time,
+    rows, SQL queries and Mongo commands (over the runs that went through it).
+    Response example:
+    {
+      "runs": 120, "failed": 1, "seconds": {"p50": 1.2, "p90": 2.9, "p99": 6.1},
+      "stages": {
+        "fetch": {"runs": 120, "seconds": {...}, "rows": {...}, "sqlQueries": {...}, "mongoCommands": {...}}
+      }
+    }
+    """
+    stages = {}
+    for run in runs:
+        for stage_name, entry in run.stages.items():
+            values = stages.setdefault(stage_name, {"seconds": [], "rows": [], "sqlQueries": [], "mongoCommands": []})
+            for key, series in values.items():
+                series.append(entry.get(key, 0))
+    return {
+        "runs": len(runs),
+        "failed": sum(1 for run in runs if run.outcome != "ok"),
+        "seconds": _percentiles([run.seconds for run in runs], percentiles),
+        "stages": {
+            stage_name: {
+                "runs": len(values["seconds"]),
+                **{key: _percentiles(series, percentiles) for key, series in values.items()},
+            }
+            for stage_name, values in sorted(stages.items(), key=lambda item: _stage_order(item[0]))
+        },
+    }
+
+
+def run_as_dict(run: PollRunRecord) -> dict:
+    return {
+        "runId": run.run_id,
+        "name": run.name,
+        "startedAt": run.started_at.isoformat(),
+        "seconds": run.seconds,
+        "outcome": run.outcome,
+        "summary": run.summary,
+        "stages": run.stages,
+    }
@@ -0,0 +1,55 @@
+# sports_data_integration/management/commands/backfill_events.py
+import datetime
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sports_data_integration.backfill import backfill, date_range, window_dates
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch and ingest fixtures for a range of dates, with bounded parallelism across dates "
+        "and providers. Use --from/--to for a fixed range or --days-back/--days-ahead for a window "
+        "around today. Finished dates are checkpointed, so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", type=datetime.date.fromisoformat, help="First date (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="end", type=datetime.date.fromisoformat, help="Last date (YYYY-MM-DD).")
+        parser.add_argument("--days-back", type=int, default=None,
+                            help="Days before today (default SPORTS_WINDOW_DAYS_BACK).")
+        parser.add_argument("--days-ahead", type=int, default=None,
+                            help="Days after today (default SPORTS_WINDOW_DAYS_AHEAD).")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Concurrent provider requests (default SPORTS_BACKFILL_WORKERS).")
+        parser.add_argument("--provider", default="api-sports", help="Provider id stored on the events.")
+        parser.add_argument("--restart", action="store_true", help="Ignore checkpoints from previous runs.")
+        parser.add_argument("--force", action="store_true", help="Write events even if they did not change.")
+
+    def handle(self, *args, **options):
+        if options["start"] or options["end"]:
+            if not (options["start"] and options["end"]):
+                raise CommandError("--from and --to must be given together.")
+            if options["end"] < options["start"]:
+                raise CommandError("--to must not be before --from.")
+            dates = date_range(options["start"], options["end"])
+        else:
+            days_back = options["days_back"]
+            days_ahead = options["days_ahead"]
+            dates = window_dates(
+                days_back if days_back is not None else getattr(settings, "SPORTS_WINDOW_DAYS_BACK", 14),
+                days_ahead if days_ahead is not None else getattr(settings, "SPORTS_WINDOW_DAYS_AHEAD", 7),
+            )
+
+        self.stdout.write(f"Backfilling {len(dates)} date(s) from {dates[0]} to {dates[-1]}...")
+        summary = backfill(
+            options["provider"], dates,
+            workers=options["workers"], resume=not options["restart"], force=options["force"],
+        )
+        if summary.get("skipped"):
+            self.stdout.write(f"A backfill of {options['provider']} is already running "
+                              f"(run {summary['runId']} on {summary['holder']} since {summary['startedAt']}).")
+            return
+        self.stdout.write(json.dumps(summary, indent=2))
@@ -0,0 +1,93 @@
+# sports_data_integration/management/commands/fake_provider.py
+import datetime
+import json
+import resource
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from sports_data_integration.adapters import build_adapters, stream_jobs
+from sports_data_integration.fake_provider import make_server, start_in_thread
+from sports_data_integration.ingest import ingest_events
+from sports_data_integration.instrumentation import track
+from sports_data_integration.response_cache import response_cache
+from sports_data_integration.streaming import ingest_stream
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve synthetic api-sports fixtures from local files, so polling and ingest can be "
+        "exercised at production-like volumes without network access. Point the adapters at it "
+        "with SPORTS_FAKE_PROVIDER_URL, or pass --bench to run one poll per date against it "
+        "(this writes to the configured databases)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--fixtures", type=int, default=2000, help="Fixtures per endpoint and date.")
+        parser.add_argument("--quota", type=int, default=1000000,
+                            help="Daily requests allowed before answers carry a quota error.")
+        parser.add_argument("--dir", default=None,
+                            help="Where payload files are kept (default SPORTS_FAKE_PROVIDER_DIR).")
+        parser.add_argument("--bench", action="store_true",
+                            help="Fetch and ingest against the fake provider, print timings and exit.")
+        parser.add_argument("--dates", nargs="*", default=None, help="Dates polled by --bench (default today).")
+        parser.add_argument("--force", action="store_true", help="With --bench, write events even if unchanged.")
+
+    def handle(self, *args, **options):
+        directory = options["dir"] or getattr(settings, "SPORTS_FAKE_PROVIDER_DIR", "fake_provider_data")
+        server = make_server(directory, options["fixtures"], options["host"], options["port"],
+                             quota=options["quota"])
+        host, port = server.server_address[:2]
+        url = f"http://{host}:{port}"
+
+        if not options["bench"]:
+            self.stdout.write(f"Fake provider serving {options['fixtures']} fixtures per date at {url} "
+                              f"(files in {directory}). Press Ctrl+C to exit.")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                self.stdout.write("Fake provider stopped.")
+            finally:
+                server.server_close()
+            return
+
+        start_in_thread(server)
+        dates = options["dates"] or [datetime.date.today().isoformat()]
+        cache_enabled = response_cache.enabled
+        response_cache.enabled = False  # Measure the full path, not the on-disk cache
+        try:
+            with override_settings(SPORTS_FAKE_PROVIDER_URL=url):
+                adapters = build_adapters("fake-provider")
+                for date_str in dates:
+                    ingest_seconds = 0.0
+
+                    def timed_ingest(batch):
+                        nonlocal ingest_seconds
+                        started = time.perf_counter()
+                        result = ingest_events(batch, force=options["force"])
+                        ingest_seconds += time.perf_counter() - started
+                        return result
+
+                    t0 = time.perf_counter()
+                    with track("bench:fake-provider", uuid.uuid4().hex) as run:
+                        summary = ingest_stream(stream_jobs(adapters, date_str), timed_ingest)
+                        run.summary = dict(summary)
+                    elapsed = time.perf_counter() - t0
+                    summary.update({
+                        "date": date_str,
+                        "seconds": round(elapsed, 3),
+                        "ingestSeconds": round(ingest_seconds, 3),
+                        "eventsPerSec": round(summary["fetched"] / elapsed, 1) if elapsed else 0.0,
+                        "peakMemoryMB": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                        "stages": run.report(),
+                    })
+                    self.stdout.write(json.dumps(summary))
+        finally:
+            response_cache.enabled = cache_enabled
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,48 @@
+# sports_data_integration/management/commands/poll_stats.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from sports_data_integration.instrumentation import recent_runs, summarize
+
+METRICS = (("seconds", "s"), ("rows", "rows"), ("sqlQueries", "sql"), ("mongoCommands", "mongo"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Print percentiles of the recent poll and backfill runs: total duration and, per stage "
+        "(quota, fetch, parse, changes, mongo, sql, teams), time, rows, SQL queries and Mongo commands."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--name", default=None, help='Only runs of this lease, e.g. "poll:api-sports".')
+        parser.add_argument("--limit", type=int, default=100, help="Number of recent runs summarized.")
+        parser.add_argument("--json", action="store_true", help="Print the summary as a single JSON line.")
+
+    def handle(self, *args, **options):
+        runs = recent_runs(options["name"], options["limit"])
+        summary = summarize(runs)
+        if options["json"]:
+            self.stdout.write(json.dumps(summary))
+            return
+        if not runs:
+            self.stdout.write("No runs recorded yet.")
+            return
+
+        names = sorted({run.name for run in runs})
+        total = summary["seconds"]
+        self.stdout.write(
+            f"{summary['runs']} run(s) of {', '.join(names)} ({summary['failed']} failed): "
+            f"p50 {total['p50']:.3f}s  p90 {total['p90']:.3f}s  p99 {total['p99']:.3f}s"
+        )
+        header = f"{'stage':<9}{'runs':>6}" + "".join(
+            f"{label + ' ' + pct:>12}" for _, label in METRICS for pct in ("p50", "p90", "p99")
+        )
+        self.stdout.write(header)
+        for stage, values in summary["stages"].items():
+            line = f"{stage:<9}{values['runs']:>6}"
+            for key, _ in METRICS:
+                for pct in ("p50", "p90", "p99"):
+                    value = values[key][pct]
+                    line += f"{value:>12.3f}" if key == "seconds" else f"{value:>12.0f}"
+            self.stdout.write(line)
@@ -1,15 +1,26 @@
 # sports_data_integration/management/commands/run_scheduler.py
+import datetime
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from apscheduler.schedulers.blocking import BlockingScheduler
-from sports_data_integration.views import poll_events_task
+from acid_db.team_cache import team_cache
+from sports_data_integration.backfill import forward_window_task
+from sports_data_integration.adaptive import adaptive_poll_task
 
 class Command(BaseCommand):
     help = "Run APScheduler to execute periodic tasks."
 
     def handle(self, *args, **kwargs):
+        # Carga los equipos de una vez para que el primer poll no los consulte uno a uno
+        team_cache.preload()
         scheduler = BlockingScheduler()
-        # Programa la tarea para que se ejecute cada minuto
-        scheduler.add_job(poll_events_task, 'interval', minutes=1)
+        # Revisa cada pocos segundos qué proveedor/fecha toca consultar; el intervalo real
+        # depende del estado de los eventos (ver sports_data_integration.adaptive)
+        scheduler.add_job(adaptive_poll_task, 'interval', seconds=getattr(settings, "SPORTS_POLL_TICK_SECONDS", 10),
+                          max_instances=1, coalesce=True)
+        # Próximos días y resultados recientes, con menos frecuencia
+        scheduler.add_job(forward_window_task, 'interval', hours=1, next_run_time=datetime.datetime.now())
         self.stdout.write("Scheduler started. Press Ctrl+C to exit.")
         try:
             scheduler.start()
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventFingerprint',
+            fields=[
+                ('acid_event_id', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_data_integration', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('adapter', models.CharField(max_length=64)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('date', 'adapter')},
+            },
+        ),
+    ]
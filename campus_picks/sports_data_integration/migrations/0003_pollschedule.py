@@ -0,0 +1,33 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_data_integration', '0002_backfillcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PollSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adapter', models.CharField(max_length=64)),
+                ('date', models.DateField()),
+                ('interval', models.PositiveIntegerField()),
+                ('reason', models.CharField(max_length=20)),
+                ('live', models.PositiveIntegerField(default=0)),
+                ('upcoming', models.PositiveIntegerField(default=0)),
+                ('finished', models.PositiveIntegerField(default=0)),
+                ('next_poll_at', models.DateTimeField()),
+                ('last_polled_at', models.DateTimeField(blank=True, null=True)),
+                ('polls', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('adapter', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_data_integration', '0003_pollschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PollLease',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('run_id', models.CharField(max_length=32)),
+                ('holder', models.CharField(max_length=255)),
+                ('acquired_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('summary', models.JSONField(blank=True, null=True)),
+            ],
+        ),
+    ]
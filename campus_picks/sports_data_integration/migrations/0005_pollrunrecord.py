@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_data_integration', '0004_polllease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PollRunRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=32, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('started_at', models.DateTimeField()),
+                ('seconds', models.FloatField()),
+                ('outcome', models.CharField(max_length=20)),
+                ('summary', models.JSONField(blank=True, null=True)),
+                ('stages', models.JSONField(default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['name', '-started_at'], name='sports_data_name_aa1c46_idx')],
+            },
+        ),
+    ]
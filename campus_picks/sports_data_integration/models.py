@@ -1,3 +1,96 @@
 from django.db import models
 
-# Create your models here.
+
+class EventFingerprint(models.Model):
+    """
+    Hash of the last version of an event written by the poller.
+    Lets poll_events skip fixtures that did not change since the previous poll.
+    """
+    acid_event_id = models.CharField(primary_key=True, max_length=32)
+    fingerprint = models.CharField(max_length=40)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.acid_event_id} ({self.fingerprint[:8]})"
+
+
+class BackfillCheckpoint(models.Model):
+    """
+    One (date, adapter) pair already fetched and ingested by a backfill run.
+    Only dates whose fixtures are all over are checkpointed, so an interrupted
+    backfill resumes where it stopped while recent and future dates stay fresh.
+    """
+    date = models.DateField()
+    adapter = models.CharField(max_length=64)
+    events = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("date", "adapter")
+
+    def __str__(self):
+        return f"{self.adapter} {self.date} ({self.events} events)"
+
+
+class PollSchedule(models.Model):
+    """
+    Latest decision of the adaptive poller for one (adapter, date) pair:
+    how often it is polled, why, and when it is due next.
+    """
+    adapter = models.CharField(max_length=64)
+    date = models.DateField()
+    interval = models.PositiveIntegerField()  # Seconds between polls
+    reason = models.CharField(max_length=20)   # live, starting, upcoming, finished or empty
+    live = models.PositiveIntegerField(default=0)
+    upcoming = models.PositiveIntegerField(default=0)
+    finished = models.PositiveIntegerField(default=0)
+    next_poll_at = models.DateTimeField()
+    last_polled_at = models.DateTimeField(null=True, blank=True)
+    polls = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("adapter", "date")
+
+    def __str__(self):
+        return f"{self.adapter} {self.date}: every {self.interval}s ({self.reason})"
+
+
+class PollLease(models.Model):
+    """
+    Single-flight lock of a kind of poll ("poll:api-sports", "backfill:api-sports"),
+    shared by every process. A run holds it until `expires_at`, renewing it while
+    it makes progress, so a crashed run never blocks the next ones for long.
+    See single_flight.run_single_flight.
+    """
+    name = models.CharField(primary_key=True, max_length=100)
+    run_id = models.CharField(max_length=32)
+    holder = models.CharField(max_length=255)  # host:pid of the process running it
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    summary = models.JSONField(null=True, blank=True)  # Result of the run, for triggers that joined it
+
+    def __str__(self):
+        state = "finished" if self.finished_at else f"held until {self.expires_at:%H:%M:%S}"
+        return f"{self.name}: run {self.run_id} by {self.holder} ({state})"
+
+
+class PollRunRecord(models.Model):
+    """
+    Timings and counters of one poll or backfill run, per pipeline stage
+    (see instrumentation). Only the latest SPORTS_POLL_RUN_HISTORY runs are kept.
+    """
+    run_id = models.CharField(max_length=32, unique=True)  # Same id as its PollLease
+    name = models.CharField(max_length=100)                # e.g. "poll:api-sports"
+    started_at = models.DateTimeField()
+    seconds = models.FloatField()
+    outcome = models.CharField(max_length=20)  # "ok" or "failed"
+    summary = models.JSONField(null=True, blank=True)
+    stages = models.JSONField(default=dict)  # stage -> {"seconds", "calls", "rows", "sqlQueries", "mongoCommands", ...}
+
+    class Meta:
+        indexes = [models.Index(fields=["name", "-started_at"])]
+
+    def __str__(self):
+        return f"{self.name} run {self.run_id}: {self.seconds:.2f}s ({self.outcome})"
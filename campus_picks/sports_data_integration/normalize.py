@@ -0,0 +1,110 @@
+# sports_data_integration/normalize.py
+import datetime
+import logging
+import random
+import uuid
+
+logger = logging.getLogger(__name__)
+
+START_TIME_DEFAULTED = "startTimeDefaulted"
+
+
+def _event_rng(seed, purpose: str):
+    """
+    Random generator for one event. With a seed (the acidEventId) the values are the
+    same on every poll, so unchanged fixtures produce identical documents.
+    """
+    if seed is None:
+        return random
+    return random.Random(f"{seed}:{purpose}")
+
+def generate_random_odds(seed: str = None) -> tuple[float, float]:
+    """
+    Very small ‘bookmaker margin’ so the two odds are realistic.
+    Returns (oddsA, oddsB) rounded to 2 decimals, stable for a given seed.
+    """
+    rng = _event_rng(seed, "odds")
+
+    base = rng.uniform(1.35, 2.80)
+    margin = rng.uniform(0.05, 0.60)
+    if rng.random() > 0.50:
+        oddsA, oddsB = base, base + margin
+    else:
+        oddsA, oddsB = base + margin, base
+    return round(oddsA, 2), round(oddsB, 2)
+
+def get_random_location(seed: str = None):
+    locations = [
+        {'lat': 40.7128, 'lng': -74.0060},  # New York
+        {'lat': 34.0522, 'lng': -118.2437}, # Los Angeles
+        {'lat': 41.8781, 'lng': -87.6298},  # Chicago
+        {'lat': 29.7604, 'lng': -95.3698},  # Houston
+        {'lat': 33.4484, 'lng': -112.0740}  # Phoenix
+    ]
+    return dict(_event_rng(seed, "location").choice(locations))
+
+
+
+def calculate_end_time(start_time, seed: str = None):
+    # Lista de duraciones posibles en horas
+    possible_durations = [1, 1.5, 2, 2.5, 3]
+    # Selecciona una duración aleatoria (estable para un mismo seed)
+    duration = _event_rng(seed, "duration").choice(possible_durations)
+    return start_time + datetime.timedelta(hours=duration)
+
+
+def normalize_event(fields: dict, sport: str, provider_id: str, status_mapping: dict,
+                    default_name: str = "Unnamed Event"):
+    """
+    Shared normalization step of every adapter: turns the fields an adapter
+    extracted from one provider item into our standardized event dictionary.
+
+    Input (fields):
+        {
+          "external_id": "1234",            # required, provider id of the fixture
+          "start_time": datetime | None,    # None -> current UTC time, flagged as startTimeDefaulted
+          "status_code": "FT",              # provider short status, mapped with status_mapping
+          "home_team": "...", "away_team": "...",
+          "home_logo": "...", "away_logo": "...",
+          "home_score": 2, "away_score": 1
+        }
+
+    Returns None when the item has no external id.
+    """
+    external_id = fields.get("external_id")
+    if not external_id:
+        return None
+    # Generate a deterministic UUID using UUIDv5 from the external ID
+    acid_event_id = uuid.uuid5(uuid.NAMESPACE_DNS, str(external_id)).hex
+
+    start_time = fields.get("start_time")
+    start_time_defaulted = start_time is None
+    if start_time_defaulted:
+        start_time = datetime.datetime.utcnow()
+    home_team = fields.get("home_team")
+    away_team = fields.get("away_team")
+    # Odds, venue and end time are not provided by the APIs: random but stable per event
+    odds_a, odds_b = generate_random_odds(seed=acid_event_id)
+
+    event = {
+        "acidEventId": acid_event_id,  # Store as string
+        "name": f"{home_team} vs {away_team}" if home_team and away_team else default_name,
+        "sport": sport,
+        "location": get_random_location(seed=acid_event_id),
+        "startTime": start_time,
+        "endTime": calculate_end_time(start_time, seed=acid_event_id),
+        "status": status_mapping.get(fields.get("status_code") or "NS", "upcoming"),
+        "providerId": provider_id,
+        "homeTeam": home_team,
+        "awayTeam": away_team,
+        "home_score": fields.get("home_score") or 0,
+        "away_score": fields.get("away_score") or 0,
+        "home_logo": fields.get("home_logo"),
+        "away_logo": fields.get("away_logo"),
+        "oddsA": odds_a,
+        "oddsB": odds_b,
+    }
+    if start_time_defaulted:
+        # Not stored: tells ingest.fingerprint_event to ignore the poll-time start/end
+        event[START_TIME_DEFAULTED] = True
+    return event
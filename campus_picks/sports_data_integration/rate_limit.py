@@ -0,0 +1,227 @@
+# sports_data_integration/rate_limit.py
+import contextlib
+import datetime
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is only shared between the threads of one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Request priorities, from the one that must never wait for quota to the one deferred first
+LIVE = "live"      # Dates with games being played or about to start
+NORMAL = "normal"  # Regular and manual polls
+LOW = "low"        # Backfill and the forward window; can always be done later
+
+# api-sports headers: daily quota of the plan and per-minute quota
+DAILY_LIMIT = "x-ratelimit-requests-limit"
+DAILY_REMAINING = "x-ratelimit-requests-remaining"
+MINUTE_LIMIT = "X-RateLimit-Limit"
+MINUTE_REMAINING = "X-RateLimit-Remaining"
+
+
+class QuotaDeferred(Exception):
+    """Raised instead of sending a request whose priority is too low for the quota left."""
+
+
+def _int_header(headers, name: str):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc_day(timestamp: float) -> datetime.date:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).date()
+
+
+class ProviderRateLimiter:
+    """
+    Token bucket per provider host, kept in a small JSON file under `directory`
+    and locked with flock, so the scheduler, cron jobs, Celery workers and
+    manual triggers all draw from the same bucket. (A file rather than a table:
+    on SQLite, provider threads writing quota rows would make the ingest
+    transactions fail with "database is locked".)
+
+    The bucket holds `burst` tokens and refills at `per_minute` tokens a minute
+    (SPORTS_RATE_LIMITS[host] or SPORTS_RATE_LIMIT_PER_MINUTE / _BURST). It is
+    also clamped to the quota the provider reports in its response headers.
+
+    - LIVE requests wait for the next token and are never refused; after
+      `max_wait` seconds they are sent anyway.
+    - NORMAL requests wait the same way, but are deferred once the daily quota
+      is down to the `live_reserve` fraction of the plan.
+    - LOW requests leave the `low_reserve` fraction of the bucket untouched and
+      are deferred instead of sent when no token frees up within `max_wait`, or
+      when the daily quota is below that fraction of the plan.
+    """
+    def __init__(self, directory: str, enabled: bool, per_minute: float, burst: int, limits: dict,
+                 low_reserve: float, live_reserve: float, max_wait: float):
+        self.directory = str(directory)
+        self.enabled = enabled
+        self.per_minute = per_minute
+        self.burst = burst
+        self.limits = limits
+        self.low_reserve = low_reserve
+        self.live_reserve = live_reserve
+        self.max_wait = max_wait
+        self._lock = threading.Lock()  # Only used without fcntl
+
+    def _bucket(self, host: str) -> tuple:
+        limits = self.limits.get(host, {})
+        return limits.get("per_minute", self.per_minute) / 60.0, limits.get("burst", self.burst)
+
+    def _path(self, host: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", host) + ".json")
+
+    @contextlib.contextmanager
+    def _state(self, host: str):
+        """Locked, refilled state of a host's bucket; changes are saved on exit."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(host), "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                self._lock.acquire()
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                rate, burst = self._bucket(host)
+                tokens = state.get("tokens", float(burst))
+                elapsed = max(now - state.get("refilledAt", now), 0.0)
+                state.update(tokens=min(float(burst), tokens + elapsed * rate), refilledAt=now)
+                try:
+                    yield state
+                finally:  # QuotaDeferred is raised from inside; its counter is saved too
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                    f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    self._lock.release()
+
+    @staticmethod
+    def _daily_remaining(state: dict, now: float):
+        # The provider resets the daily quota at 00:00 UTC
+        if state.get("dailyRemaining") is None or state.get("reportedAt") is None:
+            return None
+        if _utc_day(state["reportedAt"]) != _utc_day(now):
+            return None
+        return state["dailyRemaining"]
+
+    def _try_take(self, host: str, priority: str) -> float:
+        """Takes a token and returns 0, or returns the seconds to wait for one. Raises QuotaDeferred."""
+        rate, burst = self._bucket(host)
+        with self._state(host) as state:
+            remaining = self._daily_remaining(state, state["refilledAt"])
+            daily_limit = state.get("dailyLimit")
+            if remaining is not None and daily_limit and priority != LIVE:
+                reserve = self.low_reserve if priority == LOW else self.live_reserve
+                if remaining <= daily_limit * reserve:
+                    state["deferred"] = state.get("deferred", 0) + 1
+                    raise QuotaDeferred(f"{host}: {remaining} of {daily_limit} daily requests left")
+
+            needed = 1.0 + (burst * self.low_reserve if priority == LOW else 0.0)
+            if state["tokens"] < needed:
+                return (needed - state["tokens"]) / rate if rate else float("inf")  # No refill
+
+            state["tokens"] -= 1.0
+            state["granted"] = state.get("granted", 0) + 1
+            if remaining is not None:
+                state["dailyRemaining"] = max(remaining - 1, 0)
+            return 0.0
+
+    def acquire(self, host: str, priority: str = NORMAL) -> None:
+        """
+        Blocks until a request to `host` may be sent (see the class docstring).
+        Raises QuotaDeferred for requests that should be retried later.
+        """
+        if not self.enabled:
+            return
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait = self._try_take(host, priority)
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                if priority == LOW:
+                    with self._state(host) as state:
+                        state["deferred"] = state.get("deferred", 0) + 1
+                    raise QuotaDeferred(f"{host}: no token for a {priority} priority request within {self.max_wait}s")
+                logger.warning("Rate limit of %s exceeded for %s priority, sending anyway", host, priority)
+                return
+            time.sleep(wait)
+
+    def observe(self, host: str, headers) -> None:
+        """Stores the quota reported by the provider and clamps the bucket to it."""
+        if not self.enabled:
+            return
+        daily_limit, daily_remaining = _int_header(headers, DAILY_LIMIT), _int_header(headers, DAILY_REMAINING)
+        minute_limit, minute_remaining = _int_header(headers, MINUTE_LIMIT), _int_header(headers, MINUTE_REMAINING)
+        if daily_remaining is None and minute_remaining is None:
+            return
+        with self._state(host) as state:
+            state["reportedAt"] = state["refilledAt"]
+            if daily_remaining is not None:
+                state.update(dailyLimit=daily_limit, dailyRemaining=daily_remaining)
+            if minute_remaining is not None:
+                state.update(minuteLimit=minute_limit, minuteRemaining=minute_remaining)
+                state["tokens"] = min(state["tokens"], float(minute_remaining))
+        if daily_remaining is not None and daily_limit and daily_remaining <= daily_limit * self.low_reserve:
+            logger.warning("%s: only %s of %s daily requests left", host, daily_remaining, daily_limit)
+
+    def stats(self) -> dict:
+        """Bucket and reported quota of every provider host seen so far."""
+        if not os.path.isdir(self.directory):
+            return {}
+        stats = {}
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            host = name[:-len(".json")]
+            rate, burst = self._bucket(host)
+            with self._state(host) as state:
+                reported_at = state.get("reportedAt")
+                stats[host] = {
+                    "tokens": round(state["tokens"], 2),
+                    "burst": burst,
+                    "perMinute": round(rate * 60, 2),
+                    "dailyLimit": state.get("dailyLimit"),
+                    "dailyRemaining": self._daily_remaining(state, state["refilledAt"]),
+                    "minuteLimit": state.get("minuteLimit"),
+                    "minuteRemaining": state.get("minuteRemaining"),
+                    "reportedAt": datetime.datetime.fromtimestamp(reported_at, datetime.timezone.utc).isoformat()
+                                  if reported_at else None,
+                    "granted": state.get("granted", 0),
+                    "deferred": state.get("deferred", 0),
+                }
+        return stats
+
+
+rate_limiter = ProviderRateLimiter(
+    getattr(settings, "SPORTS_RATE_LIMIT_DIR", os.path.join(tempfile.gettempdir(), "campus_picks_rate_limits")),
+    enabled=getattr(settings, "SPORTS_RATE_LIMIT_ENABLED", True),
+    per_minute=getattr(settings, "SPORTS_RATE_LIMIT_PER_MINUTE", 30),
+    burst=getattr(settings, "SPORTS_RATE_LIMIT_BURST", 10),
+    limits=getattr(settings, "SPORTS_RATE_LIMITS", {}),
+    low_reserve=getattr(settings, "SPORTS_QUOTA_LOW_RESERVE", 0.25),
+    live_reserve=getattr(settings, "SPORTS_QUOTA_LIVE_RESERVE", 0.05),
+    max_wait=getattr(settings, "SPORTS_RATE_LIMIT_MAX_WAIT", 5),
+)
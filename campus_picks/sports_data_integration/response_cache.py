@@ -0,0 +1,297 @@
+# sports_data_integration/response_cache.py
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.conf import settings
+
+from sports_data_integration.http_pool import http_pool
+from sports_data_integration.instrumentation import stage
+from sports_data_integration.rate_limit import LIVE as LIVE_PRIORITY, NORMAL
+
+logger = logging.getLogger(__name__)
+
+# Status classes of a fixtures date and how long (seconds) a cached answer stays fresh.
+# None means it never expires.
+LIVE = "live"          # Yesterday and today: games may still be running
+UPCOMING = "upcoming"  # Future dates: kick-off times and line-ups can still move
+FINISHED = "finished"  # Older dates: every game is over, the payload no longer changes
+
+
+def status_class(date_str: str, today: datetime.date = None) -> str:
+    """
+    Status class of the fixtures of a date. Yesterday still counts as live because
+    late games cross midnight UTC.
+    """
+    today = today or datetime.date.today()
+    try:
+        day = datetime.date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return LIVE
+    if day > today:
+        return UPCOMING
+    if day >= today - datetime.timedelta(days=1):
+        return LIVE
+    return FINISHED
+
+
+def cache_key(host: str, path: str) -> str:
+    """Hash of (host, path, query); query parameters are sorted so their order does not matter."""
+    parts = urlsplit(path)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return hashlib.sha1(f"{host}\n{parts.path}\n{query}".encode("utf-8")).hexdigest()
+
+
+def _query_param(path: str, name: str):
+    return dict(parse_qsl(urlsplit(path).query)).get(name)
+
+
+class CachedBody:
+    """
+    Readable body returned by ProviderResponseCache.open(), either a cached gzip
+    file or a live provider response.
+
+    A live body is copied into a compressed temporary file while it is read and
+    becomes the cached copy on close(), if it was read to the end with a 200 and
+    the caller did not reject() it. Use it as a context manager.
+    """
+    def __init__(self, stream, source: str, on_complete=None, on_discard=None, response=None):
+        self.stream = stream
+        self.source = source  # "cache" or "network"
+        self.status = response.status if response is not None else 200
+        self._response = response
+        self._on_complete = on_complete
+        self._on_discard = on_discard
+        self._eof = False
+        self._rejected = False
+
+    def read(self, size: int = -1) -> bytes:
+        with stage("fetch") as fetched:
+            data = self.stream.read(size) if size is not None and size >= 0 else self.stream.read()
+            fetched["bytes"] = len(data)
+        if not data or size is None or size < 0:
+            self._eof = True
+        return data
+
+    def reject(self) -> None:
+        """Marks the body as unusable (e.g. the provider reported errors); it is not cached."""
+        self._rejected = True
+
+    def close(self) -> None:
+        if self._response is not None:
+            if self._eof:
+                self._response.release_conn()
+            else:
+                self._response.close()  # Half-read connection, do not put it back in the pool
+        else:
+            self.stream.close()
+        if self._on_complete is not None and self._eof and not self._rejected and self.status == 200:
+            self._on_complete()
+        elif self._on_discard is not None:
+            self._on_discard()
+        self._on_complete = self._on_discard = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._rejected = True
+        self.close()
+
+
+class _TeeToFile:
+    """Passes reads through from `source` while appending them to a gzip file."""
+    def __init__(self, source, gzip_file):
+        self.source = source
+        self.gzip_file = gzip_file
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size if size is not None and size >= 0 else None)
+        if data:
+            self.gzip_file.write(data)
+        return data
+
+
+class ProviderResponseCache:
+    """
+    On-disk cache of sports provider answers, one compressed body (plus a small
+    metadata file) per (host, path, query).
+
+    Fresh entries are served without touching the network. Expired entries are
+    revalidated with If-None-Match / If-Modified-Since when the provider sent an
+    ETag or Last-Modified header; a 304 refreshes the entry and keeps the cached
+    body. Answers for finished dates never expire. When the provider fails, the
+    last good answer is served instead.
+    Bodies are streamed in both directions (see open()), and files are written
+    to a temporary name and renamed, so several processes can share the directory.
+    """
+    def __init__(self, directory: str, ttl: dict, enabled: bool = True):
+        self.directory = str(directory)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "stale": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _file(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{suffix}")
+
+    def _load(self, key: str):
+        try:
+            with open(self._file(key, ".meta.json"), "r") as f:
+                entry = json.load(f)
+            if not os.path.exists(self._file(key, ".body.gz")):
+                return None
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", key, e)
+            return None
+
+    def _save_meta(self, key: str, entry: dict) -> None:
+        path = self._file(key, ".meta.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", key, e)
+            _unlink(tmp)
+
+    def _is_fresh(self, entry: dict, now: float) -> bool:
+        ttl = self.ttl.get(entry["statusClass"])
+        return ttl is None or now - entry["storedAt"] < ttl
+
+    def _cached_body(self, key: str) -> CachedBody:
+        return CachedBody(gzip.open(self._file(key, ".body.gz"), "rb"), "cache")
+
+    def _network_body(self, key: str, res, entry: dict) -> CachedBody:
+        body_path = self._file(key, ".body.gz")
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(body_path), suffix=".tmp")
+        raw = os.fdopen(fd, "wb")
+        compressed = gzip.GzipFile(fileobj=raw, mode="wb")
+
+        def complete():
+            try:
+                compressed.close()
+                raw.close()
+                os.replace(tmp, body_path)
+            except OSError as e:
+                logger.warning("Could not write cache entry %s: %s", key, e)
+                _unlink(tmp)
+                return
+            self._save_meta(key, entry)
+            self._count("stored")
+
+        def discard():
+            compressed.close()
+            raw.close()
+            _unlink(tmp)
+
+        return CachedBody(_TeeToFile(res, compressed), "network", complete, discard, response=res)
+
+    def open(self, host: str, path: str, headers: dict = None, date_str: str = None,
+             scheme: str = "https", port: int = None, priority: str = NORMAL) -> CachedBody:
+        """
+        Streamed body of GET host+path, from the cache when possible.
+        `date_str` (defaults to the `date` query parameter) selects the TTL class.
+        The caller reads it incrementally, calls reject() if the content turns out
+        to be an error, and closes it (or uses it as a context manager).
+        Cache hits do not use provider quota; requests do (see rate_limit), and a
+        deferred low-priority request falls back to a stale cached copy if any.
+        LIVE priority requests (live polls) always go to the provider, with a
+        conditional request when a copy is cached, so a poll is never answered
+        by the copy stored by the previous one.
+        """
+        if not self.enabled:
+            res = http_pool.get(host, path, headers=headers, scheme=scheme, port=port, preload_content=False,
+                                priority=priority)
+            return CachedBody(res, "network", response=res)
+
+        key = cache_key(f"{host}:{port}" if port else host, path)
+        now = time.time()
+        entry = self._load(key)
+        if entry is not None and priority != LIVE_PRIORITY and self._is_fresh(entry, now):
+            self._count("hits")
+            return self._cached_body(key)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("lastModified"):
+                request_headers["If-Modified-Since"] = entry["lastModified"]
+
+        try:
+            res = http_pool.get(host, path, headers=request_headers, scheme=scheme, port=port,
+                                preload_content=False, priority=priority)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning("Provider %s unavailable (%s), serving cached %s", host, e, path)
+            self._count("stale")
+            return self._cached_body(key)
+
+        klass = status_class(date_str or _query_param(path, "date"))
+        if res.status == 304 and entry is not None:
+            res.drain_conn()
+            res.release_conn()
+            entry.update(storedAt=now, statusClass=klass)
+            self._save_meta(key, entry)
+            self._count("revalidated")
+            return self._cached_body(key)
+
+        self._count("misses")
+        if res.status != 200 and entry is not None:
+            logger.warning("Provider %s answered %s for %s, serving cached copy", host, res.status, path)
+            res.drain_conn()
+            res.release_conn()
+            self._count("stale")
+            return self._cached_body(key)
+        return self._network_body(key, res, {
+            "host": host,
+            "path": path,
+            "statusClass": klass,
+            "storedAt": now,
+            "etag": res.headers.get("ETag"),
+            "lastModified": res.headers.get("Last-Modified"),
+        })
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update({"enabled": self.enabled, "directory": self.directory, "ttl": self.ttl})
+        return stats
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+response_cache = ProviderResponseCache(
+    getattr(settings, "SPORTS_API_CACHE_DIR", os.path.join(tempfile.gettempdir(), "campus_picks_sports_cache")),
+    ttl={
+        LIVE: getattr(settings, "SPORTS_API_CACHE_TTL_LIVE", 30),
+        UPCOMING: getattr(settings, "SPORTS_API_CACHE_TTL_UPCOMING", 900),
+        FINISHED: None,
+    },
+    enabled=getattr(settings, "SPORTS_API_CACHE_ENABLED", True),
+)
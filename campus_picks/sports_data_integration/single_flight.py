@@ -0,0 +1,176 @@
+# sports_data_integration/single_flight.py
+import datetime
+import logging
+import os
+import socket
+import time
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from sports_data_integration import instrumentation
+from sports_data_integration.models import PollLease
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(RuntimeError):
+    """The lease of a run expired and was taken by another run."""
+
+
+def poll_lease_name(provider_id: str) -> str:
+    """Lease shared by every poll of a provider's current fixtures (poll_events and the adaptive poller)."""
+    return f"poll:{provider_id}"
+
+
+def backfill_lease_name(provider_id: str) -> str:
+    return f"backfill:{provider_id}"
+
+
+def _holder() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Lease:
+    """
+    A PollLease held by the current run. renew() pushes its expiry forward and
+    is cheap to call often: the row is only written once a third of the lease
+    has gone by.
+    """
+    def __init__(self, name: str, run_id: str, ttl: float):
+        self.name = name
+        self.run_id = run_id
+        self.ttl = ttl
+        self._renewed = time.monotonic()
+
+    def renew(self) -> None:
+        """Raises LeaseLost if another run took the lease over."""
+        if time.monotonic() - self._renewed < self.ttl / 3:
+            return
+        expires_at = timezone.now() + datetime.timedelta(seconds=self.ttl)
+        if not PollLease.objects.filter(name=self.name, run_id=self.run_id).update(expires_at=expires_at):
+            raise LeaseLost(f"Lease {self.name} of run {self.run_id} was taken over")
+        self._renewed = time.monotonic()
+
+    def renewing(self, ingest):
+        """Wraps an ingest callable (see streaming.ingest_stream) so every batch renews the lease."""
+        def wrapped(batch):
+            self.renew()
+            return ingest(batch)
+        return wrapped
+
+    def release(self, summary: dict = None) -> None:
+        now = timezone.now()
+        PollLease.objects.filter(name=self.name, run_id=self.run_id).update(
+            finished_at=now, expires_at=now, summary=summary
+        )
+
+
+def acquire(name: str, ttl: float = None) -> tuple:
+    """
+    Takes the lease `name` if it is free or expired.
+
+    Returns (Lease, None) when taken, or (None, PollLease of the run holding it).
+    Only write statements are used to take it, so concurrent processes wait for
+    each other instead of both reading the lease as free.
+    """
+    ttl = ttl or getattr(settings, "SPORTS_POLL_LEASE_SECONDS", 120)
+    now = timezone.now()
+    run_id = uuid.uuid4().hex
+    fields = {
+        "run_id": run_id,
+        "holder": _holder(),
+        "acquired_at": now,
+        "expires_at": now + datetime.timedelta(seconds=ttl),
+        "finished_at": None,
+        "summary": None,
+    }
+    if PollLease.objects.filter(name=name, expires_at__lte=now).update(**fields):
+        return Lease(name, run_id, ttl), None
+    try:
+        with transaction.atomic():
+            PollLease.objects.create(name=name, **fields)
+        return Lease(name, run_id, ttl), None
+    except IntegrityError:
+        pass
+    current = PollLease.objects.filter(name=name).first()
+    if current is None:  # Deleted between our two statements
+        return acquire(name, ttl)
+    return None, current
+
+
+def wait_for(name: str, run_id: str, timeout: float) -> dict:
+    """
+    Waits up to `timeout` seconds for run `run_id` to release lease `name`.
+    Returns its summary, or None if it is still running (or its summary was
+    already replaced by a later run).
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        lease = PollLease.objects.filter(name=name).first()
+        if lease is None or lease.run_id != run_id:
+            return None
+        if lease.finished_at is not None:
+            return lease.summary
+        if lease.expires_at <= timezone.now() or time.monotonic() >= deadline:
+            return None
+        time.sleep(0.5)
+
+
+def run_single_flight(name: str, fn, join: bool = False, ttl: float = None) -> dict:
+    """
+    Runs fn(lease) unless another run of `name` is in flight, in any process.
+    fn returns a summary dict and should call lease.renew() as it makes progress
+    (e.g. ingest_stream(jobs, lease.renewing(ingest_events))).
+
+    The run is measured stage by stage and kept in the run history under the
+    same id (see instrumentation).
+
+    Returns fn's summary plus its "runId". If another run holds the lease, fn is
+    not called and the result is
+        {"runId": "<in-flight run>", "skipped": True, "startedAt": "...", "holder": "host:pid"}
+    or, with join=True, the summary of that run once it finishes (up to
+    SPORTS_POLL_JOIN_TIMEOUT seconds) with "joined": True.
+    """
+    lease, current = acquire(name, ttl)
+    if lease is None:
+        logger.info("%s already in flight (run %s by %s), skipping", name, current.run_id, current.holder)
+        if join:
+            summary = wait_for(name, current.run_id, getattr(settings, "SPORTS_POLL_JOIN_TIMEOUT", 30))
+            if summary is not None:
+                return {**summary, "runId": current.run_id, "joined": True}
+        return {
+            "runId": current.run_id,
+            "skipped": True,
+            "startedAt": current.acquired_at.isoformat(),
+            "holder": current.holder,
+        }
+
+    summary = None
+    try:
+        with instrumentation.track(name, lease.run_id) as run:
+            summary = fn(lease)
+            summary["runId"] = lease.run_id
+            run.summary = summary
+        return summary
+    finally:
+        lease.release(summary)
+
+
+def lease_status() -> list:
+    """Every lease and whether a run currently holds it."""
+    now = timezone.now()
+    return [
+        {
+            "name": lease.name,
+            "runId": lease.run_id,
+            "holder": lease.holder,
+            "inFlight": lease.finished_at is None and lease.expires_at > now,
+            "acquiredAt": lease.acquired_at.isoformat(),
+            "expiresAt": lease.expires_at.isoformat(),
+            "finishedAt": lease.finished_at.isoformat() if lease.finished_at else None,
+        }
+        for lease in PollLease.objects.order_by("name")
+    ]
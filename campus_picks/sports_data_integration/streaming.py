@@ -0,0 +1,201 @@
+# sports_data_integration/streaming.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ijson
+from django.conf import settings
+from django.db import close_old_connections
+
+from sports_data_integration.instrumentation import bind, current_run, stage
+from sports_data_integration.rate_limit import QuotaDeferred
+
+logger = logging.getLogger(__name__)
+
+_START = ("start_map", "start_array")
+_END = ("end_map", "end_array")
+
+
+def iter_response_items(stream, meta: dict = None, key: str = "response"):
+    """
+    Yields the items of the top-level `key` array of a JSON document one at a
+    time while it is read from `stream`, so neither the whole body nor the
+    whole parsed tree is ever held in memory.
+    The other top-level fields ("errors", "results", ...) are stored in `meta`.
+    """
+    item_prefix = f"{key}.item"
+    current = None  # (prefix, builder) of the value being built
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if current is not None:
+            current[1].event(event, value)
+            if prefix == current[0] and event in _END:
+                if prefix == item_prefix:
+                    yield current[1].value
+                elif meta is not None:
+                    meta[prefix] = current[1].value
+                current = None
+            continue
+
+        top_level = prefix and "." not in prefix and prefix != key
+        if prefix != item_prefix and not top_level:
+            continue
+        if event in _START:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            current = (prefix, builder)
+        elif event not in _END and event != "map_key":
+            if prefix == item_prefix:
+                yield value
+            elif meta is not None:
+                meta[prefix] = value
+
+
+def batched(iterable, size: int):
+    """Lists of at most `size` consecutive items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_DONE = object()
+
+
+def stream_batches(jobs: list, workers: int = None, batch_size: int = None, timeout: float = None):
+    """
+    Runs several event generators concurrently and hands their output to the
+    caller in bounded batches.
+
+    Input:
+        jobs: (label, callable returning an iterable of event dicts) pairs, e.g.
+              (adapter name, lambda: adapter.iter_events(date_str))
+        workers: producer threads (defaults to one per job)
+        batch_size: events per batch (SPORTS_INGEST_BATCH_SIZE)
+        timeout: seconds a running job may go without sending a batch before it is
+                 given up (SPORTS_API_TIMEOUT). Each job has its own deadline; time
+                 the caller spends on a batch does not count against the others.
+
+    Yields ("batch", label, events), ("done", label, None), ("failed", label, error) or
+    ("deferred", label, reason) when the job was put off for lack of provider quota.
+    A job that timed out is told to stop: its producer drops out at the next event it
+    reads (a blocked read ends with the pool's socket timeout), so it never keeps
+    running after the caller has returned.
+    Producers block while SPORTS_INGEST_QUEUE_BATCHES batches are waiting, so memory
+    stays flat however large the payloads are and however slow the consumer is.
+    Producers add their quota, fetch and parse time to the caller's run, if any
+    (see instrumentation).
+    """
+    batch_size = batch_size or getattr(settings, "SPORTS_INGEST_BATCH_SIZE", 500)
+    timeout = timeout if timeout is not None else getattr(settings, "SPORTS_API_TIMEOUT", 10)
+    pending = queue.Queue(maxsize=getattr(settings, "SPORTS_INGEST_QUEUE_BATCHES", 4))
+    stop = threading.Event()
+    cancelled = {label: threading.Event() for label, _ in jobs}
+    deadlines = {}  # label -> monotonic deadline, set once the job's producer starts
+    run = current_run()
+
+    def put(label, message) -> bool:
+        while not (stop.is_set() or cancelled[label].is_set()):
+            try:
+                pending.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def events(label, factory):
+        for event in factory():
+            if stop.is_set() or cancelled[label].is_set():
+                return
+            yield event
+
+    def produce(label, factory):
+        deadlines[label] = time.monotonic() + timeout
+        try:
+            with bind(run):
+                batches = batched(events(label, factory), batch_size)
+                while True:
+                    # Time spent waiting on the queue is left out; fetch and quota are nested stages
+                    with stage("parse") as parsed:
+                        batch = next(batches, None)
+                        parsed["rows"] = len(batch or ())
+                    if batch is None:
+                        break
+                    if not put(label, ("batch", label, batch)):
+                        return
+            put(label, ("done", label, None))
+        except QuotaDeferred as e:
+            put(label, ("deferred", label, str(e)))
+        except Exception as e:
+            put(label, ("failed", label, str(e) or type(e).__name__))
+        finally:
+            close_old_connections()
+
+    if not jobs:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(workers or len(jobs), 1), thread_name_prefix="sports-stream")
+    for label, factory in jobs:
+        executor.submit(produce, label, factory)
+
+    remaining = {label for label, _ in jobs}
+    try:
+        while remaining:
+            now = time.monotonic()
+            for label in sorted(remaining):
+                if deadlines.get(label, now + timeout) <= now:
+                    cancelled[label].set()
+                    remaining.discard(label)
+                    logger.error("%s sent nothing within %ss", label, timeout)
+                    yield "failed", label, f"timed out after {timeout}s"
+            if not remaining:
+                break
+            # Jobs still waiting for a worker have no deadline yet
+            wait = min(deadlines.get(label, now + timeout) for label in remaining) - now
+            try:
+                kind, label, payload = pending.get(timeout=max(wait, 0))
+            except queue.Empty:
+                continue
+            if label not in remaining:
+                continue  # Late message of a job that already timed out
+            if kind != "batch":
+                remaining.discard(label)
+            handed = time.monotonic()
+            yield kind, label, payload
+            spent = time.monotonic() - handed
+            for other in remaining:
+                if other in deadlines:
+                    deadlines[other] += spent
+            deadlines[label] = time.monotonic() + timeout
+    finally:
+        stop.set()
+        # Do not wait for producers that timed out; they stop at their next event
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ingest_stream(jobs: list, ingest, **options) -> dict:
+    """
+    Consumes stream_batches(jobs) with `ingest` (e.g. ingest.ingest_events), one
+    batch at a time, from the calling thread.
+
+    Returns a summary:
+        {"fetched": 4000, "changed": 12, "unchanged": 3988, "teamsCreated": 0, "failures": {}, "deferred": {}}
+    """
+    summary = {"fetched": 0, "changed": 0, "unchanged": 0, "teamsCreated": 0, "failures": {}, "deferred": {}}
+    for kind, label, payload in stream_batches(jobs, **options):
+        if kind == "batch":
+            result = ingest(payload)
+            summary["fetched"] += len(payload)
+            for key in ("changed", "unchanged", "teamsCreated"):
+                summary[key] += result[key]
+        elif kind == "failed":
+            summary["failures"][label] = payload
+            logger.error("Error fetching events from %s: %s", label, payload)
+        elif kind == "deferred":
+            summary["deferred"][label] = payload
+            logger.info("Fetch of %s deferred: %s", label, payload)
+    return summary
@@ -1,3 +1,346 @@
-from django.test import TestCase
+import datetime
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from sports_data_integration import single_flight
+from sports_data_integration.adapters import BasketballAPIAdapter
+from sports_data_integration.http_pool import ProviderHTTPPool
+from sports_data_integration.ingest import fingerprint_event
+from sports_data_integration.models import PollLease, PollRunRecord
+from sports_data_integration.normalize import normalize_event
+from sports_data_integration.rate_limit import LIVE, LOW, NORMAL, ProviderRateLimiter, QuotaDeferred
+from sports_data_integration.streaming import ingest_stream, stream_batches
+from sports_data_integration.response_cache import FINISHED, UPCOMING, ProviderResponseCache
+from sports_data_integration.response_cache import LIVE as LIVE_DATES
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive JSON answers (`body` when one is set); records the path, headers
+    and client port of every request and fails the first `failures`. With an
+    `etag` set, it is sent with every answer and a matching If-None-Match gets a 304.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.client_ports.append(self.client_address[1])
+        server.paths.append(self.path)
+        server.headers.append(dict(self.headers))
+        if server.failures:
+            server.failures -= 1
+            status, body = 503, b"unavailable"
+        elif server.etag and self.headers.get("If-None-Match") == server.etag:
+            status, body = 304, b""
+        elif server.body is not None:
+            status, body = 200, server.body
+        else:
+            status, body = 200, json.dumps({"response": [], "path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubProviderTestCase(SimpleTestCase):
+    """Runs a StubProviderHandler server and a private pool with rate limiting disabled."""
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+        self.server.client_ports = []
+        self.server.paths = []
+        self.server.failures = 0
+        self.server.headers = []
+        self.server.etag = None
+        self.server.body = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.port = self.server.server_address[1]
+        self.pool = ProviderHTTPPool(pool_size=2, retries=2, backoff=0, timeout=5)
+        limiter = ProviderRateLimiter("", enabled=False, per_minute=0, burst=0, limits={},
+                                      low_reserve=0, live_reserve=0, max_wait=0)
+        patcher = mock.patch("sports_data_integration.http_pool.rate_limiter", limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ProviderHTTPPoolTests(StubProviderTestCase):
+    def get(self, path: str):
+        return self.pool.get("127.0.0.1", path, scheme="http", port=self.port)
+
+    def test_requests_reuse_one_connection(self):
+        for i in range(5):
+            response = self.get(f"/games?date=2025-05-0{i + 1}")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(json.loads(response.data)["path"], f"/games?date=2025-05-0{i + 1}")
+
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+        stats = self.pool.stats()[f"http://127.0.0.1:{self.port}"]
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connectionsOpened"], 1)
+        self.assertEqual(stats["connectionsReused"], 4)
+
+    def test_unavailable_answers_are_retried(self):
+        self.server.failures = 1
+        response = self.get("/games?date=2025-05-01")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.pool.stats()[f"http://127.0.0.1:{self.port}"]["retries"], 1)
+
+
+class ProviderRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # No refill, so the bucket only holds its burst; nothing waits
+        self.limiter = ProviderRateLimiter(directory, enabled=True, per_minute=0, burst=4, limits={},
+                                           low_reserve=0.5, live_reserve=0.05, max_wait=0)
+
+    def test_low_priority_leaves_its_reserve_to_live_polls(self):
+        self.limiter.acquire("api", LOW)
+        self.limiter.acquire("api", LOW)
+        with self.assertRaises(QuotaDeferred):
+            self.limiter.acquire("api", LOW)
+
+        self.limiter.acquire("api", LIVE)
+        self.limiter.acquire("api", LIVE)
+        self.limiter.acquire("api", LIVE)  # Bucket empty: sent anyway
+        stats = self.limiter.stats()["api"]
+        self.assertEqual((stats["granted"], stats["deferred"]), (4, 1))
+
+    def test_daily_quota_defers_low_first_and_never_live(self):
+        self.limiter.observe("api", {"x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": "60"})
+        self.limiter.acquire("api", LOW)
+
+        self.limiter.observe("api", {"x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": "40"})
+        with self.assertRaises(QuotaDeferred):
+            self.limiter.acquire("api", LOW)
+        self.limiter.acquire("api", NORMAL)
+
+        self.limiter.observe("api", {"x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": "5"})
+        with self.assertRaises(QuotaDeferred):
+            self.limiter.acquire("api", NORMAL)
+        self.limiter.acquire("api", LIVE)
+        self.assertEqual(self.limiter.stats()["api"]["dailyRemaining"], 4)
+
+
+class ProviderResponseCacheTests(StubProviderTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.cache = ProviderResponseCache(directory, {LIVE_DATES: 30, UPCOMING: 900, FINISHED: None})
+        self.now = time.time()  # The patch below also moves date.today()
+        for target, value in (("http_pool", self.pool), ("time.time", lambda: self.now)):
+            patcher = mock.patch(f"sports_data_integration.response_cache.{target}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, date_str: str, priority: str = NORMAL) -> dict:
+        with self.cache.open("127.0.0.1", f"/games?date={date_str}", scheme="http", port=self.port,
+                             priority=priority) as body:
+            return json.loads(body.read())
+
+    def day(self, offset: int) -> str:
+        return (datetime.date.today() + datetime.timedelta(days=offset)).isoformat()
+
+    def test_fresh_entry_is_served_without_a_request(self):
+        first = self.fetch(self.day(2))
+        self.now += 899
+        self.assertEqual(self.fetch(self.day(2)), first)
+        self.assertEqual(len(self.server.paths), 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_expired_entry_is_revalidated_with_its_etag(self):
+        self.server.etag = '"v1"'
+        first = self.fetch(self.day(2))
+        self.now += 901
+
+        self.assertEqual(self.fetch(self.day(2)), first)
+        self.assertEqual(len(self.server.paths), 2)
+        self.assertEqual(self.server.headers[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+
+        self.now += 899  # The 304 restarted the TTL
+        self.fetch(self.day(2))
+        self.assertEqual(len(self.server.paths), 2)
+
+    def test_finished_dates_never_expire(self):
+        finished = self.day(-3)
+        self.fetch(finished)
+        self.now += 365 * 86400
+        self.fetch(finished)
+        self.assertEqual(len(self.server.paths), 1)
+
+    def test_failing_provider_serves_the_last_good_answer(self):
+        first = self.fetch(self.day(2))
+        self.now += 901
+        self.server.failures = 3  # Every attempt of the pool (retries=2)
+
+        self.assertEqual(self.fetch(self.day(2)), first)
+        self.assertEqual(self.cache.stats()["stale"], 1)
+
+    def adapter_events(self, date_str: str) -> list:
+        adapter = BasketballAPIAdapter("test", "key", host="127.0.0.1", scheme="http", port=self.port)
+        with mock.patch("sports_data_integration.adapters.response_cache", self.cache):
+            return list(adapter.iter_events(date_str))
+
+    def test_malformed_json_is_rejected_and_not_cached(self):
+        item = {"id": 1, "teams": {"home": {"name": "A"}, "away": {"name": "B"}}}
+        self.server.body = json.dumps({"response": [item, item]}).encode()[:-20]  # Cut inside the second item
+
+        events = self.adapter_events(self.day(2))
+
+        self.assertEqual([event["name"] for event in events], ["A vs B"])
+        self.assertEqual(self.cache.stats()["stored"], 0)
+        self.adapter_events(self.day(2))
+        self.assertEqual(len(self.server.paths), 2)
+
+    def test_answer_with_errors_is_not_cached(self):
+        self.server.body = json.dumps({"errors": {"token": "invalid key"}, "response": []}).encode()
+        self.assertEqual(self.adapter_events(self.day(2)), [])
+        self.assertEqual(self.cache.stats()["stored"], 0)
+
+    def test_live_polls_always_reach_the_provider(self):
+        today = datetime.date.today().isoformat()
+        self.fetch(today, LIVE)
+        self.now += 20  # SPORTS_POLL_INTERVAL_LIVE, within SPORTS_API_CACHE_TTL_LIVE
+        self.fetch(today, LIVE)
+        self.assertEqual(len(self.server.paths), 2)
+
+        self.fetch(today, NORMAL)  # Other polls are still answered from the cache
+        self.assertEqual(len(self.server.paths), 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+
+class FingerprintEventTests(SimpleTestCase):
+    def normalize(self, **fields) -> dict:
+        return normalize_event({"external_id": "1234", "home_team": "A", "away_team": "B", **fields},
+                               "soccer", "test", {"NS": "upcoming"})
+
+    def test_defaulted_start_time_is_not_fingerprinted(self):
+        first = self.normalize()
+        with mock.patch("sports_data_integration.normalize.datetime") as clock:
+            clock.datetime.utcnow.return_value = first["startTime"] + datetime.timedelta(minutes=5)
+            clock.timedelta = datetime.timedelta
+            second = self.normalize()
+        self.assertNotEqual(first["startTime"], second["startTime"])
+        self.assertEqual(fingerprint_event(first), fingerprint_event(second))
+        self.assertNotEqual(fingerprint_event(first), fingerprint_event(self.normalize(home_score=1)))
+
+    def test_provider_start_time_is_fingerprinted(self):
+        kickoff = datetime.datetime(2025, 5, 1, 20, 0)
+        first = self.normalize(start_time=kickoff)
+        self.assertNotIn("startTimeDefaulted", first)
+        moved = self.normalize(start_time=kickoff + datetime.timedelta(hours=1))
+        self.assertNotEqual(fingerprint_event(first), fingerprint_event(moved))
+
+
+class StreamBatchesTests(SimpleTestCase):
+    def test_a_failing_job_does_not_affect_the_others(self):
+        def broken():
+            yield {"acidEventId": "x"}
+            raise ValueError("bad payload")
+
+        jobs = [("good", lambda: ({"acidEventId": str(i)} for i in range(5))), ("broken", broken)]
+        summary = ingest_stream(jobs, lambda batch: {"changed": len(batch), "unchanged": 0, "teamsCreated": 0},
+                                batch_size=2, timeout=5)
+
+        self.assertEqual(summary["failures"], {"broken": "bad payload"})
+        self.assertEqual(summary["changed"], 5)
+
+    def test_a_stalled_job_times_out_alone_and_stops(self):
+        stopped = threading.Event()
+
+        def stalled():
+            try:
+                while True:
+                    time.sleep(0.2)  # A batch every 0.6s, slower than the timeout
+                    yield {"acidEventId": "slow"}
+            finally:
+                stopped.set()
+
+        def steady():
+            for i in range(12):
+                time.sleep(0.05)  # Longer in total than the timeout, but a batch every 0.15s
+                yield {"acidEventId": str(i)}
+
+        messages = list(stream_batches([("stalled", stalled), ("steady", steady)], batch_size=3, timeout=0.3))
+
+        self.assertIn(("failed", "stalled", "timed out after 0.3s"), messages)
+        self.assertIn(("done", "steady", None), messages)
+        self.assertEqual(sum(len(events) for kind, label, events in messages if label == "steady" and events), 12)
+        self.assertTrue(stopped.wait(2))
+
+    def test_time_spent_by_the_consumer_does_not_time_out_producers(self):
+        jobs = [(label, lambda: ({"acidEventId": str(i)} for i in range(4))) for label in ("a", "b")]
+        kinds = []
+        for kind, label, _ in stream_batches(jobs, batch_size=1, timeout=0.2):
+            kinds.append((kind, label))
+            time.sleep(0.1)
+
+        self.assertIn(("done", "a"), kinds)
+        self.assertIn(("done", "b"), kinds)
+        self.assertNotIn("failed", {kind for kind, _ in kinds})
+
+
+class RunSingleFlightTests(TransactionTestCase):
+    def test_second_run_is_skipped_while_one_is_in_flight(self):
+        lease, _ = single_flight.acquire("poll:test")
+        calls = []
+
+        result = single_flight.run_single_flight("poll:test", lambda lease: calls.append(lease) or {})
+
+        self.assertEqual(calls, [])
+        self.assertTrue(result["skipped"])
+        self.assertEqual(result["runId"], lease.run_id)
+
+    def test_run_records_its_summary_and_frees_the_lease(self):
+        result = single_flight.run_single_flight("poll:test", lambda lease: {"fetched": 3})
+
+        self.assertEqual(result["fetched"], 3)
+        lease = PollLease.objects.get(name="poll:test")
+        self.assertEqual(lease.run_id, result["runId"])
+        self.assertIsNotNone(lease.finished_at)
+        self.assertEqual(lease.summary["fetched"], 3)
+        self.assertEqual(PollRunRecord.objects.get(run_id=result["runId"]).outcome, "ok")
+
+        second = single_flight.run_single_flight("poll:test", lambda lease: {"fetched": 1})
+        self.assertNotEqual(second["runId"], result["runId"])
+
+    @override_settings(SPORTS_POLL_JOIN_TIMEOUT=5)
+    def test_join_waits_for_the_run_in_flight(self):
+        lease, _ = single_flight.acquire("poll:test")
+        releaser = threading.Timer(0.2, lease.release, args=({"fetched": 7, "runId": lease.run_id},))
+        releaser.start()
+        self.addCleanup(releaser.cancel)
+
+        started = time.monotonic()
+        result = single_flight.run_single_flight("poll:test", lambda lease: {"fetched": 0}, join=True)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result, {"fetched": 7, "runId": lease.run_id, "joined": True})
+
+    def test_expired_lease_is_taken_over(self):
+        stale, _ = single_flight.acquire("poll:test", ttl=0.01)
+        time.sleep(0.05)
+
+        result = single_flight.run_single_flight("poll:test", lambda lease: {"fetched": 2})
+
+        self.assertNotIn("skipped", result)
+        self.assertNotEqual(result["runId"], stale.run_id)
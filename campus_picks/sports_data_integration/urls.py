@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import trigger_polling
+from .views import (trigger_polling, http_pool_stats, response_cache_stats, poll_schedule,
+                    receive_webhook, webhook_stats, provider_quota, poll_leases, poll_runs)
 
 urlpatterns = [
     path('polling/', trigger_polling, name='trigger_polling'),
+    path('http-pool/', http_pool_stats, name='http_pool_stats'),
+    path('quota/', provider_quota, name='provider_quota'),
+    path('response-cache/', response_cache_stats, name='response_cache_stats'),
+    path('schedule/', poll_schedule, name='poll_schedule'),
+    path('leases/', poll_leases, name='poll_leases'),
+    path('runs/', poll_runs, name='poll_runs'),
+    path('webhook/', receive_webhook, name='receive_webhook'),
+    path('webhook/stats/', webhook_stats, name='webhook_stats'),
     # ... other endpoints
 ]
@@ -1,75 +1,146 @@
 # integration/sports_data.py
 import datetime
-import requests  # You can use requests for API calls, or any other HTTP client
+import functools
+import hmac
 import logging
-import http.client
-import json
-import django
+from django.conf import settings
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-import random
-import uuid
 
-from acid_db.models import Team, Event
-
-from realtime.views import read_data, write_data, update_data
-from acid_db.views import read_record, create_record, update_record
+from sports_data_integration.adapters import (  # Adapters used to live here; kept importable
+    BaseSportsAPIAdapter, BasketballAPIAdapter, FootballAPIAdapter, build_adapters, stream_jobs,
+)
+from sports_data_integration.http_pool import http_pool
+from sports_data_integration.instrumentation import recent_runs, run_as_dict, summarize
+from sports_data_integration.ingest import ingest_events
+from sports_data_integration.rate_limit import rate_limiter
+from sports_data_integration.response_cache import response_cache
+from sports_data_integration.single_flight import lease_status, poll_lease_name, run_single_flight
+from sports_data_integration.streaming import ingest_stream
+from sports_data_integration.webhooks import parse_webhook, webhook_queue
 
 
 
 logger = logging.getLogger(__name__)
 
-def generate_random_odds() -> tuple[float, float]:
+@api_view(['POST'])
+def trigger_polling(request):
     """
-    Very small ‘bookmaker margin’ so the two odds are realistic.
-    Returns (oddsA, oddsB) rounded to 2 decimals.
+    Endpoint to trigger the polling of events from the sports API.
+    Expects an optional JSON payload:
+    {
+      "provider": "api-sports",  // Default if not provided.
+      "wait": false              // If a poll is already running, wait for it and return its summary
+    }
+    If a poll of the provider is already running, no new poll is started:
+    202 {"message": "Polling already in progress", "runId": "9c1e...", "startedAt": "..."}
     """
-    import random, math
+    provider = request.data.get('provider', 'api-sports')
+    print ("Starting polling for provider: {provider}")
+    try:
+        summary = poll_events(provider, join=bool(request.data.get('wait', False)))
+        if summary.get("skipped"):
+            return Response({"message": "Polling already in progress", "runId": summary["runId"],
+                             "startedAt": summary["startedAt"]}, status=202)
+        return Response({"message": "Polling triggered successfully", "summary": summary}, status=200)
+    except Exception as e:
+        return Response({"error": str(e)}, status=500)
+    
 
-    base = random.uniform(1.35, 2.80)        
-    margin = random.uniform(0.05, 0.60)     
-    if random.random() > 0.50:
-        oddsA, oddsB = base, base + margin
-    else:
-        oddsA, oddsB = base + margin, base
-    return round(oddsA, 2), round(oddsB, 2)
+@api_view(['GET'])
+def http_pool_stats(request):
+    """
+    Connection reuse metrics of the shared sports API connection pool.
+    Response example:
+    {
+      "https://v3.football.api-sports.io": {
+        "requests": 120, "connectionsOpened": 1, "connectionsReused": 119, "retries": 2
+      }
+    }
+    """
+    return Response(http_pool.stats(), status=200)
 
-def get_random_location():
-    locations = [
-        {'lat': 40.7128, 'lng': -74.0060},  # New York
-        {'lat': 34.0522, 'lng': -118.2437}, # Los Angeles
-        {'lat': 41.8781, 'lng': -87.6298},  # Chicago
-        {'lat': 29.7604, 'lng': -95.3698},  # Houston
-        {'lat': 33.4484, 'lng': -112.0740}  # Phoenix
-    ]
-    return random.choice(locations)
 
+@api_view(['GET'])
+def provider_quota(request):
+    """
+    Shared rate limit bucket and quota reported by every provider host (see rate_limit).
+    Response example:
+    {
+      "v3.football.api-sports.io": {
+        "tokens": 7.5, "burst": 10, "perMinute": 30.0, "dailyLimit": 7500, "dailyRemaining": 6210,
+        "minuteLimit": 300, "minuteRemaining": 297, "reportedAt": "...", "granted": 1290, "deferred": 4
+      }
+    }
+    """
+    return Response(rate_limiter.stats(), status=200)
 
 
-def calculate_end_time(start_time):
-    # Lista de duraciones posibles en horas
-    possible_durations = [1, 1.5, 2, 2.5, 3]
-    # Selecciona una duración aleatoria
-    duration = random.choice(possible_durations)
-    return start_time + datetime.timedelta(hours=duration)
+@api_view(['GET'])
+def poll_leases(request):
+    """
+    Single-flight leases of the polls and backfills (see single_flight).
+    Response example:
+    [
+      {"name": "poll:api-sports", "runId": "3f2a...", "holder": "web-1:4242", "inFlight": true,
+       "acquiredAt": "...", "expiresAt": "...", "finishedAt": null}
+    ]
+    """
+    return Response(lease_status(), status=200)
 
 
-@api_view(['POST'])
-def trigger_polling(request):
+@api_view(['GET'])
+def poll_runs(request):
     """
-    Endpoint to trigger the polling of events from the sports API.
-    Expects an optional JSON payload:
+    Recent poll and backfill runs with their per-stage timings and counters, and
+    percentiles across them (see instrumentation).
+    Query parameters: name (e.g. "poll:api-sports"), limit (default 50).
+    Response example:
     {
-      "provider": "api-sports"  // Default if not provided.
+      "summary": {"runs": 50, "failed": 0, "seconds": {"p50": 1.2, "p90": 2.9, "p99": 6.1}, "stages": {...}},
+      "runs": [
+        {"runId": "3f2a...", "name": "poll:api-sports", "startedAt": "...", "seconds": 1.31, "outcome": "ok",
+         "summary": {...}, "stages": {"fetch": {"seconds": 0.42, "calls": 9, "rows": 0, "bytes": 512000,
+                                              "sqlQueries": 0, "mongoCommands": 0}, ...}}
+      ]
     }
     """
-    provider = request.data.get('provider', 'api-sports')
-    print ("Starting polling for provider: {provider}")
     try:
-        poll_events(provider)
-        return Response({"message": "Polling triggered successfully"}, status=200)
-    except Exception as e:
-        return Response({"error": str(e)}, status=500)
+        limit = min(int(request.query_params.get("limit", 50)), 1000)
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+    runs = recent_runs(request.query_params.get("name"), limit)
+    return Response({"summary": summarize(runs), "runs": [run_as_dict(run) for run in runs]}, status=200)
+
+
+@api_view(['GET'])
+def poll_schedule(request):
+    """
+    Decisions of the adaptive poller (see adaptive.schedule_metrics).
+    Response example:
+    {
+      "pollsPerHour": 228.0,
+      "decisions": [
+        {"adapter": "FootballAPIAdapter", "date": "2025-05-01", "interval": 20, "reason": "live", ...}
+      ]
+    }
+    """
+    from sports_data_integration.adaptive import schedule_metrics
+    return Response(schedule_metrics(), status=200)
+
+
+@api_view(['GET'])
+def response_cache_stats(request):
+    """
+    Counters of the on-disk provider response cache.
+    Response example:
+    {
+      "hits": 14, "misses": 6, "revalidated": 2, "stored": 6, "stale": 0,
+      "enabled": true, "directory": "/tmp/campus_picks_sports_cache",
+      "ttl": {"live": 30, "upcoming": 900, "finished": null}
+    }
+    """
+    return Response(response_cache.stats(), status=200)
     
 
 def start_polling(provider_id: str) -> None:
@@ -122,417 +193,113 @@ def register_event_webhook(event_id: str, callback_url: str) -> None:
     # Handle the response accordingly.
     pass
 
-from dateutil.parser import parse as parse_date
-import datetime
-import http.client
-import json
-import logging
-
-logger = logging.getLogger(__name__)
-
-from dateutil.parser import parse as parse_date
-import datetime
-import http.client
-import json
-import logging
-
-from realtime.views import read_data, write_data, update_data
-
-logger = logging.getLogger(__name__)
-
-# Options for random sport, team names, and status
-SPORTS = ["basketball", "soccer", "baseball", "tennis", "hockey"]
-TEAM_NAMES = ["Team A", "Team B", "Los Andes", "La Javeriana", "Team Gamma", "Team Betta", "Team Pepe"]
-
-
-class BaseSportsAPIAdapter:
-    def __init__(self, provider_id: str, api_key: str):
-        self.provider_id = provider_id
-        self.api_key = api_key
-    
-    def get_events(self, date_str: str) -> list:
-        raise NotImplementedError("Subclasses must implement this method")
-    
-class BaseSportsAPIAdapter:
-    """
-    Base adapter class for sports APIs.
-    Subclasses must implement the get_events() method.
-    """
-    def __init__(self, provider_id: str, api_key: str):
-        self.provider_id = provider_id
-        self.api_key = api_key
-    
-    def get_events(self, date_str: str) -> list:
-        raise NotImplementedError("Subclasses must implement get_events()")
-
-class BasketballAPIAdapter(BaseSportsAPIAdapter):
-    """
-    Adapter for the external Basketball API.
-    Encapsulates connection details and transforms the API response
-    into a standardized list of event dictionaries.
-    """
-    def __init__(self, provider_id: str, api_key: str):
-        super().__init__(provider_id, api_key)
-        self.host = "v1.basketball.api-sports.io"
-        # Mapping from API status codes to simplified statuses
-        self.status_mapping = {
-            "NS": "upcoming",   # Not Started → upcoming
-            "Q1": "live",       # Quarter 1 (In Play) → live
-            "Q2": "live",       # Quarter 2 (In Play) → live
-            "Q3": "live",       # Quarter 3 (In Play) → live
-            "Q4": "live",       # Quarter 4 (In Play) → live
-            "OT": "live",       # Over Time (In Play) → live
-            "BT": "live",       # Break Time (In Play) → live
-            "HT": "live",       # Halftime (In Play) → live
-            "FT": "finished",   # Game Finished → finished
-            "AOT": "finished",  # After Over Time → finished
-            "POST": "upcoming", # Game Postponed → upcoming
-            "CANC": "finished", # Game Cancelled → finished
-            "SUSP": "finished", # Game Suspended → finished
-            "AWD": "finished",  # Game Awarded → finished
-            "ABD": "finished"   # Game Abandoned → finished
-        }
-
-    def get_events(self, date_str: str) -> list:
-        """
-        Retrieves and transforms basketball events for a given date.
-        Returns a standardized list of event dictionaries.
-        """
-        conn = http.client.HTTPSConnection(self.host)
-        headers = {
-            'x-rapidapi-host': self.host,
-            'x-rapidapi-key': self.api_key
-        }
-        # Request games for the given date
-        conn.request("GET", f"/games?date={date_str}", headers=headers)
-        res = conn.getresponse()
-        data = res.read()
-        try:
-            result = json.loads(data.decode("utf-8"))
-        except Exception as e:
-            logger.error("Error decoding JSON in BasketballAPIAdapter: %s", e)
-            return []
-        
-        events = []
-        for event in result.get("response", []):
-            # Extract the external event ID
-            event_id = event.get("id")
-            if not event_id:
-                continue
-            external_id = str(event_id)
-            # Generate a deterministic UUID using UUIDv5 from the external ID
-            acid_event_id = uuid.uuid5(uuid.NAMESPACE_DNS, external_id)
-            
-            # Retrieve date and time
-            date_event = event.get("date")  # e.g., "2025-03-19T00:00:00+00:00"
-            time_event = event.get("time")  # e.g., "23:30"
-            
-            # Parse startTime; if unavailable, use current UTC time
-            start_time = None
-            if date_event and time_event:
-                if len(time_event.split(":")) == 2:
-                    time_event += ":00"
-                start_time_str = f"{date_event[:10]}T{time_event}+00:00"
-                try:
-                    start_time = parse_date(start_time_str)
-                except Exception as e:
-                    logger.error("Error parsing startTime: %s", e)
-                    continue
-            if not start_time:
-                start_time = datetime.datetime.utcnow()
-            
-            # Calculate a random endTime based on startTime
-            end_time = calculate_end_time(start_time)
-            
-            # Map API status code to our simplified status
-            api_status = event.get("status", {}).get("short", "NS")
-            mapped_status = self.status_mapping.get(api_status, "upcoming")
-            
-            # Build event name from teams data
-            teams = event.get("teams", {})
-            home_team = teams.get("home", {}).get("name")
-            away_team = teams.get("away", {}).get("name")
-            home_logo = teams.get("home", {}).get("logo")
-            away_logo = teams.get("away", {}).get("logo")
-            event_name = f"{home_team} vs {away_team}" if home_team and away_team else "Unnamed Event"
-            scores = event.get("scores", {})
-            home_score = scores.get("home", 0).get("total", 0) or 0
-            away_score = scores.get("away", 0).get("total", 0) or 0
-            
-            # Fix sport as "basketball"
-            sport = "basketball"
-            
-            # Get a random location since the API does not provide one
-            event_location = get_random_location()
-            
-            # Build the standardized event dictionary
-            event_data = {
-                "acidEventId": acid_event_id.hex,  # Store as string
-                "name": event_name,
-                "sport": sport,
-                "location": event_location,
-                "startTime": start_time,
-                "endTime": end_time,
-                "status": mapped_status,
-                "providerId": self.provider_id,
-                "homeTeam": home_team,
-                "awayTeam": away_team,
-                "home_score": home_score,
-                "away_score": away_score,
-                "home_logo": home_logo,
-                "away_logo": away_logo
-
-            }
-            oddsA, oddsB = generate_random_odds()
-            event_data.update({"oddsA": oddsA, "oddsB": oddsB})
-            events.append(event_data)
-        return events
-
-class FootballAPIAdapter:
-    """
-    Adapter for the external Football API.
-    It retrieves fixtures for a given date and transforms the API response
-    into a standardized list of event dictionaries.
-    """
-    def __init__(self, provider_id: str, api_key: str):
-        self.provider_id = provider_id
-        self.api_key = api_key
-        self.host = "v3.football.api-sports.io"
-        # Mapping from API fixture status codes to simplified statuses
-        self.status_mapping = {
-            "TBD": "upcoming",      # Time To Be Defined → upcoming
-            "NS": "upcoming",       # Not Started → upcoming
-            "1H": "live",           # First Half, Kick Off → live
-            "HT": "live",           # Halftime → live
-            "2H": "live",           # Second Half → live
-            "ET": "live",           # Extra Time → live
-            "P": "live",            # Penalty In Progress → live
-            "SUSP": "live",         # Match Suspended → live
-            "INT": "live",          # Match Interrupted → live
-            "FT": "finished",       # Match Finished → finished
-            "AET": "finished",      # Finished after extra time → finished
-            "PEN": "finished",      # Finished after penalty shootout → finished
-            "PST": "upcoming",      # Postponed → upcoming
-            "CANC": "finished",     # Cancelled → finished
-            "ABD": "finished",      # Abandoned → finished
-            "AWD": "finished",      # Technical Loss → finished
-            "WO": "finished",       # WalkOver → finished
-            "LIVE": "live"          # In Progress → live
-        }
-    
-    def get_events(self, date_str: str) -> list:
-        """
-        Retrieves and transforms football fixtures for the given date.
-        
-        Input:
-            date_str: Date in ISO format (e.g., "2025-03-20")
-        
-        Returns:
-            A list of standardized event dictionaries.
-        """
-        conn = http.client.HTTPSConnection(self.host)
-        headers = {
-            'x-rapidapi-host': self.host,
-            'x-rapidapi-key': self.api_key
-        }
-        # Send GET request to the fixtures endpoint
-        conn.request("GET", f"/fixtures?date={date_str}", headers=headers)
-        res = conn.getresponse()
-        data = res.read()
-        
-        try:
-            result = json.loads(data.decode("utf-8"))
-        except Exception as e:
-            logger.error("Error decoding JSON in FootballAPIAdapter: %s", e)
-            return []
-        
-        events = []
-        # Process each fixture from the API response
-        for item in result.get("response", []):
-            fixture = item.get("fixture", {})
-            teams = item.get("teams", {})
-            goals = item.get("goals", {})
-            home_score = goals.get("home", 0) or 0
-            away_score = goals.get("away", 0) or 0
-
-            
-            
-            # Extract the external fixture ID from the API response
-            external_id = fixture.get("id")
-            if not external_id:
-                continue
-            external_id = str(external_id)
-            
-            # Use the external ID directly as acidEventId for simplicity
-            acid_event_id = uuid.uuid5(uuid.NAMESPACE_DNS, external_id)
-            
-            # Parse the start time from fixture.date; if not available, use current UTC time
-            start_time = None
-            date_fixture = fixture.get("date")  # e.g., "2025-03-20T00:00:00+00:00"
-            if date_fixture:
-                try:
-                    start_time = parse_date(date_fixture)
-                except Exception as e:
-                    logger.error("Error parsing fixture date: %s", e)
-                    start_time = datetime.datetime.utcnow()
-            else:
-                start_time = datetime.datetime.utcnow()
-            
-            # Calculate a random end time based on start time
-            end_time = calculate_end_time(start_time)
-            
-            # Map the API fixture status to a simplified status
-            api_status = fixture.get("status", {}).get("short", "NS")
-            mapped_status = self.status_mapping.get(api_status, "upcoming")
-            
-            # Build event name from teams data
-            home_team = teams.get("home", {}).get("name")
-            away_team = teams.get("away", {}).get("name")
-            home_logo = teams.get("home", {}).get("logo")
-            away_logo = teams.get("away", {}).get("logo")
-            event_name = f"{home_team} vs {away_team}" if home_team and away_team else "Unnamed Fixture"
-            
-            # Set sport as football
-            sport = "football"
-            
-            # Get a random location since the API doesn't provide one in the desired format
-            event_location = get_random_location()
-            
-            # Build the standardized event dictionary
-            event_data = {
-                #"acidEventId": str(acid_event_id),
-                "acidEventId": acid_event_id.hex,  # Store as string
-                "name": event_name,
-                "sport": sport,
-                "location": event_location,
-                "startTime": start_time,
-                "endTime": end_time,
-                "status": mapped_status,
-                "providerId": self.provider_id,
-                "homeTeam": home_team,
-                "awayTeam": away_team,
-                "home_score": home_score,
-                "away_score": away_score,
-                "home_logo": home_logo,
-                "away_logo": away_logo
-            }
-            oddsA, oddsB = generate_random_odds()
-            event_data.update({"oddsA": oddsA, "oddsB": oddsB})
-            events.append(event_data)
-        return events
-    
-def poll_events(provider_id: str) -> None:
+def poll_events(provider_id: str, join: bool = False) -> dict:
     """
     Polls the external sports API for games on a given date,
     processes the returned data, updates the Real-Time DB (MongoDB)
-    and the ACID (relational) DB, and relates both by storing the Real-Time DB id
-    in the ACID record.
+    and the ACID (relational) DB in bounded batches (see ingest.ingest_events), and relates
+    both by storing the Real-Time DB id in the ACID record.
+    Only events that changed since the previous poll are written.
+
+    Only one poll of a provider runs at a time across every process (cron, scheduler,
+    HTTP triggers; see single_flight). If one is in flight this returns its run id
+    without polling, or with join=True waits for it and returns its summary.
+
+    Returns a summary of the run:
+        {"runId": "3f2a...", "fetched": 120, "changed": 4, "unchanged": 116, "teamsCreated": 0,
+         "failures": {}, "deferred": {}}
+    or, when another poll is in flight:
+        {"runId": "9c1e...", "skipped": true, "startedAt": "...", "holder": "host:pid"}
     """
-    date_str = datetime.date.today().isoformat()
-    # Create the adapter instance for basketball
-    adapter_basket = BasketballAPIAdapter(provider_id, "3d554a0f6cde30dcb24c6c262a047429")
-    adapter_football = FootballAPIAdapter(provider_id, "3d554a0f6cde30dcb24c6c262a047429")
-
-    events_data_basket = adapter_basket.get_events(date_str)
-    print("Events fetched from Basketball API" )
-    events_data_football = adapter_football.get_events(date_str)
-    print("Events fetched from Football API" )
-
-    events_data = events_data_basket + events_data_football
-    
-    for event_data in events_data:
-        acid_event_id = event_data["acidEventId"]
-        
-        # --- Update or create in the Real-Time DB (MongoDB) ---
-        rt_path = "events/" + acid_event_id
-        existing_rt = read_data(rt_path)
-        if existing_rt:
-            update_data(rt_path, event_data)
-            rt_id = getattr(existing_rt, "id", None)
-        else:
-            new_rt = write_data("events", event_data)
-            rt_id = getattr(new_rt, "id", None)
-        
-        # --- Update or create in the ACID DB (SQL) ---
-        acid_payload = {
-            "event_id": acid_event_id,
-            "rt_event_id": rt_id,
-            "home_score": event_data.get("home_score"),
-            "away_score": event_data.get("away_score"),
-     
-        }
-        # try:
-        #     event_instance = Event.objects.get(event_id=acid_event_id)
-        #     update_record("event", acid_event_id, acid_payload)
-        # except Exception:
-        #     create_record("event", acid_payload)
-        #     event_instance = Event.objects.create(**acid_payload)
-
-                # Actualiza o crea el evento de forma atómica usando get_or_create.
-        event_instance, created = Event.objects.get_or_create(
-            event_id=acid_event_id,
-            defaults=acid_payload
-        )
-        if not created:
-            # Si el evento ya existe, actualizamos los campos necesarios.
-            for key, value in acid_payload.items():
-                setattr(event_instance, key, value)
-            event_instance.save()
-
+    return run_single_flight(poll_lease_name(provider_id), lambda lease: _poll_today(provider_id, lease), join=join)
 
+def _poll_today(provider_id: str, lease) -> dict:
+    date_str = datetime.date.today().isoformat()
+    ingest = functools.partial(ingest_events, fetched_at=datetime.datetime.utcnow())
 
-        home_team_name = event_data["homeTeam"]
-        away_team_name = event_data["awayTeam"]
-        
-        # Verificar si existe el equipo por nombre; si no, crearlo.
-        home_team_obj, _ = Team.objects.get_or_create(name=home_team_name)
-        away_team_obj, _ = Team.objects.get_or_create(name=away_team_name)
-        
-        # Asociar los equipos al evento (ManyToMany)
-        if home_team_obj not in event_instance.home_team.all():
-            event_instance.home_team.add(home_team_obj)
-        if away_team_obj not in event_instance.away_team.all():
-            event_instance.away_team.add(away_team_obj)
-        
-        logger.info(f"Processed event: {event_data['name']} (ACID ID: {acid_event_id}, RT ID: {rt_id})")
+    # All providers are streamed at the same time; a slow or failing one does not block the others.
+    # Events are written in bulk batches (SPORTS_INGEST_BATCH_SIZE) while the payloads are still
+    # being parsed, so memory stays flat no matter how many fixtures a provider returns
+    summary = ingest_stream(stream_jobs(build_adapters(provider_id), date_str), lease.renewing(ingest))
+    logger.info(f"Processed {summary['fetched']} events: {summary['changed']} changed, "
+                f"{summary['unchanged']} unchanged ({summary['teamsCreated']} new teams)")
+    return summary
 
-def process_events_data(data: dict) -> None:
+def process_events_data(data: dict) -> dict:
     """
     Processes the events data obtained from the sports API.
-    This function should update your Real-Time DB and/or ACID DB accordingly.
+    Updates the Real-Time DB and the ACID DB through ingest.ingest_events.
     
     Input:
-        data: A dictionary containing event information.
+        data: A standardized event dictionary (as built by the adapters),
+              or {"events": [<event dictionaries>]}.
     """
-    logger.info("Processing events data: %s", data)
-    # TODO: Implement the logic to update your databases with the new event data.
-    pass
+    events_data = data.get("events") if "events" in data else [data]
+    logger.info("Processing %d event(s)", len(events_data))
+    return ingest_events(events_data)
 
-def on_webhook_received(payload: dict) -> None:
+def on_webhook_received(payload: dict) -> str:
     """
     Processes an incoming webhook payload from a sports provider.
-    Although the design now has this module actively polling the sports API,
-    this function is kept for compatibility or for future use.
     
     Input (example):
         {
           "eventId": "string",
           "timestamp": "ISO8601 string",
-          "type": "scoreUpdate" | "oddsUpdate" | "eventEnd" | ...,
+          "type": "scoreUpdate" | "oddsUpdate" | "eventEnd",
           "details": {
               "score": "2-1",
-              "odds": 1.75,
+              "oddsA": 1.75,
+              "oddsB": 2.10,
               "status": "live"
           }
         }
     
     Behavior:
-        - Updates the Real-Time DB and/or ACID DB with the new event data.
+        - $set of the changed fields on the EventRT document and, for scores,
+          a single-row update of the Event (see webhooks.apply_webhook).
+        - Updates older than (or equal to) the last one of the same type are ignored.
+        - Bursts for the same event are coalesced (see webhooks.WebhookCoalescer).
+    
+    Returns "applied", "queued", "stale" or "missing". Raises ValueError on invalid payloads.
     """
-    logger.info("Webhook received with payload: %s", payload)
-    # TODO: Process the webhook payload and update your databases accordingly.
-    pass
+    update = parse_webhook(payload)
+    result = webhook_queue.submit(update)
+    logger.info("Webhook %s for event %s: %s", update.type, update.event_id, result)
+    return result
 
+@api_view(['POST'])
+def receive_webhook(request):
+    """
+    Endpoint called by the sports provider with live updates.
+    If SPORTS_WEBHOOK_SECRET is set, the X-Webhook-Secret header must match it.
+    Input: see on_webhook_received.
+    Response example:
+    {
+      "status": "applied"   // or "queued", "stale"
+    }
+    """
+    secret = getattr(settings, "SPORTS_WEBHOOK_SECRET", None)
+    if secret and not hmac.compare_digest(request.headers.get("X-Webhook-Secret", ""), secret):
+        return Response({"error": "Invalid webhook secret"}, status=403)
+    try:
+        result = on_webhook_received(request.data)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    if result == "missing":
+        return Response({"error": "Event not found"}, status=404)
+    return Response({"status": result}, status=202 if result == "queued" else 200)
+
+@api_view(['GET'])
+def webhook_stats(request):
+    """
+    Counters of the webhook coalescing queue.
+    Response example:
+    {
+      "applied": 412, "coalesced": 37, "stale": 3, "inFlight": 0
+    }
+    """
+    return Response(webhook_queue.stats(), status=200)
 
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,178 @@
+# sports_data_integration/webhooks.py
+import datetime
+import logging
+import threading
+
+from dateutil.parser import parse as parse_date
+
+from acid_db.models import Event
+from realtime.active_events import invalidate_active_events
+from realtime.views import apply_event_update
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TYPES = ("scoreUpdate", "oddsUpdate", "eventEnd")
+
+
+class WebhookUpdate:
+    """One validated webhook: the EventRT fields to $set and the Event scores to update."""
+    __slots__ = ("event_id", "type", "timestamp", "fields")
+
+    def __init__(self, event_id: str, type: str, timestamp, fields: dict):
+        self.event_id = event_id
+        self.type = type
+        self.timestamp = timestamp
+        self.fields = fields
+
+
+def _parse_score(details: dict) -> dict:
+    if details.get("score") is not None:
+        try:
+            home, away = (int(part) for part in str(details["score"]).split("-"))
+        except ValueError:
+            raise ValueError(f"Invalid score '{details['score']}', expected 'home-away'")
+        return {"home_score": home, "away_score": away}
+    home = details.get("homeScore", details.get("home_score"))
+    away = details.get("awayScore", details.get("away_score"))
+    if home is None and away is None:
+        return {}
+    if home is None or away is None:
+        raise ValueError("Both home and away scores are required")
+    return {"home_score": int(home), "away_score": int(away)}
+
+
+def parse_webhook(payload: dict) -> WebhookUpdate:
+    """
+    Validates a provider webhook and turns it into the fields to update.
+
+    Input (example):
+        {
+          "eventId": "string",                       # acidEventId (dashes allowed)
+          "timestamp": "2025-05-01T20:31:07Z",
+          "type": "scoreUpdate" | "oddsUpdate" | "eventEnd",
+          "details": {"score": "2-1", "oddsA": 1.75, "oddsB": 2.10, "status": "live"}
+        }
+    Raises ValueError when the payload is not usable.
+    """
+    event_id = str(payload.get("eventId") or "").replace("-", "")
+    if not event_id:
+        raise ValueError("Missing 'eventId'")
+    update_type = payload.get("type")
+    if update_type not in WEBHOOK_TYPES:
+        raise ValueError(f"Unsupported webhook type '{update_type}'")
+    try:
+        timestamp = parse_date(payload["timestamp"])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise ValueError("Missing or invalid 'timestamp'")
+    if timestamp.tzinfo is not None:
+        # MongoDB stores naive UTC; comparing aware and naive values would fail
+        timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    details = payload.get("details") or {}
+
+    fields = {}
+    if update_type == "scoreUpdate":
+        fields.update(_parse_score(details))
+        if not fields:
+            raise ValueError("scoreUpdate needs 'score' or 'homeScore'/'awayScore'")
+        if details.get("status"):
+            fields["status"] = details["status"]
+    elif update_type == "oddsUpdate":
+        for name in ("oddsA", "oddsB"):
+            if details.get(name) is not None:
+                fields[name] = float(details[name])
+        if not fields:
+            raise ValueError("oddsUpdate needs 'oddsA' and/or 'oddsB'")
+    else:  # eventEnd
+        fields.update(_parse_score(details))
+        fields["status"] = details.get("status", "finished")
+        fields["endTime"] = timestamp
+    return WebhookUpdate(event_id, update_type, timestamp, fields)
+
+
+def apply_webhook(update: WebhookUpdate) -> str:
+    """
+    Applies one update: $set of the changed fields on EventRT and, for scores,
+    a single-row UPDATE of the Event. Returns "applied", "stale" or "missing".
+    """
+    result = apply_event_update(update.event_id, update.fields, update.type, update.timestamp)
+    if result == "applied" and "home_score" in update.fields:
+        Event.objects.filter(event_id=update.event_id).update(
+            home_score=update.fields["home_score"], away_score=update.fields["away_score"]
+        )
+    return result
+
+
+class WebhookCoalescer:
+    """
+    Serializes webhooks per event and collapses bursts.
+
+    The first webhook of an event is applied right away in the caller's thread.
+    Webhooks for the same event that arrive while it is being applied are
+    queued, keeping only the newest one per type, and the thread that holds the
+    event applies them when it finishes. A burst of N score updates therefore
+    costs about two writes instead of N, without delaying the first one.
+    The coalescer is per process: webhooks for the same event handled by other
+    processes (or workers) are neither serialized nor collapsed with these.
+    Across processes, ordering is still guaranteed by the timestamp check of
+    apply_event_update.
+    """
+    def __init__(self):
+        self._busy = set()
+        self._pending = {}  # event_id -> {type: WebhookUpdate}
+        self._lock = threading.Lock()
+        self.applied = 0
+        self.coalesced = 0
+        self.stale = 0
+
+    def submit(self, update: WebhookUpdate) -> str:
+        """Returns "applied", "queued", "stale" or "missing"."""
+        with self._lock:
+            if update.event_id in self._busy:
+                queued = self._pending.setdefault(update.event_id, {})
+                previous = queued.get(update.type)
+                if previous is not None:
+                    self.coalesced += 1
+                if previous is None or previous.timestamp < update.timestamp:
+                    queued[update.type] = update
+                return "queued"
+            self._busy.add(update.event_id)
+
+        result = None
+        applied = False
+        batch = [update]
+        try:
+            while batch:
+                for item in sorted(batch, key=lambda u: u.timestamp):
+                    outcome = apply_webhook(item)
+                    result = result or outcome
+                    applied = applied or outcome == "applied"
+                    with self._lock:
+                        if outcome == "applied":
+                            self.applied += 1
+                        elif outcome == "stale":
+                            self.stale += 1
+                with self._lock:
+                    batch = list(self._pending.pop(update.event_id, {}).values())
+                    if not batch:
+                        self._busy.discard(update.event_id)
+        except Exception:
+            with self._lock:
+                self._busy.discard(update.event_id)
+                self._pending.pop(update.event_id, None)
+            raise
+        finally:
+            if applied:
+                invalidate_active_events()
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "applied": self.applied,
+                "coalesced": self.coalesced,
+                "stale": self.stale,
+                "inFlight": len(self._busy),
+            }
+
+
+webhook_queue = WebhookCoalescer()